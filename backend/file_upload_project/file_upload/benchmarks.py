@@ -0,0 +1,282 @@
+"""
+Benchmarks Module
+Micro-benchmarks for the CPU-bound parts of the pipeline: resume extraction
+(the preflight, hash and parse stages of processResumeFromContent),
+PII anonymization, HTML text extraction, prompt construction and embedding
+index search. Inputs come from synthetic_corpus, so runs are deterministic
+and contain no real PII.
+
+Each benchmark records wall time over several rounds and, in a separate
+round under tracemalloc, peak Python memory. `manage.py run_benchmarks`
+runs the suite, stores baselines and fails on regressions.
+"""
+
+import atexit
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from . import synthetic_corpus
+from .llm_stub import JOB_RESPONSE, RESUME_RESPONSE
+
+
+# Differences below these are noise, whatever the percentage
+MIN_TIME_DELTA_MS = 0.05
+MIN_MEMORY_DELTA_KB = 64
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[Any], Any]
+    # Builds the input for one round; not timed
+    setup: Callable[[], Any] = lambda: None
+
+
+@dataclass
+class Measurement:
+    name: str
+    rounds: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    stdev_ms: float
+    peak_kb: float
+
+
+def measure(benchmark: Benchmark, rounds: int = 10, max_time: float = 2.0) -> Measurement:
+    """
+    Time `rounds` calls after one warm-up call, stopping early (after at
+    least 3 rounds) once max_time seconds have been spent, then measure peak
+    memory in one more call.
+    """
+    benchmark.func(benchmark.setup())
+    timings = []
+    deadline = time.perf_counter() + max_time
+    while len(timings) < rounds and (len(timings) < 3 or time.perf_counter() < deadline):
+        arg = benchmark.setup()
+        started = time.perf_counter()
+        benchmark.func(arg)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    arg = benchmark.setup()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        benchmark.func(arg)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        name=benchmark.name,
+        rounds=len(timings),
+        min_ms=round(min(timings), 3),
+        median_ms=round(statistics.median(timings), 3),
+        mean_ms=round(statistics.fmean(timings), 3),
+        stdev_ms=round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+        peak_kb=round(peak / 1024, 1),
+    )
+
+
+def _extract(stream: io.BytesIO, filename: str) -> str:
+    """The extraction stages processResumeFromContent runs before the LLM call"""
+    from .resume_extraction import extract_resume_text, hash_stream
+    from .resume_preflight import MAX_PAGES, limit_text, preflight_resume
+
+    report = preflight_resume(stream, filename)
+    hash_stream(stream)
+    text = extract_resume_text(stream, filename, kind=report.kind, max_pages=MAX_PAGES, page_count=report.page_count)
+    return limit_text(re.sub(r"\s+", " ", text).strip())
+
+
+def extraction_benchmarks(seed: int) -> List[Benchmark]:
+    benchmarks = []
+    for kind, build in (("pdf", synthetic_corpus.resume_pdf), ("docx", synthetic_corpus.resume_docx)):
+        for pages in (1, 5, 20):
+            for layout in synthetic_corpus.LAYOUTS:
+                content = build(random.Random(seed), pages, layout, tables=1)
+                filename = f"resume.{kind}"
+                benchmarks.append(Benchmark(
+                    f"extract.{kind}.{pages}p.{layout}",
+                    lambda stream, filename=filename: _extract(stream, filename),
+                    lambda content=content: io.BytesIO(content),
+                ))
+    return benchmarks
+
+
+def anonymization_benchmarks(seed: int) -> List[Benchmark]:
+    from .pii_anonymizer import PIIAnonymizer
+
+    benchmarks = []
+    for chars in (2_000, 20_000, 100_000):
+        for density in (0.02, 0.2):
+            text = synthetic_corpus.resume_text(random.Random(seed), chars, density)
+            label = f"{chars // 1000}k.pii{int(density * 100)}"
+            benchmarks.append(Benchmark(
+                f"anonymize.text.{label}",
+                lambda text: PIIAnonymizer().anonymize_text(text),
+                lambda text=text: text,
+            ))
+
+            # An LLM response echoing the placeholders back, as deanonymize_data sees it
+            anonymized, mapping = PIIAnonymizer().anonymize_text(text)
+            lines = anonymized.split("\n")
+            response = {
+                "summary": " ".join(lines[:20]),
+                "work_experience": [{"jobDescription": line} for line in lines[20:]],
+                "skills": list(RESUME_RESPONSE["skills"]),
+            }
+            benchmarks.append(Benchmark(
+                f"anonymize.deanonymize_data.{label}",
+                lambda args: PIIAnonymizer().deanonymize_data(*args),
+                lambda response=response, mapping=mapping: (response, mapping),
+            ))
+    return benchmarks
+
+
+def html_benchmarks(seed: int) -> List[Benchmark]:
+    from . import lazy_imports
+    from .utils import getRawText
+
+    benchmarks = []
+    for size_kb, json_ld in ((200, False), (200, True), (2000, False)):
+        html = synthetic_corpus.job_posting_html(random.Random(seed), size_kb * 1024, json_ld=json_ld)
+        benchmarks.append(Benchmark(
+            f"html.getRawText.{size_kb}kb" + (".jsonld" if json_ld else ""),
+            getRawText,
+            # getRawText strips scripts in place, so every round needs a fresh tree
+            lambda html=html: lazy_imports.lxml_html().fromstring(html),
+        ))
+    return benchmarks
+
+
+def prompt_benchmarks(seed: int) -> List[Benchmark]:
+    from .prompt_builder import build_analysis_inputs
+    from .utils import analysisPrompt, jobProcessorPrompt, resumeProcessorPrompt
+
+    rng = random.Random(seed)
+    resume_data = dict(RESUME_RESPONSE, work_experience=[
+        dict(RESUME_RESPONSE["work_experience"], jobDescription=synthetic_corpus.sentence(rng, 60))
+        for _ in range(15)
+    ])
+    job_data = dict(JOB_RESPONSE, description=" ".join(synthetic_corpus.sentence(rng, 30) for _ in range(40)))
+    resume_text = synthetic_corpus.resume_text(rng, 20_000)
+    job_text = synthetic_corpus.resume_text(rng, 50_000, 0)
+
+    def analysis_prompt(_):
+        return analysisPrompt(*build_analysis_inputs(resume_data, job_data))
+
+    return [
+        Benchmark("prompt.analysis", analysis_prompt),
+        Benchmark("prompt.resume.20k", lambda text: resumeProcessorPrompt(text), lambda: resume_text),
+        Benchmark("prompt.job.50k", lambda text: jobProcessorPrompt(text), lambda: job_text),
+    ]
+
+
+def embedding_benchmarks(seed: int) -> List[Benchmark]:
+    """
+    Cosine top-k over a memory-mapped index of random unit vectors, the
+    shape of the embedding index (no model is loaded, so encoding is not
+    timed).
+    """
+    import numpy as np
+
+    from .vector_index import VectorIndex
+
+    directory = tempfile.mkdtemp(prefix="preppad_bench_vectors_")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    rng = np.random.default_rng(seed)
+    benchmarks = []
+    for rows in (10_000, 50_000):
+        index = VectorIndex(directory, f"bench_{rows}")
+        vectors = rng.standard_normal((rows, 384), dtype=np.float32)
+        index.add([str(i) for i in range(rows)], vectors)
+        for queries in (1, 32):
+            batch = rng.standard_normal((queries, 384), dtype=np.float32)
+            benchmarks.append(Benchmark(
+                f"embedding.search.{rows // 1000}k.q{queries}",
+                lambda batch, index=index: index.search(batch, 10),
+                lambda batch=batch: batch,
+            ))
+        # "Rank these resumes": a few hundred candidates picked by id
+        candidates = [str(i) for i in rng.choice(rows, 500, replace=False)]
+        benchmarks.append(Benchmark(
+            f"embedding.rank.{rows // 1000}k.500ids",
+            lambda query, index=index, candidates=candidates: index.search(query, 500, ids=candidates),
+            lambda batch=batch: batch[0],
+        ))
+    return benchmarks
+
+
+SUITES = {
+    "extraction": extraction_benchmarks,
+    "anonymize": anonymization_benchmarks,
+    "html": html_benchmarks,
+    "prompt": prompt_benchmarks,
+    "embedding": embedding_benchmarks,
+}
+
+
+def build_suite(seed: int = 0, name_filter: Optional[str] = None) -> List[Benchmark]:
+    benchmarks = [b for build in SUITES.values() for b in build(seed)]
+    if name_filter:
+        benchmarks = [b for b in benchmarks if name_filter in b.name]
+    return benchmarks
+
+
+def machine_info() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def to_report(measurements: List[Measurement], seed: int) -> Dict:
+    return {
+        "machine": machine_info(),
+        "seed": seed,
+        "benchmarks": {m.name: asdict(m) for m in measurements},
+    }
+
+
+def load_report(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def compare(report: Dict, baseline: Dict, max_time_pct: float, max_memory_pct: float) -> List[str]:
+    """
+    Regressions against a baseline report.
+
+    Returns:
+        list: One message per benchmark whose median time or peak memory grew
+            by more than the allowed percentage (and the noise floor)
+    """
+    regressions = []
+    for name, current in report["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        before, after = previous["median_ms"], current["median_ms"]
+        if after - before > MIN_TIME_DELTA_MS and after > before * (1 + max_time_pct / 100):
+            regressions.append(f"{name}: median {before:.3f}ms -> {after:.3f}ms (+{(after / before - 1) * 100:.0f}%)")
+        before, after = previous["peak_kb"], current["peak_kb"]
+        if after - before > MIN_MEMORY_DELTA_KB and after > before * (1 + max_memory_pct / 100):
+            regressions.append(f"{name}: peak memory {before:.0f}KB -> {after:.0f}KB (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
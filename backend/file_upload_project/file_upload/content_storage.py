@@ -0,0 +1,122 @@
+"""
+Processed Content Storage Module
+Packs processed resume dicts for the UploadedFile.processed_content JSONField.
+Fields the app filters or projects on stay as plain top-level keys; the rest
+of a large blob can be compressed (zlib, or zstd when installed) into a
+single packed key.
+"""
+
+import base64
+import json
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available
+    zstandard = None
+
+
+# 'none', 'zlib' or 'zstd'
+COMPRESSION = os.getenv("PROCESSED_CONTENT_COMPRESSION", "none").lower()
+COMPRESS_MIN_BYTES = int(os.getenv("PROCESSED_CONTENT_COMPRESS_MIN_BYTES", "8192"))
+
+# Keys that always stay uncompressed so jsonb operators, the GIN index and
+# projections (UploadedFile.objects.with_content_keys) can reach them
+INDEXED_KEYS = (
+    "name",
+    "skills",
+    "content_sha256",
+    "pii_anonymized",
+    "pii_items_anonymized",
+    "processing_failed",
+    "error",
+)
+
+PACKED_KEY = "_packed"
+
+
+def _compress(codec: str, raw: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return zlib.compress(raw, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Stored content is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown processed content codec: {codec}")
+
+
+def _codec() -> Optional[str]:
+    if COMPRESSION == "zstd" and zstandard is not None:
+        return "zstd"
+    if COMPRESSION in ("zlib", "zstd"):
+        return "zlib"
+    return None
+
+
+def pack_processed_content(content: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Prepare a processed resume dict for storage.
+
+    The full anonymization report (placeholders and masked values) is reduced
+    to its counts, and non-indexed keys are compressed when the blob is
+    larger than PROCESSED_CONTENT_COMPRESS_MIN_BYTES and compression is on.
+    """
+    if not isinstance(content, dict):
+        return content
+
+    content = dict(content)
+    report = content.pop("_anonymization_report", None)
+    if isinstance(report, dict):
+        content.setdefault("pii_items_anonymized", report.get("total_items", 0))
+        content.setdefault("pii_types", report.get("types", {}))
+
+    codec = _codec()
+    if codec is None:
+        return content
+
+    rest = {k: v for k, v in content.items() if k not in INDEXED_KEYS}
+    raw = json.dumps(rest, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return content
+
+    packed = {k: v for k, v in content.items() if k in INDEXED_KEYS}
+    packed[PACKED_KEY] = {
+        "codec": codec,
+        "data": base64.b64encode(_compress(codec, raw)).decode("ascii"),
+    }
+    return packed
+
+
+def unpack_processed_content(stored: Any) -> Dict[str, Any]:
+    """
+    Inverse of pack_processed_content for values read from the database.
+
+    Also accepts legacy JSON strings and falls back to {"raw_content": ...}
+    for text that is not JSON, matching what the detail views returned.
+    """
+    if stored is None or stored == "":
+        return {}
+    if isinstance(stored, str):
+        try:
+            stored = json.loads(stored)
+        except json.JSONDecodeError:
+            return {"raw_content": stored}
+    if not isinstance(stored, dict):
+        return {"raw_content": stored}
+
+    packed = stored.get(PACKED_KEY)
+    if not packed:
+        return stored
+
+    content = {k: v for k, v in stored.items() if k != PACKED_KEY}
+    raw = _decompress(packed["codec"], base64.b64decode(packed["data"]))
+    content.update(json.loads(raw))
+    return content
@@ -0,0 +1,56 @@
+"""
+Database Pool Module
+Reports how the default database connection is being reused: psycopg_pool
+statistics (sizes, waiting requests, wait time) when the Django 5.1 pool is
+configured, otherwise the persistent-connection settings.
+"""
+
+from typing import Dict
+
+from django.db import connections
+
+
+# psycopg_pool counters worth surfacing; see ConnectionPool.get_stats()
+POOL_STAT_KEYS = (
+    "pool_min",
+    "pool_max",
+    "pool_size",
+    "pool_available",
+    "requests_waiting",
+    "requests_num",
+    "requests_queued",
+    "requests_wait_ms",
+    "requests_errors",
+    "usage_ms",
+    "connections_num",
+    "connections_ms",
+    "connections_errors",
+    "connections_lost",
+)
+
+
+def pool_stats(alias: str = "default") -> Dict:
+    """
+    Connection reuse figures for a database alias.
+
+    Returns:
+        dict: {"mode": "pool", ...psycopg_pool counters} when pooling is on,
+            otherwise {"mode": "persistent" or "per_request", ...settings}
+    """
+    connection = connections[alias]
+    pool = getattr(connection, "pool", None) if connection.vendor == "postgresql" else None
+    if pool is None:
+        settings = connection.settings_dict
+        max_age = settings.get("CONN_MAX_AGE", 0)
+        return {
+            "mode": "persistent" if max_age else "per_request",
+            "conn_max_age": max_age,
+            "conn_health_checks": settings.get("CONN_HEALTH_CHECKS", False),
+        }
+
+    stats = pool.get_stats()
+    report = {"mode": "pool", "name": pool.name}
+    report.update({key: stats.get(key, 0) for key in POOL_STAT_KEYS})
+    requests_num = report["requests_num"]
+    report["avg_wait_ms"] = round(report["requests_wait_ms"] / requests_num, 2) if requests_num else 0.0
+    return report
@@ -0,0 +1,371 @@
+"""
+Embeddings Module
+Dense vectors for resumes and job postings, and the similarity searches
+built on them: the best matching postings for a resume and a ranking of
+resumes against a posting, in milliseconds and without an LLM call per pair.
+
+Vectors come from a sentence encoder run locally on CPU
+(lazy_imports.MODELS["embedding"], EMBEDDING_MODEL): token states
+mean-pooled over a resume's skills and experience, or over a posting's
+title, skills, qualifications and responsibilities. They live in two
+VectorIndex files under EMBEDDING_INDEX_DIR, keyed by UploadedFile id and
+by normalized job URL. A posting's label lists the users it was analyzed
+for ("owners"); the production match endpoint only returns a user's own
+postings.
+
+With EMBEDDING_INDEX_ENABLED=True, processed resumes (signals.py) and newly
+analyzed job postings (utils.extractJobDescription) are indexed on a
+background thread, and the match endpoints are served;
+`manage.py embedding_index build` backfills stored resumes.
+"""
+
+import functools
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+
+from . import lazy_imports, metrics
+from .job_cache import normalize_job_url
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_INDEX_ENABLED = os.getenv("EMBEDDING_INDEX_ENABLED", "False").lower() == "true"
+# Must be a persistent volume when the index is enabled. The temp-dir fallback
+# only serves `manage.py embedding_index` experiments; it does not survive a redeploy.
+EMBEDDING_INDEX_DIR = os.getenv("EMBEDDING_INDEX_DIR", "")
+if EMBEDDING_INDEX_ENABLED and not EMBEDDING_INDEX_DIR:
+    raise ImproperlyConfigured("EMBEDDING_INDEX_ENABLED=True requires EMBEDDING_INDEX_DIR (a persistent directory)")
+EMBEDDING_INDEX_DIR = EMBEDDING_INDEX_DIR or os.path.join(tempfile.gettempdir(), "preppad_embeddings")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+# Skills and titles come first in each document, so truncation drops the long tail of descriptions
+EMBEDDING_MAX_TOKENS = int(os.getenv("EMBEDDING_MAX_TOKENS", "256"))
+
+RESUME_INDEX = "resumes"
+JOB_INDEX = "jobs"
+MAX_RESULTS = 100
+
+
+class EmbeddingUnavailable(Exception):
+    """The index is disabled, or the encoder cannot be loaded"""
+
+
+# --- Documents ------------------------------------------------------------
+
+def _entries(value) -> List[Dict]:
+    """The prompt asks for one object per section, but lists come back too"""
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [v for v in value if isinstance(v, dict)]
+
+
+def _text(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return ", ".join(filter(None, (_text(v) for v in value)))
+    if isinstance(value, dict):
+        return ", ".join(filter(None, (_text(v) for v in value.values())))
+    return str(value).strip() if value is not None else ""
+
+
+def _join(sections: Iterable[Tuple[str, str]]) -> str:
+    return "\n".join(f"{heading}: {body}" for heading, body in sections if body)
+
+
+def resume_document(data: Dict) -> str:
+    """The text embedded for a processed resume (processResume output)"""
+    experience = _entries(data.get("work_experience"))
+    projects = _entries(data.get("projects"))
+    education = _entries(data.get("education"))
+    return _join([
+        ("Skills", _text(data.get("skills"))),
+        ("Roles", _text([e.get("jobTitle") for e in experience])),
+        ("Experience", " ".join(_text(e.get("jobDescription")) for e in experience)),
+        ("Projects", " ".join(
+            f"{_text(p.get('projectName'))} ({_text(p.get('technologiesUsed'))}) {_text(p.get('projectDescription'))}"
+            for p in projects
+        )),
+        ("Education", _text([f"{_text(e.get('highestDegree'))} {_text(e.get('fieldOfStudy'))}" for e in education])),
+        ("Certifications", _text([c.get("certificationName") for c in _entries(data.get("certifications"))])),
+    ])
+
+
+def job_document(data: Dict) -> str:
+    """The text embedded for an analyzed job posting (analyzeJobPosting output)"""
+    return _join([
+        ("Title", _text(data.get("title"))),
+        ("Skills", _text(data.get("skills"))),
+        ("Qualifications", _text(data.get("qualifications"))),
+        ("Responsibilities", _text(data.get("responsibilities"))),
+        ("Description", _text(data.get("description"))),
+    ])
+
+
+def job_label(data: Dict) -> Dict:
+    """What a match result shows for a posting"""
+    return {key: _text(data.get(key)) for key in ("title", "company_name", "location", "salary_range")}
+
+
+def _with_owner(owner: str):
+    def update(label: Dict) -> Dict:
+        return dict(label, owners=sorted(set(label.get("owners", ())) | {owner}))
+    return update
+
+
+# --- Encoding -------------------------------------------------------------
+
+def model_name() -> str:
+    return lazy_imports.MODELS["embedding"][1]
+
+
+def embed_texts(texts: Sequence[str], batch_size: int = EMBEDDING_BATCH_SIZE):
+    """
+    Encode texts on CPU.
+
+    Texts are batched in length order so each batch pads to similar lengths.
+
+    Returns:
+        numpy.ndarray: (len(texts), dim) float32, rows L2-normalized
+
+    Raises:
+        EmbeddingUnavailable: When torch/transformers or the model cannot be loaded
+    """
+    import numpy as np
+
+    from .vector_index import normalize
+
+    try:
+        import torch
+
+        encoder = lazy_imports.pipeline(*lazy_imports.MODELS["embedding"])
+    except (ImportError, OSError) as e:
+        raise EmbeddingUnavailable(f"Cannot load embedding model {model_name()}: {e}") from e
+
+    tokenizer, model = encoder.tokenizer, encoder.model
+    vectors = np.zeros((len(texts), model.config.hidden_size), dtype=np.float32)
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            batch_rows = order[start:start + batch_size]
+            batch = tokenizer(
+                [texts[i] or " " for i in batch_rows],
+                padding=True, truncation=True, max_length=EMBEDDING_MAX_TOKENS, return_tensors="pt",
+            )
+            hidden = model(**batch).last_hidden_state
+            # Mean over real tokens only; padding would pull short texts together
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            vectors[batch_rows] = pooled.float().numpy()
+    return normalize(vectors)
+
+
+# --- Indexes --------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def get_index(name: str):
+    """The named VectorIndex, one instance (and mapping) per process"""
+    from .vector_index import VectorIndex
+    return VectorIndex(EMBEDDING_INDEX_DIR, name)
+
+
+def resume_key(resume_id) -> str:
+    return str(resume_id)
+
+
+def job_key(url: str) -> str:
+    return normalize_job_url(url)
+
+
+def index_resumes(items: Sequence[Tuple[int, Dict]]) -> int:
+    """Embed and store (resume_id, processed content) pairs. Returns how many were stored."""
+    items = [(rid, data) for rid, data in items if isinstance(data, dict) and not data.get("processing_failed")]
+    if not items:
+        return 0
+    vectors = embed_texts([resume_document(data) for _, data in items])
+    # No labels: the sidecar file must not hold PII; callers look resumes up by id
+    get_index(RESUME_INDEX).add([resume_key(rid) for rid, _ in items], vectors, model=model_name())
+    return len(items)
+
+
+def index_jobs(items: Sequence[Tuple[str, Dict]], owner: Optional[str] = None) -> int:
+    """
+    Embed and store (url, analyzed posting) pairs, adding owner to each
+    posting's owners. Returns how many were stored.
+    """
+    items = [(url, data) for url, data in items if isinstance(data, dict) and "status_code" not in data]
+    if not items:
+        return 0
+    vectors = embed_texts([job_document(data) for _, data in items])
+    labels = [dict(job_label(data), url=url) for url, data in items]
+    keys = [job_key(url) for url, _ in items]
+    # Re-indexing a posting keeps its existing owners (add() merges labels)
+    get_index(JOB_INDEX).add(keys, vectors, labels, model=model_name())
+    if owner:
+        get_index(JOB_INDEX).update_labels(keys, _with_owner(owner))
+    return len(items)
+
+
+def add_job_owner(url: str, owner: str) -> bool:
+    """Record another user an indexed posting was analyzed for"""
+    return bool(get_index(JOB_INDEX).update_labels([job_key(url)], _with_owner(owner)))
+
+
+def has_job(url: str) -> bool:
+    return job_key(url) in get_index(JOB_INDEX)
+
+
+def parse_resume_ids(value) -> Optional[List[int]]:
+    """
+    Resume ids from a comma-separated request parameter, or None when absent.
+
+    Raises:
+        ValueError: When an id is not an integer
+    """
+    if value in (None, ""):
+        return None
+    return [int(part) for part in str(value).split(",") if part.strip()]
+
+
+def forget_resume(resume_id) -> bool:
+    return bool(get_index(RESUME_INDEX).remove([resume_key(resume_id)]))
+
+
+# --- Background indexing --------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _executor() -> ThreadPoolExecutor:
+    # Created on first use, so each forked worker gets its own thread.
+    # One thread: encoding is CPU-bound and torch already uses several cores.
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+
+
+def _log_failure(future):
+    error = future.exception()
+    if error is not None:
+        logger.warning("Embedding index update failed: %s", error)
+
+
+def _submit(func, *args):
+    future = metrics.track_submit("embedding", _executor().submit(func, *args))
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def schedule_resume(resume_id: int, data: Dict):
+    """Index a processed resume in the background when the index is enabled"""
+    if EMBEDDING_INDEX_ENABLED and isinstance(data, dict) and not data.get("processing_failed"):
+        return _submit(index_resumes, [(resume_id, data)])
+    return None
+
+
+def _index_job(url: str, data: Optional[Dict], owner: Optional[str], refresh: bool):
+    if data is not None and (refresh or not has_job(url)):
+        index_jobs([(url, data)], owner)
+    elif owner:
+        add_job_owner(url, owner)
+
+
+def schedule_job(url: str, data: Optional[Dict], owner: Optional[str] = None, refresh: bool = True):
+    """
+    Index an analyzed job posting in the background when the index is
+    enabled, recording owner (the user it was analyzed for).
+
+    With refresh=False (e.g. a job cache hit) a posting that is already
+    indexed is not embedded again, only given the owner; data may then be
+    None.
+    """
+    if not EMBEDDING_INDEX_ENABLED:
+        return None
+    if data is None:
+        if refresh or not owner:
+            return None
+    elif not isinstance(data, dict) or "status_code" in data:
+        return None
+    return _submit(_index_job, url, data, owner, refresh)
+
+
+# --- Queries --------------------------------------------------------------
+
+def require_enabled():
+    """Called by the API views; management commands query the index regardless"""
+    if not EMBEDDING_INDEX_ENABLED:
+        raise EmbeddingUnavailable("Similarity search is disabled (set EMBEDDING_INDEX_ENABLED=True)")
+
+
+def parse_k(value, default: int = 10) -> int:
+    """
+    Result count from a request parameter, clamped to 1..MAX_RESULTS.
+
+    Raises:
+        ValueError: When the value is not an integer
+    """
+    return max(1, min(MAX_RESULTS, int(value))) if value not in (None, "") else default
+
+
+def match_jobs(
+    resume_id=None,
+    resume_data: Optional[Dict] = None,
+    k: int = 10,
+    owner: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Indexed job postings closest to a resume, best first.
+
+    The resume's stored vector is used when it is indexed; otherwise
+    resume_data is embedded.
+
+    Args:
+        owner: Only search postings analyzed for this user; None searches all
+            (development views and the management command)
+
+    Returns:
+        list: {"url", "score", "title", "company_name", ...} per posting
+    """
+    vector = get_index(RESUME_INDEX).vector(resume_key(resume_id)) if resume_id is not None else None
+    if vector is None:
+        if not resume_data:
+            return []
+        vector = embed_texts([resume_document(resume_data)])[0]
+    jobs = get_index(JOB_INDEX)
+    ids = jobs.find(lambda label: owner in label.get("owners", ())) if owner is not None else None
+    matches = []
+    for key, score in jobs.search(vector, k, ids=ids)[0]:
+        # Who else analyzed a posting is not part of the result
+        label = {field: value for field, value in jobs.label(key).items() if field != "owners"}
+        matches.append(dict({"url": key}, **label, score=round(score, 4)))
+    return matches
+
+
+def rank_resumes(
+    job_url: Optional[str] = None,
+    job_data: Optional[Dict] = None,
+    resume_ids: Optional[Iterable] = None,
+    k: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Indexed resumes ranked by similarity to a job posting, best first.
+
+    Args:
+        job_url: Posting URL; its stored vector is used when it is indexed
+        job_data: Analyzed posting, embedded when the URL is not indexed
+        resume_ids: Only rank these resumes (resumes not yet indexed are skipped)
+        k: Results to return (default: all of resume_ids, else 10)
+
+    Returns:
+        list: {"resume_id", "score"} per resume
+    """
+    vector = get_index(JOB_INDEX).vector(job_key(job_url)) if job_url else None
+    if vector is None:
+        if not job_data:
+            return []
+        vector = embed_texts([job_document(job_data)])[0]
+    keys = [resume_key(rid) for rid in resume_ids] if resume_ids is not None else None
+    k = k or (len(keys) if keys is not None else 10)
+    return [
+        {"resume_id": int(key), "score": round(score, 4)}
+        for key, score in get_index(RESUME_INDEX).search(vector, k, ids=keys)[0]
+    ]
@@ -0,0 +1,111 @@
+"""
+File Listing Module
+Keyset (cursor) pagination over a user's uploaded files, ordered newest
+first on (uploaded_at, id). Each page is one index range scan on the
+(user_id, uploaded_at, id) index: no COUNT(*), no OFFSET, and no
+processed_content blobs, so deep pages cost the same as the first.
+"""
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db.models import Q
+
+from .models import UploadedFile
+
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+# Only the columns the list views render
+LIST_COLUMNS = ("id", "file", "uploaded_at", "user_id")
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+@dataclass
+class FilePage:
+    """One page of uploaded files plus the cursor for the next page"""
+    files: List[UploadedFile]
+    next_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def owner_id(user) -> Optional[str]:
+    """UploadedFile.user_id value for a request user, or None when anonymous"""
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None
+    return str(user.id)
+
+
+def encode_cursor(uploaded_at: datetime, file_id: int) -> str:
+    raw = f"{uploaded_at.isoformat()}|{file_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, file_id = base64.urlsafe_b64decode(padded).decode("ascii").split("|")
+        return datetime.fromisoformat(timestamp), int(file_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def list_files_page(
+    user_id: Optional[str],
+    cursor: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    content_keys: Tuple[str, ...] = ("name",),
+) -> FilePage:
+    """
+    Fetch one page of uploaded files, newest first.
+
+    Args:
+        user_id: Owner to scope the listing to; None lists every file and is
+            only meant for the unauthenticated development views
+        cursor: Opaque cursor from a previous page's next_cursor
+        page_size: Files per page, capped at MAX_PAGE_SIZE
+        content_keys: processed_content keys to project as content_<key>
+
+    Raises:
+        InvalidCursor: If the cursor was not produced by encode_cursor
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    queryset = UploadedFile.objects.only(*LIST_COLUMNS)
+    if content_keys:
+        queryset = queryset.with_content_keys(*content_keys, as_text=True)
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    if cursor:
+        uploaded_at, file_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(uploaded_at__lt=uploaded_at) | Q(uploaded_at=uploaded_at, id__lt=file_id)
+        )
+
+    # Fetch one extra row to learn whether another page exists
+    files = list(queryset.order_by("-uploaded_at", "-id")[: page_size + 1])
+    next_cursor = None
+    if len(files) > page_size:
+        files = files[:page_size]
+        last = files[-1]
+        next_cursor = encode_cursor(last.uploaded_at, last.id)
+    return FilePage(files=files, next_cursor=next_cursor)
+
+
+def serialize_file(file_obj: UploadedFile) -> dict:
+    """Compact JSON representation used by the file list API"""
+    return {
+        "id": file_obj.id,
+        "filename": file_obj.file.name.rsplit("/", 1)[-1] if file_obj.file else None,
+        "uploaded_at": file_obj.uploaded_at,
+        "name": getattr(file_obj, "content_name", None),
+    }
@@ -0,0 +1,200 @@
+"""
+Health Module
+Background health monitor behind the health and readiness endpoints. A
+daemon thread (started lazily, once per worker process) checks the database,
+the cache and DeepSeek reachability on their own intervals; probes only read
+the latest snapshot, so they don't wait on, or add load to, a dependency
+(except a worker's first readiness probe, which waits for the first DB check).
+
+Liveness (is this process serving requests?) never depends on a component.
+Readiness requires every critical component to be healthy and fresh.
+"""
+
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+import requests
+from django.core.cache import caches
+from django.db import connections
+
+from . import llm_client
+
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "10"))
+HEALTH_LLM_CHECK_INTERVAL = float(os.getenv("HEALTH_LLM_CHECK_INTERVAL", "60"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+
+OK, DEGRADED, DOWN, UNKNOWN = "ok", "degraded", "down", "unknown"
+
+
+class Degraded(Exception):
+    """Raised by a check when the component responds but is not fully usable"""
+
+
+@dataclass
+class ComponentStatus:
+    status: str = UNKNOWN
+    latency_ms: Optional[float] = None
+    checked_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class Component:
+    name: str
+    check: Callable[[], None]
+    interval: float
+    # Readiness fails when a critical component is unhealthy or stale
+    critical: bool = False
+    next_run: float = 0.0
+
+    @property
+    def stale_after(self) -> float:
+        return self.interval * 3
+
+
+def check_database():
+    connection = connections["default"]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    finally:
+        # Return the connection (or pool slot) instead of holding it between checks
+        connection.close()
+
+
+def check_cache():
+    cache = caches["default"]
+    key = f"health:{uuid.uuid4().hex}"
+    cache.set(key, 1, 30)
+    try:
+        if cache.get(key) != 1:
+            raise Degraded("cache read-back mismatch")
+    finally:
+        cache.delete(key)
+
+
+def check_llm():
+    """DeepSeek is reachable when its (free) model listing answers"""
+    api_key = os.getenv("DEEPSEEK_API_KEY")
+    if not api_key:
+        raise Degraded("DEEPSEEK_API_KEY not set")
+    response = requests.get(
+        llm_client.DEEPSEEK_MODELS_URL, headers={"Authorization": f"Bearer {api_key}"}, timeout=HEALTH_CHECK_TIMEOUT
+    )
+    if response.status_code in (401, 403):
+        raise Degraded(f"API key rejected ({response.status_code})")
+    if response.status_code >= 500:
+        raise RuntimeError(f"HTTP {response.status_code}")
+
+
+def default_components() -> List[Component]:
+    return [
+        Component("database", check_database, HEALTH_CHECK_INTERVAL, critical=True),
+        Component("cache", check_cache, HEALTH_CHECK_INTERVAL),
+        Component("llm", check_llm, HEALTH_LLM_CHECK_INTERVAL),
+    ]
+
+
+class HealthMonitor:
+    """Runs component checks in a daemon thread and keeps the latest results"""
+
+    def __init__(self, components: List[Component]):
+        self.components = components
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self._statuses: Dict[str, ComponentStatus] = {c.name: ComponentStatus() for c in components}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._critical_checked = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def ensure_running(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+                    self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_check(self, component: Component):
+        started = time.perf_counter()
+        try:
+            component.check()
+            status, error = OK, None
+        except Degraded as e:
+            status, error = DEGRADED, str(e)[:200]
+        except Exception as e:
+            status, error = DOWN, f"{type(e).__name__}: {e}"[:200]
+        result = ComponentStatus(
+            status=status,
+            latency_ms=round((time.perf_counter() - started) * 1000, 2),
+            checked_at=time.time(),
+            error=error,
+        )
+        with self._lock:
+            self._statuses[component.name] = result
+            if all(self._statuses[c.name].checked_at for c in self.components if c.critical):
+                self._critical_checked.set()
+
+    def wait_for_critical(self, timeout: float) -> bool:
+        """Block until every critical component has been checked once (cold start only)"""
+        return self._critical_checked.wait(timeout)
+
+    def _run(self):
+        while True:
+            now = time.monotonic()
+            for component in self.components:
+                if now >= component.next_run:
+                    self.run_check(component)
+                    component.next_run = time.monotonic() + component.interval
+            next_due = min(c.next_run for c in self.components)
+            self._wakeup.wait(max(0.1, next_due - time.monotonic()))
+            self._wakeup.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Latest result per component, with its age and staleness"""
+        now = time.time()
+        with self._lock:
+            statuses = dict(self._statuses)
+        snapshot = {}
+        for component in self.components:
+            entry = asdict(statuses[component.name])
+            checked_at = entry.pop("checked_at")
+            entry["age_s"] = round(now - checked_at, 1) if checked_at else None
+            entry["stale"] = checked_at is None or now - checked_at > component.stale_after
+            entry["critical"] = component.critical
+            snapshot[component.name] = entry
+        return snapshot
+
+    def is_ready(self, snapshot: Dict[str, Dict]) -> bool:
+        return all(
+            entry["status"] == OK and not entry["stale"]
+            for entry in snapshot.values()
+            if entry["critical"]
+        )
+
+
+_monitor: Optional[HealthMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> HealthMonitor:
+    """This process's monitor, started on first use (and again after a fork)"""
+    global _monitor
+    monitor = _monitor
+    if monitor is None or monitor.pid != os.getpid():
+        with _monitor_lock:
+            if _monitor is None or _monitor.pid != os.getpid():
+                _monitor = HealthMonitor(default_components())
+            monitor = _monitor
+    monitor.ensure_running()
+    return monitor
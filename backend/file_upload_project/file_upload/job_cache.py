@@ -0,0 +1,61 @@
+"""
+Job Posting Cache Module
+Caches structured job posting analyses by URL in the Django cache, so a
+posting is scraped and sent to the AI service once per TTL.
+"""
+
+import hashlib
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from django.core.cache import cache
+
+from . import metrics
+
+
+# Job postings rarely change within a day; default to 6 hours
+JOB_CACHE_TTL = int(os.getenv("JOB_CACHE_TTL", str(6 * 60 * 60)))
+
+KEY_PREFIX = "job_posting:v1:"
+
+
+def normalize_job_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings share a cache entry"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def job_cache_key(url: str) -> str:
+    """Fixed-length cache key for a job posting URL"""
+    digest = hashlib.sha256(normalize_job_url(url).encode("utf-8")).hexdigest()
+    return KEY_PREFIX + digest
+
+
+def get_cached_job(url: str) -> Optional[Dict]:
+    """Return the cached job analysis for a URL, or None"""
+    try:
+        job_details = cache.get(job_cache_key(url))
+    except Exception:
+        # A cache outage must never break job extraction
+        metrics.inc("cache_requests_total", cache="job_posting", result="error")
+        return None
+    metrics.inc("cache_requests_total", cache="job_posting", result="miss" if job_details is None else "hit")
+    return job_details
+
+
+def set_cached_job(url: str, job_details: Dict, timeout: Optional[int] = None) -> bool:
+    """
+    Cache a successful job analysis.
+
+    Error structures from extractJobDescription (which carry a status_code)
+    are never cached.
+    """
+    if not isinstance(job_details, dict) or "status_code" in job_details:
+        return False
+    try:
+        cache.set(job_cache_key(url), job_details, timeout or JOB_CACHE_TTL)
+        return True
+    except Exception:
+        return False
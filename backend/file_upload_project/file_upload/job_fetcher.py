@@ -0,0 +1,199 @@
+"""
+Job Page Fetcher Module
+Streams job posting pages with a hard size cap and extracts their text
+incrementally with lxml, so large career pages never sit fully in memory.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from lxml import etree
+
+from . import timing
+
+
+# Hard cap on decoded response body bytes read per page
+MAX_PAGE_BYTES = int(os.getenv("JOB_PAGE_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# Cap on collected text; job postings are far shorter than this
+MAX_TEXT_CHARS = int(os.getenv("JOB_PAGE_MAX_TEXT_CHARS", "100000"))
+
+CHUNK_SIZE = 64 * 1024
+
+FETCH_TIMEOUT = 10
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Set up headers to mimic a real browser request
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+class UnsupportedContentType(ValueError):
+    """Raised when a job posting URL does not serve an HTML document"""
+
+    def __init__(self, content_type: str):
+        super().__init__(f"Unsupported content type: {content_type or 'unknown'}")
+        self.content_type = content_type
+
+
+@dataclass
+class JobPage:
+    """Result of fetching a job posting page"""
+    url: str
+    status_code: int
+    reason: str
+    text: str = ""
+    bytes_read: int = 0
+    truncated: bool = False
+    html: Optional[str] = None
+
+
+class _TextCollector:
+    """
+    lxml parser target that keeps only visible text.
+    Skips script/style/noscript/svg subtrees and separates block elements.
+    """
+
+    SKIP_TAGS = {"script", "style", "noscript", "svg", "template"}
+    BLOCK_TAGS = {
+        "p", "div", "br", "li", "ul", "ol", "tr", "td", "th", "table", "section",
+        "article", "header", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "dd", "dt",
+    }
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.parts = []
+        self.size = 0
+        self.skip_depth = 0
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.max_chars
+
+    def start(self, tag, attrib):
+        if self.skip_depth or tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.data(" ")
+
+    def end(self, tag):
+        if self.skip_depth:
+            self.skip_depth -= 1
+        elif tag in self.BLOCK_TAGS:
+            self.data(" ")
+
+    def data(self, data):
+        if self.skip_depth or self.full:
+            return
+        self.parts.append(data)
+        self.size += len(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        text = re.sub(r"\s+", " ", "".join(self.parts)).strip()
+        return text[: self.max_chars]
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+def fetch_job_page(
+    url: str,
+    session: Optional[requests.Session] = None,
+    keep_html: bool = False,
+    max_bytes: int = MAX_PAGE_BYTES,
+    timeout: float = FETCH_TIMEOUT,
+) -> JobPage:
+    """
+    Streams a job posting page and extracts its visible text.
+
+    Args:
+        url: Job posting URL
+        session: Optional requests session for connection reuse
+        keep_html: Whether to also return the (size-capped) raw HTML
+        max_bytes: Hard cap on body bytes read
+        timeout: Connect/read timeout in seconds
+
+    Returns:
+        JobPage: Status, extracted text and size information
+    Raises:
+        UnsupportedContentType: If the response is not an HTML document
+        requests.exceptions.RequestException: On network errors
+    """
+    started = time.perf_counter()
+    parse_seconds = 0.0
+    http = session or requests
+    response = http.get(
+        url,
+        headers=DEFAULT_HEADERS,
+        timeout=timeout,
+        allow_redirects=True,
+        verify=True,  # Verify SSL certificates
+        stream=True,
+    )
+
+    with response:
+        page = JobPage(url=url, status_code=response.status_code, reason=response.reason or "")
+        if response.status_code != 200:
+            return page
+
+        # Reject non-HTML documents before reading any of the body
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and _media_type(content_type) not in HTML_CONTENT_TYPES:
+            raise UnsupportedContentType(content_type)
+
+        declared_charset = "charset=" in content_type.lower()
+        collector = _TextCollector(MAX_TEXT_CHARS)
+        parser = etree.HTMLParser(
+            target=collector,
+            encoding=response.encoding if declared_charset else None,
+            remove_comments=True,
+        )
+        raw_html = bytearray() if keep_html else None
+
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if not chunk:
+                continue
+            remaining = max_bytes - page.bytes_read
+            if len(chunk) > remaining:
+                chunk = chunk[:remaining]
+                page.truncated = True
+            if chunk:
+                page.bytes_read += len(chunk)
+                parse_started = time.perf_counter()
+                parser.feed(chunk)
+                parse_seconds += time.perf_counter() - parse_started
+                if raw_html is not None:
+                    raw_html.extend(chunk)
+            if page.truncated or collector.full:
+                page.truncated = True
+                break
+
+        # Closing a parser that was never fed raises, so skip empty bodies
+        if page.bytes_read:
+            parse_started = time.perf_counter()
+            page.text = parser.close()
+            parse_seconds += time.perf_counter() - parse_started
+        if raw_html is not None:
+            page.html = raw_html.decode(response.encoding or "utf-8", errors="replace")
+
+    # Parsing is interleaved with the streamed download; report them separately
+    total_seconds = time.perf_counter() - started
+    timing.record("job.fetch", (total_seconds - parse_seconds) * 1000)
+    timing.record("job.parse", parse_seconds * 1000)
+    return page
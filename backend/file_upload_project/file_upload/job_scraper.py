@@ -0,0 +1,237 @@
+"""
+Concurrent Job Scraper Module
+Fetches many job posting URLs concurrently while staying polite to each
+host, and feeds every page into the normal extraction/AI pipeline
+(extractJobDescription) as soon as it arrives.
+"""
+
+import contextlib
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+from . import metrics
+from .utils import extractJobDescription
+
+
+@dataclass
+class ScrapeResult:
+    """Outcome of scraping and analyzing a single job posting URL"""
+    url: str
+    job_details: Dict
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return "status_code" not in self.job_details
+
+
+class HostPolicy:
+    """
+    Per-host politeness: at most `max_concurrent` in-flight fetches and at
+    least `min_interval` seconds between the starts of consecutive fetches.
+    """
+
+    def __init__(self, max_concurrent: int, min_interval: float):
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    @contextlib.contextmanager
+    def slot(self):
+        with self.semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start)
+                self._next_start = start_at + self.min_interval
+            if start_at > now:
+                time.sleep(start_at - now)
+            yield
+
+
+class DNSCache:
+    """
+    TTL cache of DNS answers, shared by the connections of one scraper.
+
+    Used through CachedDNSAdapter rather than by patching socket.getaddrinfo,
+    so other threads in the process keep the normal resolver.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> str:
+        """
+        An address for host, from the cache while it is fresh.
+
+        Raises:
+            socket.gaierror: When the name cannot be resolved
+        """
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        infos = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        address = infos[0][4][0]
+        with self._lock:
+            self._entries[key] = (now + self.ttl, address)
+        return address
+
+
+class _CachedDNSConnection:
+    """Mixin for urllib3 connections: connect to the cached address of _dns_host"""
+
+    dns_cache: Optional[DNSCache] = None
+
+    def _new_conn(self):
+        # Only the address changes; Host header, SNI and certificate checks still use self.host
+        hostname = self._dns_host
+        try:
+            self._dns_host = self.dns_cache.resolve(hostname, self.port)
+        except OSError:
+            # Let urllib3 resolve again and raise its usual NameResolutionError
+            pass
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = hostname
+
+
+def _with_dns_cache(pool_cls, dns_cache: DNSCache):
+    connection_cls = type(
+        pool_cls.ConnectionCls.__name__,
+        (_CachedDNSConnection, pool_cls.ConnectionCls),
+        {"dns_cache": dns_cache},
+    )
+    return type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": connection_cls})
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections resolve host names through a DNSCache"""
+
+    def __init__(self, dns_cache: Optional[DNSCache] = None, **kwargs):
+        # Set before super().__init__, which builds the pool manager
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        if self.dns_cache is not None:
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": _with_dns_cache(HTTPConnectionPool, self.dns_cache),
+                "https": _with_dns_cache(HTTPSConnectionPool, self.dns_cache),
+            }
+
+    def __setstate__(self, state):
+        self.dns_cache = None
+        super().__setstate__(state)
+
+
+class JobScraper:
+    """
+    Concurrent scraping engine for lists of job posting URLs.
+
+    Args:
+        max_workers: Global cap on concurrent fetch/analysis tasks
+        per_host: Max concurrent fetches against a single host
+        min_interval: Minimum seconds between fetch starts on a single host
+        use_cache: Whether to read and populate the job posting cache
+        refresh: Re-scrape URLs that are already cached and overwrite their entries
+        dns_ttl: Seconds to cache DNS answers; 0 disables the DNS cache
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        per_host: int = 2,
+        min_interval: float = 1.0,
+        use_cache: bool = True,
+        refresh: bool = False,
+        dns_ttl: float = 300.0,
+    ):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self.use_cache = use_cache
+        self.refresh = refresh
+        self.dns_ttl = dns_ttl
+        self._hosts: Dict[str, HostPolicy] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._dns = DNSCache(dns_ttl) if dns_ttl else None
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str):
+        """Lazily create the politeness policy and pooled session for a host"""
+        with self._lock:
+            if host not in self._hosts:
+                # One keep-alive pool per host, sized to its concurrency limit
+                adapter = CachedDNSAdapter(self._dns, pool_connections=1, pool_maxsize=self.per_host)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+                self._hosts[host] = HostPolicy(self.per_host, self.min_interval)
+            return self._hosts[host], self._sessions[host]
+
+    def _scrape_one(self, url: str) -> ScrapeResult:
+        started = time.monotonic()
+        host = urlsplit(url).netloc.lower()
+        policy, session = self._host_state(host)
+        job_details = extractJobDescription(
+            url,
+            session=session,
+            use_cache=self.use_cache,
+            refresh=self.refresh,
+            fetch_guard=policy.slot,
+        )
+        return ScrapeResult(url=url, job_details=job_details, elapsed=time.monotonic() - started)
+
+    def scrape(self, urls: Iterable[str]) -> Iterator[ScrapeResult]:
+        """
+        Scrape and analyze URLs concurrently, yielding results as they complete.
+
+        Duplicate URLs are only fetched once.
+        """
+        unique_urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                metrics.track_submit("job_scraper", executor.submit(self._scrape_one, url)): url
+                for url in unique_urls
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield ScrapeResult(
+                        url=url,
+                        job_details={"url": url, "status_code": 500, "description": str(e), "full_text": ""},
+                        elapsed=0.0,
+                    )
+        finally:
+            # Also runs when the caller stops iterating early: queued URLs are dropped
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.close()
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._hosts.clear()
@@ -0,0 +1,119 @@
+"""
+Lazy Imports Module
+Accessors for the heavy parsing and ML libraries, imported on first use
+instead of while a worker boots. Each accessor is cached, so after the first
+call it costs a dictionary lookup.
+
+warm_imports() and warm_models() load modules and models ahead of traffic;
+gunicorn.conf.py calls them once in the master so every forked worker shares
+what they loaded.
+"""
+
+import functools
+import importlib
+import os
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterable
+
+
+# Modules behind each accessor group, in import order
+IMPORT_GROUPS = {
+    "parsing": (
+        "pdfplumber",
+        "pdfminer.pdfdevice",
+        "pdfminer.pdffont",
+        "pdfminer.pdfinterp",
+        "pdfminer.pdfpage",
+        "lxml.html",
+    ),
+    "ml": ("transformers",),
+}
+
+# Pipelines the analysis helpers use, by name: (task, model)
+MODELS = {
+    "ner": ("ner", "dslim/bert-base-NER"),
+    "qa": ("question-answering", "distilbert-base-cased-distilled-squad"),
+    # Sentence encoder for embeddings.py (mean-pooled, 384 dimensions by default)
+    "embedding": ("feature-extraction", os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def pdfplumber():
+    return importlib.import_module("pdfplumber")
+
+
+@functools.lru_cache(maxsize=None)
+def pdfminer() -> SimpleNamespace:
+    """The pdfminer classes the plain-text PDF backend builds on"""
+    from pdfminer.pdfdevice import PDFTextDevice
+    from pdfminer.pdffont import PDFUnicodeNotDefined
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    return SimpleNamespace(
+        PDFTextDevice=PDFTextDevice,
+        PDFUnicodeNotDefined=PDFUnicodeNotDefined,
+        PDFPageInterpreter=PDFPageInterpreter,
+        PDFResourceManager=PDFResourceManager,
+        PDFPage=PDFPage,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def lxml_html():
+    return importlib.import_module("lxml.html")
+
+
+@functools.lru_cache(maxsize=None)
+def pipeline(task: str, model: str):
+    """
+    Transformers pipeline for (task, model), built once per process.
+
+    Loading a model takes seconds and hundreds of MB, so callers share one
+    instance rather than building a pipeline per call.
+    """
+    from transformers import pipeline as build_pipeline
+    return build_pipeline(task, model=model)
+
+
+def warm_imports(groups: Iterable[str] = ("parsing",)) -> Dict[str, float]:
+    """
+    Import every module in the given groups.
+
+    Returns:
+        dict: Milliseconds spent per module; modules that are not installed
+            are skipped
+    """
+    timings = {}
+    for group in groups:
+        for module in IMPORT_GROUPS[group]:
+            started = time.perf_counter()
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                continue
+            timings[module] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
+
+
+def warm_models(names: Iterable[str]) -> Dict[str, float]:
+    """
+    Build the named MODELS pipelines.
+
+    Returns:
+        dict: Milliseconds spent per model; unknown names and models that
+            fail to load are skipped
+    """
+    timings = {}
+    for name in names:
+        if name not in MODELS:
+            continue
+        started = time.perf_counter()
+        try:
+            pipeline(*MODELS[name])
+        except Exception:
+            continue
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
@@ -0,0 +1,78 @@
+"""
+LLM Client Module
+Posts chat-completion requests to the DeepSeek API. Each call is timed as an
+llm.<purpose> span and counted for /api/metrics/ by outcome, along with the
+token counts DeepSeek reports in the response's `usage` field.
+
+DEEPSEEK_API_BASE points the client at another DeepSeek-compatible server,
+such as the local stub in llm_stub.py for offline load testing.
+"""
+
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from . import metrics
+from .timing import record
+
+
+DEEPSEEK_API_BASE = os.getenv("DEEPSEEK_API_BASE", "https://api.deepseek.com").rstrip("/")
+DEEPSEEK_CHAT_URL = f"{DEEPSEEK_API_BASE}/chat/completions"
+DEEPSEEK_MODELS_URL = f"{DEEPSEEK_API_BASE}/models"
+
+
+def _record_call(purpose: str, duration_ms: float, outcome: str, usage: Optional[Dict] = None):
+    record(f"llm.{purpose}", duration_ms)
+    metrics.inc("llm_requests_total", purpose=purpose, outcome=outcome)
+    metrics.observe("llm_request_duration_ms", duration_ms, purpose=purpose)
+    if isinstance(usage, dict):
+        metrics.inc("llm_tokens_total", usage.get("prompt_tokens") or 0, purpose=purpose, direction="in")
+        metrics.inc("llm_tokens_total", usage.get("completion_tokens") or 0, purpose=purpose, direction="out")
+        if usage.get("prompt_cache_hit_tokens"):
+            metrics.inc("llm_tokens_total", usage["prompt_cache_hit_tokens"], purpose=purpose, direction="in_cached")
+
+
+def post_chat_completion(
+    data: Dict, purpose: str, api_key: Optional[str]
+) -> Tuple[requests.Response, Optional[Dict]]:
+    """
+    POST a chat-completion payload to DEEPSEEK_CHAT_URL.
+
+    Args:
+        data: Request body (model, messages, max_tokens, ...)
+        purpose: Call site label - 'resume', 'job' or 'analysis'
+        api_key: DeepSeek API key
+
+    Returns:
+        tuple: (response, body). body is the parsed JSON of a 200 response,
+            read once here for the usage counters; None for other statuses,
+            which callers handle from the response
+
+    Raises:
+        requests.RequestException: If the request could not be completed
+        ValueError: If a 200 response is not valid JSON
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+    }
+    started = time.perf_counter()
+    try:
+        response = requests.post(DEEPSEEK_CHAT_URL, headers=headers, json=data)
+    except requests.RequestException as e:
+        _record_call(purpose, (time.perf_counter() - started) * 1000, type(e).__name__)
+        raise
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    if response.status_code != 200:
+        _record_call(purpose, duration_ms, f"http_{response.status_code}")
+        return response, None
+    try:
+        body = response.json()
+    except ValueError:
+        _record_call(purpose, duration_ms, "invalid_json")
+        raise
+    _record_call(purpose, duration_ms, "ok", body.get("usage") if isinstance(body, dict) else None)
+    return response, body
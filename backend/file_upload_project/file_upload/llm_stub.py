@@ -0,0 +1,405 @@
+"""
+LLM Stub Module
+A local stand-in for the DeepSeek API, for load and latency testing without
+network access or API spend. It implements POST /chat/completions (JSON and
+streamed responses) and GET /models, and answers the resume, job and
+analysis prompts with canned JSON that matches what utils.py expects.
+
+Latency, server errors and rate limiting are configurable, so tests can
+reproduce a slow or flaky upstream. It also serves job postings at
+GET /jobs/<id> (canned, or the pages of a generate_corpus corpus), which
+lets the whole analysis pipeline run offline.
+
+Point the app at it with DEEPSEEK_API_BASE=http://127.0.0.1:<port>. Start it
+with `python manage.py llm_stub`, or in-process with StubServer(...).start().
+Only the standard library is used; nothing here imports Django.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+RESUME_RESPONSE = {
+    "name": "Jordan Avery",
+    "contact_info": {"email": "jordan.avery@example.com", "phone": "555-010-0199", "zipCode": "94105"},
+    "work_experience": {
+        "company": "Northwind Analytics",
+        "jobTitle": "Software Engineer",
+        "startDate": "2021-06",
+        "endDate": "Present",
+        "jobDescription": "Built Django REST APIs and data pipelines; led migration to PostgreSQL.",
+        "yearsOfExperience": "4",
+    },
+    "education": {
+        "institution": "State University",
+        "highestDegree": "B.S.",
+        "fieldOfStudy": "Computer Science",
+        "graduationYear": "2021",
+    },
+    "projects": {
+        "projectName": "Resume Matcher",
+        "projectDescription": "Matches resumes to job postings with NLP scoring.",
+        "technologiesUsed": "Python, Django, React",
+    },
+    "certifications": {
+        "certificationName": "AWS Certified Developer",
+        "issuingOrganization": "Amazon Web Services",
+        "issueDate": "2023-03",
+        "expirationDate": "2026-03",
+    },
+    "languages": {"language": "English", "proficiency": "Native"},
+    "linkedinUrl": "https://www.linkedin.com/in/jordan-avery",
+    "skills": ["Python", "Django", "PostgreSQL", "REST APIs", "Docker", "React"],
+}
+
+JOB_RESPONSE = {
+    "title": "Backend Engineer",
+    "description": "Design and operate the APIs behind our hiring platform.",
+    "qualifications": ["3+ years building web services", "Bachelor's degree or equivalent experience"],
+    "skills": ["Python", "Django", "PostgreSQL", "Kubernetes", "Redis"],
+    "responsibilities": ["Build and maintain REST APIs", "Own service reliability", "Review code"],
+    "salary_range": "$120,000 - $150,000",
+    "location": "Remote (US)",
+    "posted_date": "2025-01-15",
+    "company_name": "Contoso Talent",
+}
+
+ANALYSIS_RESPONSE = {
+    "strengths": ["Strong Python and Django experience", "Production PostgreSQL work"],
+    "weaknesses": ["No Kubernetes experience listed", "No Redis experience listed"],
+    "improvement_tips": ["Quantify the impact of the PostgreSQL migration", "Mention any container orchestration work"],
+    "keywords_missing": ["Kubernetes", "Redis"],
+    "keywords_found": ["Python", "Django", "PostgreSQL"],
+    "match_score": 72,
+}
+
+JOB_PAGE_HTML = """<!DOCTYPE html>
+<html><head><title>Backend Engineer - Contoso Talent</title></head>
+<body><main>
+<h1>Backend Engineer</h1><p>Contoso Talent - Remote (US) - $120,000 - $150,000</p>
+<h2>About the role</h2><p>Design and operate the APIs behind our hiring platform. Posting {job_id}.</p>
+<h2>Responsibilities</h2><ul><li>Build and maintain REST APIs</li><li>Own service reliability</li><li>Review code</li></ul>
+<h2>Qualifications</h2><ul><li>3+ years building web services</li><li>Python, Django, PostgreSQL, Kubernetes, Redis</li></ul>
+</main></body></html>
+"""
+
+# Phrases from the prompt templates in utils.py that identify each call
+PROMPT_MARKERS = (
+    ("analysis", '"match_score"'),
+    ("resume", '"work_experience"'),
+    ("job", "qualifications = list"),
+)
+
+CHUNK_CHARS = 24
+
+
+def classify_prompt(messages: List[Dict]) -> str:
+    """'resume', 'job', 'analysis' or 'unknown', from the prompt text"""
+    text = " ".join(str(m.get("content", "")) for m in messages if isinstance(m, dict))
+    for kind, marker in PROMPT_MARKERS:
+        if marker in text:
+            return kind
+    return "unknown"
+
+
+def canned_content(kind: str, rng: random.Random) -> str:
+    """JSON message content for a prompt kind"""
+    if kind == "resume":
+        return json.dumps(RESUME_RESPONSE)
+    if kind == "job":
+        return json.dumps(JOB_RESPONSE)
+    if kind == "analysis":
+        return json.dumps(dict(ANALYSIS_RESPONSE, match_score=rng.randint(40, 95)))
+    return json.dumps({"result": "ok"})
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency sampler in milliseconds from a spec string:
+
+        fixed:800            always 800ms
+        uniform:500,1500     uniform between 500 and 1500ms
+        normal:1200,300      mean 1200ms, standard deviation 300ms
+        lognormal:1200,0.5   median 1200ms, sigma 0.5 (long right tail, like real LLM calls)
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",")] if args else []
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec}")
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Invalid latency spec: {spec}")
+
+
+@dataclass
+class StubConfig:
+    latency: str = "lognormal:1200,0.5"
+    # Streamed responses send the first chunk after this share of the latency
+    first_token_share: float = 0.3
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    # Requests in flight beyond this get a 429 (0 = unlimited)
+    max_concurrent: int = 0
+    retry_after: int = 1
+    seed: Optional[int] = None
+    # Serve /jobs/<id> from <id>.html here when present (e.g. a generate_corpus jobs/ dir)
+    jobs_dir: Optional[str] = None
+
+
+@dataclass
+class StubStats:
+    requests: Counter = field(default_factory=Counter)
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def to_json(self) -> Dict:
+        return {
+            "requests": {f"{kind}:{outcome}": n for (kind, outcome), n in sorted(self.requests.items())},
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StubHTTPServer"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: int, message: str, error_type: str, headers: Optional[Dict] = None):
+        self._send_json(status, {"error": {"message": message, "type": error_type}}, headers)
+
+    def _authorized(self) -> bool:
+        auth = self.headers.get("Authorization", "")
+        if auth.startswith("Bearer ") and auth[7:].strip() and auth[7:].strip() != "None":
+            return True
+        self._send_error(401, "Authentication Fails (no API key)", "authentication_error")
+        return False
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/models":
+            if self._authorized():
+                self._send_json(200, {"object": "list", "data": [
+                    {"id": "deepseek-chat", "object": "model", "owned_by": "stub"},
+                    {"id": "deepseek-reasoner", "object": "model", "owned_by": "stub"},
+                ]})
+        elif path == "/stats":
+            with self.server.lock:
+                self._send_json(200, self.server.stats.to_json())
+        elif re.fullmatch(r"/jobs/[\w-]+", path):
+            payload = self._job_page(path.rsplit("/", 1)[1])
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self._send_error(404, f"Not found: {path}", "invalid_request_error")
+
+    def _job_page(self, job_id: str) -> bytes:
+        jobs_dir = self.server.config.jobs_dir
+        if jobs_dir:
+            try:
+                with open(os.path.join(jobs_dir, f"{job_id}.html"), "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                pass
+        return JOB_PAGE_HTML.format(job_id=job_id).encode()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.path.split("?", 1)[0].rstrip("/") != "/chat/completions":
+            self._send_error(404, f"Not found: {self.path}", "invalid_request_error")
+            return
+        if not self._authorized():
+            return
+        try:
+            body = json.loads(raw or b"{}")
+            messages = body["messages"]
+        except (ValueError, KeyError, TypeError):
+            self._send_error(400, "Request body must be JSON with a messages list", "invalid_request_error")
+            return
+
+        kind = classify_prompt(messages)
+        server = self.server
+        with server.lock:
+            server.stats.in_flight += 1
+            server.stats.peak_in_flight = max(server.stats.peak_in_flight, server.stats.in_flight)
+            over_capacity = server.config.max_concurrent and server.stats.in_flight > server.config.max_concurrent
+            roll = server.rng.random()
+            latency_ms = server.sample_latency(server.rng)
+            content = canned_content(kind, server.rng)
+        try:
+            outcome = self._respond(body, messages, kind, content, latency_ms, roll, over_capacity)
+        finally:
+            with server.lock:
+                server.stats.in_flight -= 1
+                server.stats.requests[(kind, outcome)] += 1
+
+    def _respond(self, body, messages, kind, content, latency_ms, roll, over_capacity) -> str:
+        config = self.server.config
+        retry_headers = {"Retry-After": str(config.retry_after)}
+        if over_capacity:
+            self._send_error(429, "Too many concurrent requests", "rate_limit_error", retry_headers)
+            return "429"
+        if roll < config.rate_limit_rate:
+            self._send_error(429, "Rate limit reached for requests", "rate_limit_error", retry_headers)
+            return "429"
+        if roll < config.rate_limit_rate + config.error_rate:
+            # Failures still take time, as they do upstream
+            time.sleep(latency_ms * config.first_token_share / 1000)
+            self._send_error(500, "The server had an error while processing your request", "server_error")
+            return "500"
+
+        prompt_tokens = estimate_tokens(json.dumps(messages))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": estimate_tokens(content),
+            "total_tokens": prompt_tokens + estimate_tokens(content),
+            # The system message is the shared prefix DeepSeek's context cache would hit
+            "prompt_cache_hit_tokens": estimate_tokens(json.dumps(messages[:1])),
+        }
+        completion_id = f"stub-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "deepseek-chat")
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            self._stream(completion_id, model, content, latency_ms, usage if include_usage else None)
+            return "ok_stream"
+
+        time.sleep(latency_ms / 1000)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+        return "ok"
+
+    def _stream(self, completion_id: str, model: str, content: str, latency_ms: float, usage: Optional[Dict]):
+        """Server-sent events: a role chunk, content deltas spread over the latency, then [DONE]"""
+        chunks = [content[i:i + CHUNK_CHARS] for i in range(0, len(content), CHUNK_CHARS)] or [""]
+        first_token_s = latency_ms * self.server.config.first_token_share / 1000
+        per_chunk_s = (latency_ms / 1000 - first_token_s) / len(chunks)
+
+        def event(delta: Dict, finish_reason=None, **extra) -> bytes:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode()
+
+        def events() -> Iterator[bytes]:
+            time.sleep(first_token_s)
+            yield event({"role": "assistant", "content": ""})
+            for piece in chunks:
+                time.sleep(per_chunk_s)
+                yield event({"content": piece})
+            yield event({}, "stop", **({"usage": usage} if usage else {}))
+            yield b"data: [DONE]\n\n"
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for data in events():
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once
+    request_queue_size = 128
+
+    def __init__(self, address, config: StubConfig, verbose: bool = False):
+        super().__init__(address, StubHandler)
+        self.config = config
+        self.verbose = verbose
+        self.sample_latency = parse_latency(config.latency)
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.stats = StubStats()
+
+
+class StubServer:
+    """Runs the stub in a background thread, e.g. for a benchmark or load test"""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0,
+                 verbose: bool = False):
+        self.httpd = StubHTTPServer((host, port), config or StubConfig(), verbose)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> Dict:
+        with self.httpd.lock:
+            return self.httpd.stats.to_json()
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="llm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
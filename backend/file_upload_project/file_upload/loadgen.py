@@ -0,0 +1,288 @@
+"""
+Load Generator Module
+Open-loop HTTP load for the production API, used by `manage.py load_test`.
+
+Requests are scheduled at a target rate (constant or Poisson arrivals) and
+latency is measured from each request's scheduled start, so a server that
+falls behind shows up as queueing in the percentiles instead of silently
+lowering the offered load. Each request is one scenario (a resume upload,
+an analysis, a job posting or a profile read) drawn from a weighted mix.
+
+The summary and compare() output are plain JSON-able dicts so runs can be
+stored and checked against a baseline.
+"""
+
+import itertools
+import json
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from . import synthetic_corpus
+from .synthetic_corpus import DOCX_MIME
+from .throttling import AnalysisThrottle, JobPostingThrottle, ProfileThrottle, UploadThrottle
+
+
+# Scenario -> (method, path); uploads and analyses also carry a resume file
+SCENARIOS = {
+    "upload": ("POST", "/api/resume-upload/"),
+    "analysis": ("POST", "/api/analysis/"),
+    "job": ("POST", "/api/job-upload/"),
+    "profile": ("GET", "/api/profile/"),
+}
+
+DEFAULT_MIX = "upload=2,analysis=1,job=2,profile=5"
+
+# Weighted throttle each scenario's production view draws on; its cost is the scenario's cost
+SCENARIO_THROTTLES = {
+    "upload": UploadThrottle,
+    "analysis": AnalysisThrottle,
+    "job": JobPostingThrottle,
+    "profile": ProfileThrottle,
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse 'upload=2,analysis=1,...' into scenario weights.
+
+    Raises:
+        ValueError: On an unknown scenario or a non-positive total
+    """
+    weights = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (expected one of {', '.join(SCENARIOS)})")
+        weights[name] = float(weight or 1)
+    if sum(weights.values()) <= 0:
+        raise ValueError(f"Scenario mix has no weight: {spec}")
+    return weights
+
+
+def sample_resumes(seed: int = 0, count: int = 4) -> List[Tuple[str, bytes, str]]:
+    """Short synthetic resumes, alternating PDF and DOCX, as (filename, content, content type)"""
+    resumes = []
+    for i in range(count):
+        rng = random.Random(f"{seed}:loadtest:{i}")
+        layout = synthetic_corpus.LAYOUTS[i % len(synthetic_corpus.LAYOUTS)]
+        pages = rng.randint(1, 2)
+        if i % 2:
+            content = synthetic_corpus.resume_docx(rng, pages, layout, tables=1)
+            resumes.append((f"loadtest_resume_{i}.docx", content, DOCX_MIME))
+        else:
+            content = synthetic_corpus.resume_pdf(rng, pages, layout, tables=1)
+            resumes.append((f"loadtest_resume_{i}.pdf", content, "application/pdf"))
+    return resumes
+
+
+def corpus_resumes(corpus_dir: str) -> List[Tuple[str, bytes, str]]:
+    """The resumes listed in a generate_corpus manifest"""
+    with open(os.path.join(corpus_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    resumes = []
+    for entry in manifest["resumes"]:
+        with open(os.path.join(corpus_dir, entry["file"]), "rb") as f:
+            content = f.read()
+        content_type = DOCX_MIME if entry["format"] == "docx" else "application/pdf"
+        resumes.append((os.path.basename(entry["file"]), content, content_type))
+    return resumes
+
+
+def corpus_job_ids(corpus_dir: str) -> List[str]:
+    """Job page ids in a generate_corpus manifest, as the LLM stub serves them under /jobs/"""
+    with open(os.path.join(corpus_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    return [os.path.splitext(os.path.basename(entry["file"]))[0] for entry in manifest["jobs"]]
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Result:
+    scenario: str
+    status: int  # 0 when no response was received
+    latency_ms: float  # from the scheduled start, so includes client-side queueing
+    service_ms: float  # from the moment the request was sent
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadPlan:
+    base_url: str
+    tokens: List[str]
+    job_urls: List[str]
+    resumes: List[Tuple[str, bytes, str]]
+    mix: Dict[str, float]
+    rps: float
+    duration: float
+    concurrency: int = 64
+    arrival: str = "poisson"
+    timeout: float = 120.0
+    seed: int = 0
+    results: List[Result] = field(default_factory=list)
+
+
+class LoadGenerator:
+    """Sends a LoadPlan's requests from a thread pool; one HTTP session per thread"""
+
+    def __init__(self, plan: LoadPlan, on_progress: Optional[Callable[[int, int], None]] = None):
+        self.plan = plan
+        self.on_progress = on_progress
+        self.rng = random.Random(plan.seed)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Requests that found every client thread busy at their scheduled time
+        self.client_saturated = 0
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def schedule(self) -> List[float]:
+        """Offsets in seconds from the start of the run"""
+        offsets, t = [], 0.0
+        interval = 1.0 / self.plan.rps
+        while True:
+            t += self.rng.expovariate(self.plan.rps) if self.plan.arrival == "poisson" else interval
+            if t >= self.plan.duration:
+                return offsets
+            offsets.append(t)
+
+    def _request_kwargs(self, scenario: str, index: int) -> Dict:
+        plan = self.plan
+        kwargs = {"headers": {"Authorization": f"Bearer {plan.tokens[index % len(plan.tokens)]}"}}
+        if scenario in ("upload", "analysis"):
+            name, content, content_type = plan.resumes[index % len(plan.resumes)]
+            kwargs["files"] = {"file": (name, content, content_type)}
+            kwargs["data"] = {"anonymize_pii": "true"}
+        if scenario in ("analysis", "job"):
+            kwargs.setdefault("data", {})["job_posting_url"] = plan.job_urls[index % len(plan.job_urls)]
+        return kwargs
+
+    def _send(self, scenario: str, index: int, scheduled_at: float) -> Result:
+        method, path = SCENARIOS[scenario]
+        sent_at = time.perf_counter()
+        try:
+            response = self._session().request(
+                method, self.plan.base_url + path, timeout=self.plan.timeout,
+                **self._request_kwargs(scenario, index),
+            )
+            status, error = response.status_code, None
+            if status >= 400 and status != 429:
+                error = response.text[:200]
+        except requests.RequestException as e:
+            status, error = 0, f"{type(e).__name__}: {e}"[:200]
+        finished_at = time.perf_counter()
+        with self._lock:
+            self.in_flight -= 1
+        return Result(scenario, status, (finished_at - scheduled_at) * 1000, (finished_at - sent_at) * 1000, error)
+
+    def run(self) -> List[Result]:
+        plan = self.plan
+        scenarios, weights = zip(*plan.mix.items())
+        offsets = self.schedule()
+        futures = []
+        with ThreadPoolExecutor(max_workers=plan.concurrency, thread_name_prefix="loadgen") as executor:
+            started = time.perf_counter()
+            for index, offset in enumerate(offsets):
+                delay = started + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                with self._lock:
+                    if self.in_flight >= plan.concurrency:
+                        self.client_saturated += 1
+                    self.in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                scenario = self.rng.choices(scenarios, weights)[0]
+                futures.append(executor.submit(self._send, scenario, index, started + offset))
+                if self.on_progress and index % 50 == 0:
+                    self.on_progress(index, len(offsets))
+            plan.results = [future.result() for future in futures]
+        self.wall_s = time.perf_counter() - started
+        return plan.results
+
+
+def summarize_results(results: List[Result], wall_s: float) -> Dict:
+    """Counts, error rates and latency percentiles, overall and per scenario"""
+
+    def summarize(group: List[Result]) -> Dict:
+        latencies = sorted(r.latency_ms for r in group)
+        service = sorted(r.service_ms for r in group)
+        statuses = {}
+        for r in group:
+            statuses[str(r.status)] = statuses.get(str(r.status), 0) + 1
+        ok = sum(1 for r in group if 200 <= r.status < 300)
+        throttled = sum(1 for r in group if r.status == 429)
+        errors = len(group) - ok - throttled
+        return {
+            "requests": len(group),
+            "ok": ok,
+            "throttled": throttled,
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4) if group else 0.0,
+            "throughput_rps": round(ok / wall_s, 2) if wall_s else 0.0,
+            "latency_ms": {
+                "p50": _round(percentile(latencies, 50)),
+                "p95": _round(percentile(latencies, 95)),
+                "p99": _round(percentile(latencies, 99)),
+                "max": _round(latencies[-1] if latencies else None),
+                "mean": _round(sum(latencies) / len(latencies) if latencies else None),
+            },
+            "service_ms_p50": _round(percentile(service, 50)),
+            "statuses": statuses,
+        }
+
+    by_scenario = {}
+    for scenario, group in itertools.groupby(sorted(results, key=lambda r: r.scenario), key=lambda r: r.scenario):
+        by_scenario[scenario] = summarize(list(group))
+    errors = [r.error for r in results if r.error]
+    return {
+        "overall": summarize(results),
+        "scenarios": by_scenario,
+        "sample_errors": sorted(set(errors))[:5],
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+def compare(report: Dict, baseline: Dict, max_regression_pct: float, max_error_rate_increase: float = 0.01) -> List[str]:
+    """
+    Regressions of report against baseline, per scenario present in both.
+
+    Returns:
+        list: One message per latency percentile that grew by more than
+            max_regression_pct, or error rate that grew by more than
+            max_error_rate_increase; empty when within budget
+    """
+    regressions = []
+    for scenario, current in report["results"]["scenarios"].items():
+        previous = baseline.get("results", {}).get("scenarios", {}).get(scenario)
+        if not previous:
+            continue
+        for key in ("p50", "p95", "p99"):
+            before, after = previous["latency_ms"].get(key), current["latency_ms"].get(key)
+            if before and after and (after - before) / before * 100 > max_regression_pct:
+                regressions.append(f"{scenario} {key} {before}ms -> {after}ms (+{(after - before) / before * 100:.0f}%)")
+        if current["error_rate"] - previous["error_rate"] > max_error_rate_increase:
+            regressions.append(f"{scenario} error rate {previous['error_rate']:.2%} -> {current['error_rate']:.2%}")
+    return regressions
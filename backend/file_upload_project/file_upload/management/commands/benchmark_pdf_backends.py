@@ -0,0 +1,100 @@
+"""
+Compare PDF text backends on a sample corpus.
+
+Usage:
+    python manage.py benchmark_pdf_backends path/to/pdfs/ --repeat 3
+    python manage.py benchmark_pdf_backends resume1.pdf resume2.pdf --json
+
+Throughput is reported in pages per second; fidelity is the word-sequence
+similarity (0..1) of each backend's output against pdfplumber, the layout
+reference. The 'auto' row shows which backend the quality heuristic chose.
+"""
+
+import difflib
+import io
+import json
+import re
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from file_upload.resume_extraction import PDF_BACKENDS, extract_pdf_text, text_quality
+from file_upload.resume_preflight import count_pdf_pages
+
+
+def _words(text: str) -> list:
+    return re.findall(r"\w+", text.lower())
+
+
+def fidelity(candidate: str, reference: str) -> float:
+    """Word-sequence similarity between two extractions"""
+    if not reference.strip():
+        return 1.0 if not candidate.strip() else 0.0
+    matcher = difflib.SequenceMatcher(None, _words(candidate), _words(reference), autojunk=False)
+    return matcher.ratio()
+
+
+class Command(BaseCommand):
+    help = "Benchmark PDF text extraction backends for throughput and text fidelity"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="PDF files or directories containing PDFs")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per backend and file")
+        parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+
+    def _collect(self, paths):
+        files = []
+        for raw in paths:
+            path = Path(raw)
+            if path.is_dir():
+                files.extend(sorted(path.rglob("*.pdf")))
+            elif path.is_file():
+                files.append(path)
+        if not files:
+            raise CommandError("No PDF files found")
+        return files
+
+    def handle(self, *args, **options):
+        files = self._collect(options["paths"])
+        backends = [name for name, backend in PDF_BACKENDS.items() if backend.available()] + ["auto"]
+        totals = {name: {"seconds": 0.0, "pages": 0, "fidelity": [], "quality": []} for name in backends}
+
+        for path in files:
+            data = path.read_bytes()
+            pages = count_pdf_pages(io.BytesIO(data)) or 1
+            reference = PDF_BACKENDS["pdfplumber"].extract(io.BytesIO(data))
+            for name in backends:
+                elapsed = []
+                text = ""
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    text = extract_pdf_text(io.BytesIO(data), backend=name, page_count=pages)
+                    elapsed.append(time.perf_counter() - started)
+                totals[name]["seconds"] += min(elapsed)
+                totals[name]["pages"] += pages
+                totals[name]["fidelity"].append(fidelity(text, reference))
+                totals[name]["quality"].append(text_quality(text, pages))
+
+        results = []
+        for name, total in totals.items():
+            results.append({
+                "backend": name,
+                "files": len(files),
+                "pages": total["pages"],
+                "pages_per_second": round(total["pages"] / total["seconds"], 2) if total["seconds"] else None,
+                "mean_fidelity": round(sum(total["fidelity"]) / len(total["fidelity"]), 4),
+                "min_fidelity": round(min(total["fidelity"]), 4),
+                "mean_quality": round(sum(total["quality"]) / len(total["quality"]), 4),
+            })
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'backend':<12}{'pages/s':>10}{'fidelity':>10}{'min fid.':>10}{'quality':>10}")
+        for row in results:
+            self.stdout.write(
+                f"{row['backend']:<12}{row['pages_per_second'] or 0:>10}{row['mean_fidelity']:>10}"
+                f"{row['min_fidelity']:>10}{row['mean_quality']:>10}"
+            )
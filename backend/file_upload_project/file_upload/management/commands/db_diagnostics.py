@@ -0,0 +1,104 @@
+"""
+Inspect the database a deployment is connected to.
+
+Usage:
+    python manage.py db_diagnostics
+    python manage.py db_diagnostics --user-id 20 --database default
+
+Reports the server version, connection pool state, unapplied migrations
+and, on PostgreSQL, the Supabase user tables. These checks used to run in
+DebugMiddleware at every worker start; they are now on demand only.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from file_upload.db_pool import pool_stats
+
+
+USER_TABLES = ("users", "profiles", "auth_user")
+
+
+class Command(BaseCommand):
+    help = "Print database connectivity, migration and schema diagnostics"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database alias to inspect")
+        parser.add_argument("--user-id", help="Check that this Supabase user ID exists in the users table")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        if alias not in connections:
+            raise CommandError(f"Unknown database alias: {alias}")
+        connection = connections[alias]
+
+        started = time.perf_counter()
+        try:
+            connection.ensure_connection()
+        except Exception as e:
+            raise CommandError(f"Could not connect to '{alias}': {e}")
+        connect_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(self.style.SUCCESS(f"Connected to '{alias}' ({connection.vendor}) in {connect_ms:.1f}ms"))
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SELECT version()")
+            elif connection.vendor == "sqlite":
+                cursor.execute("SELECT 'SQLite ' || sqlite_version()")
+            else:
+                cursor.execute("SELECT 1")
+            self.stdout.write(f"  Server: {cursor.fetchone()[0]}")
+
+        stats = pool_stats(alias)
+        self.stdout.write(f"  Connection mode: {stats.pop('mode')}")
+        for key, value in stats.items():
+            self.stdout.write(f"    {key}: {value}")
+
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if plan:
+            self.stdout.write(self.style.WARNING(f"  Unapplied migrations: {len(plan)}"))
+            for migration, _ in plan:
+                self.stdout.write(f"    {migration.app_label}.{migration.name}")
+        else:
+            self.stdout.write("  Migrations: all applied")
+
+        if connection.vendor != "postgresql":
+            self.stdout.write("  Skipping information_schema checks (PostgreSQL only)")
+            return
+        self._inspect_user_tables(connection, options["user_id"])
+
+    def _inspect_user_tables(self, connection, user_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = 'public' AND table_name = ANY(%s)",
+                [list(USER_TABLES)],
+            )
+            tables = sorted(row[0] for row in cursor.fetchall())
+            self.stdout.write(f"  User-related tables: {tables}")
+            if "users" not in tables:
+                self.stdout.write(self.style.WARNING("  No 'users' table; Supabase authentication lookups will fail"))
+                return
+
+            cursor.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_name = 'users' AND table_schema = 'public' ORDER BY ordinal_position"
+            )
+            for column, data_type in cursor.fetchall():
+                self.stdout.write(f"    users.{column}: {data_type}")
+
+            # Planner estimate: COUNT(*) would scan the whole table
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = 'public.users'::regclass")
+            self.stdout.write(f"  Approximate users: {cursor.fetchone()[0]}")
+
+            if user_id:
+                cursor.execute("SELECT email FROM users WHERE id = %s", [user_id])
+                row = cursor.fetchone()
+                if row:
+                    self.stdout.write(self.style.SUCCESS(f"  User {user_id} found: {row[0]}"))
+                else:
+                    self.stdout.write(self.style.ERROR(f"  User {user_id} NOT found"))
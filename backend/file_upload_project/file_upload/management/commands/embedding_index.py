@@ -0,0 +1,132 @@
+"""
+Build, inspect and query the resume/job embedding index.
+
+Usage:
+    python manage.py embedding_index build                    # embed every stored resume
+    python manage.py embedding_index build --corpus corpus/   # also the corpus's job postings
+    python manage.py embedding_index build --rebuild          # start over (e.g. after changing EMBEDDING_MODEL)
+    python manage.py embedding_index stats
+    python manage.py embedding_index compact
+    python manage.py embedding_index match --resume-id 42 -k 5
+    python manage.py embedding_index rank --job-url https://example.com/jobs/1
+
+The index lives in EMBEDDING_INDEX_DIR (see file_upload/embeddings.py).
+build, match and rank load the embedding model; stats and compact do not.
+Unlike the API, this command works with EMBEDDING_INDEX_ENABLED unset.
+"""
+
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from file_upload import embeddings
+from file_upload.models import UploadedFile
+
+
+class Command(BaseCommand):
+    help = "Build, compact and query the embedding index behind resume/job similarity search"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=("build", "stats", "compact", "match", "rank"))
+        parser.add_argument("--batch-size", type=int, default=embeddings.EMBEDDING_BATCH_SIZE * 4,
+                            help="Resumes read and embedded per batch")
+        parser.add_argument("--rebuild", action="store_true", help="Delete both indexes before building")
+        parser.add_argument("--skip-resumes", action="store_true", help="Do not embed stored resumes")
+        parser.add_argument("--corpus", help="Also index the job postings of a generate_corpus directory")
+        parser.add_argument("--resume-id", type=int, action="append", dest="resume_ids",
+                            help="Resume to match (match) or to include in the ranking (rank; repeatable)")
+        parser.add_argument("--job-url", help="Job posting to rank resumes against")
+        parser.add_argument("-k", type=int, default=10, help="Results to show")
+
+    def handle(self, *args, **options):
+        try:
+            getattr(self, options["action"])(options)
+        except embeddings.EmbeddingUnavailable as e:
+            raise CommandError(str(e))
+
+    def build(self, options):
+        if options["rebuild"]:
+            for name in (embeddings.RESUME_INDEX, embeddings.JOB_INDEX):
+                index = embeddings.get_index(name)
+                for path in (index.vectors_path, index.meta_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        started = time.perf_counter()
+        resumes = 0
+        if not options["skip_resumes"]:
+            batch = []
+            files = UploadedFile.objects.filter(processed_content__isnull=False).order_by("id")
+            for file_obj in files.only("id", "processed_content").iterator(chunk_size=500):
+                batch.append((file_obj.id, file_obj.get_processed_content()))
+                if len(batch) >= options["batch_size"]:
+                    resumes += embeddings.index_resumes(batch)
+                    batch.clear()
+                    self.stdout.write(f"  {resumes} resumes embedded")
+            resumes += embeddings.index_resumes(batch)
+
+        jobs = 0
+        if options["corpus"]:
+            try:
+                with open(os.path.join(options["corpus"], "manifest.json")) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read corpus {options['corpus']}: {e}")
+            # Corpus postings have no URL; key them by their file
+            jobs = embeddings.index_jobs([
+                ("file://" + os.path.abspath(os.path.join(options["corpus"], entry["file"])), entry["expected"])
+                for entry in manifest["jobs"]
+            ])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Embedded {resumes} resumes and {jobs} job postings in {elapsed:.1f}s "
+            f"with {embeddings.model_name()} into {embeddings.EMBEDDING_INDEX_DIR}"
+        ))
+
+    def stats(self, options):
+        self.stdout.write(f"Index directory: {embeddings.EMBEDDING_INDEX_DIR}")
+        for name in (embeddings.RESUME_INDEX, embeddings.JOB_INDEX):
+            stats = embeddings.get_index(name).stats()
+            self.stdout.write(
+                f"  {name:<8} live={stats['live']} dead={stats['dead']} dim={stats['dim']} "
+                f"size={stats['bytes'] / 1024:.0f}KB model={stats['model']}"
+            )
+
+    def compact(self, options):
+        for name in (embeddings.RESUME_INDEX, embeddings.JOB_INDEX):
+            dropped = embeddings.get_index(name).compact()
+            self.stdout.write(f"  {name}: dropped {dropped} dead rows")
+
+    def match(self, options):
+        if not options["resume_ids"]:
+            raise CommandError("match needs --resume-id")
+        resume_id = options["resume_ids"][0]
+        try:
+            content = UploadedFile.objects.get(id=resume_id).get_processed_content()
+        except UploadedFile.DoesNotExist:
+            raise CommandError(f"No resume with id {resume_id}")
+        started = time.perf_counter()
+        matches = embeddings.match_jobs(resume_id, content, options["k"])
+        self.stdout.write(f"Best postings for resume {resume_id} ({(time.perf_counter() - started) * 1000:.1f}ms):")
+        for match in matches:
+            self.stdout.write(f"  {match['score']:.3f}  {match.get('title', '')} - "
+                              f"{match.get('company_name', '')}  {match['url']}")
+
+    def rank(self, options):
+        if not options["job_url"]:
+            raise CommandError("rank needs --job-url")
+        job_details = None
+        if not embeddings.has_job(options["job_url"]):
+            from file_upload.utils import extractJobDescription
+
+            job_details = extractJobDescription(options["job_url"])
+            if "status_code" in job_details:
+                raise CommandError(f"Job extraction failed: {job_details.get('description')}")
+        started = time.perf_counter()
+        rankings = embeddings.rank_resumes(options["job_url"], job_details, options["resume_ids"], options["k"])
+        self.stdout.write(f"Resumes ranked for {options['job_url']} ({(time.perf_counter() - started) * 1000:.1f}ms):")
+        for ranking in rankings:
+            self.stdout.write(f"  {ranking['score']:.3f}  resume {ranking['resume_id']}")
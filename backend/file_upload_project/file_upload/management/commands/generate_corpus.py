@@ -0,0 +1,86 @@
+"""
+Write a deterministic synthetic corpus of resumes and job postings.
+
+Usage:
+    python manage.py generate_corpus --out corpus/
+    python manage.py generate_corpus --out corpus/ --resumes 200 --jobs 50 --seed 7 --max-pages 10
+    python manage.py generate_corpus --out corpus/ --formats pdf --layouts sidebar --pii-densities 0.3
+
+Writes resumes/*.pdf|docx, jobs/*.html and manifest.json, which lists each
+file's layout, page count (exact for PDFs; a DOCX holds the same amount of
+text, paginated by the reader) and tables, the PII values placed in each resume
+and the fields each job posting should yield. The same seed and options
+always produce the same files. Feed the corpus to
+`load_test --corpus` or `llm_stub --jobs-dir corpus/jobs`.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from file_upload.resume_preflight import MAX_PAGES
+from file_upload.synthetic_corpus import LAYOUTS, CorpusSpec, write_corpus
+
+
+def _csv(value: str):
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+class Command(BaseCommand):
+    help = "Generate seeded synthetic resumes (PDF/DOCX) and job posting HTML for benchmarks and load tests"
+
+    def add_arguments(self, parser):
+        defaults = CorpusSpec()
+        parser.add_argument("--out", required=True, help="Output directory")
+        parser.add_argument("--seed", type=int, default=defaults.seed)
+        parser.add_argument("--resumes", type=int, default=defaults.resumes)
+        parser.add_argument("--jobs", type=int, default=defaults.jobs)
+        parser.add_argument("--formats", default=",".join(defaults.formats), help="pdf, docx or both")
+        parser.add_argument("--layouts", default=",".join(defaults.layouts), help=f"Any of {', '.join(LAYOUTS)}")
+        parser.add_argument("--min-pages", type=int, default=defaults.min_pages)
+        parser.add_argument("--max-pages", type=int, default=min(defaults.max_pages, MAX_PAGES))
+        parser.add_argument("--pii-densities", default=",".join(str(d) for d in defaults.pii_densities),
+                            help="Share of body lines carrying PII, one picked per resume")
+        parser.add_argument("--max-tables", type=int, default=defaults.max_tables)
+        parser.add_argument("--json-ld-share", type=float, default=defaults.json_ld_share,
+                            help="Share of job pages with schema.org JSON-LD")
+        parser.add_argument("--job-page-bytes", default=",".join(str(b) for b in defaults.job_page_bytes),
+                            help="Job page sizes, one picked per page (0 = no boilerplate)")
+
+    def handle(self, *args, **options):
+        formats, layouts = _csv(options["formats"]), _csv(options["layouts"])
+        if not formats or set(formats) - {"pdf", "docx"}:
+            raise CommandError("--formats must be pdf, docx or both")
+        if not layouts or set(layouts) - set(LAYOUTS):
+            raise CommandError(f"--layouts must be from {', '.join(LAYOUTS)}")
+        if not 1 <= options["min_pages"] <= options["max_pages"] <= MAX_PAGES:
+            # Longer resumes would only exercise the preflight rejection
+            raise CommandError(f"Need 1 <= --min-pages <= --max-pages <= {MAX_PAGES} (RESUME_MAX_PAGES)")
+        try:
+            densities = [float(d) for d in _csv(options["pii_densities"])]
+            page_bytes = [int(b) for b in _csv(options["job_page_bytes"])]
+        except ValueError as e:
+            raise CommandError(str(e))
+        if not densities or not page_bytes:
+            raise CommandError("--pii-densities and --job-page-bytes need at least one value")
+
+        spec = CorpusSpec(
+            seed=options["seed"],
+            resumes=options["resumes"],
+            jobs=options["jobs"],
+            formats=formats,
+            layouts=layouts,
+            min_pages=options["min_pages"],
+            max_pages=options["max_pages"],
+            pii_densities=densities,
+            max_tables=options["max_tables"],
+            json_ld_share=options["json_ld_share"],
+            job_page_bytes=page_bytes,
+        )
+        manifest = write_corpus(options["out"], spec)
+        pii = sum(len(r["pii"]) for r in manifest["resumes"])
+        with_ld = sum(1 for j in manifest["jobs"] if j["json_ld"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(manifest['resumes'])} resumes ({pii} PII values) and {len(manifest['jobs'])} job pages "
+            f"({with_ld} with JSON-LD) to {os.path.abspath(options['out'])}"
+        ))
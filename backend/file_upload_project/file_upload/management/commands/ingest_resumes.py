@@ -0,0 +1,55 @@
+"""
+Normalize stored resume results into Profile/Experience/Education/Skills.
+
+Usage:
+    python manage.py ingest_resumes
+    python manage.py ingest_resumes --user 3f2a... --batch-size 200
+
+Reads UploadedFile.processed_content for files with an owner and writes the
+newest resume per user in batches; unchanged rows are not rewritten.
+"""
+
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from file_upload.models import UploadedFile
+from file_upload.resume_ingestion import ingest_resumes
+
+
+class Command(BaseCommand):
+    help = "Bulk-ingest processed resumes into the profile tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", action="append", dest="users", help="Only ingest this user ID (repeatable)")
+        parser.add_argument("--batch-size", type=int, default=200, help="Users written per transaction")
+
+    def flush(self, batch, totals):
+        result = ingest_resumes(batch)
+        for counter in ("created", "updated", "deleted"):
+            totals[counter].update(getattr(result, counter))
+        batch.clear()
+
+    def handle(self, *args, **options):
+        files = UploadedFile.objects.filter(user_id__isnull=False).order_by("user_id", "-uploaded_at", "-id")
+        if options["users"]:
+            files = files.filter(user_id__in=options["users"])
+
+        totals = {"created": Counter(), "updated": Counter(), "deleted": Counter()}
+        batch, last_user, users = [], None, 0
+        for file_obj in files.only("id", "user_id", "uploaded_at", "processed_content").iterator(chunk_size=500):
+            if file_obj.user_id == last_user:
+                continue  # only the newest resume per user
+            last_user = file_obj.user_id
+            users += 1
+            batch.append((file_obj.user_id, file_obj.get_processed_content()))
+            if len(batch) >= options["batch_size"]:
+                self.flush(batch, totals)
+        if batch:
+            self.flush(batch, totals)
+
+        for counter, counts in totals.items():
+            if counts:
+                summary = ", ".join(f"{model} {count}" for model, count in sorted(counts.items()))
+                self.stdout.write(f"{counter}: {summary}")
+        self.stdout.write(self.style.SUCCESS(f"Ingested resumes for {users} users"))
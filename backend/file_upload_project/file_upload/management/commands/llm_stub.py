@@ -0,0 +1,78 @@
+"""
+Run a local DeepSeek-compatible stub server.
+
+Usage:
+    python manage.py llm_stub
+    python manage.py llm_stub --port 8089 --latency uniform:200,800 --error-rate 0.02 --rate-limit-rate 0.05
+    python manage.py llm_stub --latency fixed:0 --max-concurrent 16
+    python manage.py llm_stub --jobs-dir corpus/jobs   # serve generate_corpus job pages
+
+Then start the app with DEEPSEEK_API_BASE=http://127.0.0.1:8089 (and any
+DEEPSEEK_API_KEY). Job postings can be served offline from
+http://127.0.0.1:8089/jobs/<id>, and GET /stats reports request counts by
+prompt kind and outcome. See file_upload/llm_stub.py for the latency specs.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from file_upload.llm_stub import StubConfig, StubHTTPServer, parse_latency
+
+
+class Command(BaseCommand):
+    help = "Serve canned DeepSeek chat completions locally for load and latency testing"
+
+    def add_arguments(self, parser):
+        defaults = StubConfig()
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8089)
+        parser.add_argument("--latency", default=defaults.latency,
+                            help="fixed:MS, uniform:MIN,MAX, normal:MEAN,SD or lognormal:MEDIAN,SIGMA")
+        parser.add_argument("--first-token-share", type=float, default=defaults.first_token_share,
+                            help="Share of the latency before the first streamed chunk")
+        parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                            help="Fraction of completions that return HTTP 500")
+        parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate,
+                            help="Fraction of completions that return HTTP 429")
+        parser.add_argument("--max-concurrent", type=int, default=defaults.max_concurrent,
+                            help="Return 429 beyond this many completions in flight (0 = unlimited)")
+        parser.add_argument("--retry-after", type=int, default=defaults.retry_after,
+                            help="Retry-After seconds sent with 429 responses")
+        parser.add_argument("--seed", type=int, help="Random seed for reproducible latencies and failures")
+        parser.add_argument("--jobs-dir", help="Serve /jobs/<id> from <id>.html in this directory")
+        parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    def handle(self, *args, **options):
+        try:
+            parse_latency(options["latency"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options["error_rate"] + options["rate_limit_rate"] > 1:
+            raise CommandError("--error-rate and --rate-limit-rate must add up to at most 1")
+
+        config = StubConfig(
+            latency=options["latency"],
+            first_token_share=options["first_token_share"],
+            error_rate=options["error_rate"],
+            rate_limit_rate=options["rate_limit_rate"],
+            max_concurrent=options["max_concurrent"],
+            retry_after=options["retry_after"],
+            seed=options["seed"],
+            jobs_dir=options["jobs_dir"],
+        )
+        try:
+            httpd = StubHTTPServer((options["host"], options["port"]), config, verbose=options["verbose"])
+        except OSError as e:
+            raise CommandError(f"Could not bind {options['host']}:{options['port']}: {e}")
+
+        base_url = f"http://{options['host']}:{options['port']}"
+        self.stdout.write(self.style.SUCCESS(f"LLM stub listening on {base_url}"))
+        self.stdout.write(f"  latency={config.latency} errors={config.error_rate} 429s={config.rate_limit_rate}"
+                          f" max_concurrent={config.max_concurrent or 'unlimited'}")
+        self.stdout.write(f"  export DEEPSEEK_API_BASE={base_url}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+            self.stdout.write(f"Served: {httpd.stats.to_json()['requests']}")
@@ -0,0 +1,382 @@
+"""
+End-to-end load test of the production API on one machine.
+
+Usage:
+    python manage.py load_test --settings=file_upload_project.settings_loadtest
+    python manage.py load_test --settings=file_upload_project.settings_loadtest \\
+        --rps 20 --duration 120 --mix upload=2,analysis=1,profile=7 --output run.json
+    python manage.py load_test --settings=file_upload_project.settings_loadtest \\
+        --baseline main.json --max-regression-pct 15   # exits 1 on a regression
+    python manage.py load_test --settings=file_upload_project.settings_loadtest \\
+        --corpus corpus/   # resumes and job pages from generate_corpus
+
+Starts the LLM stub (which also serves the job postings), migrates the
+load-test database (SQLite, or a local PostgreSQL via DATABASE_URL), seeds
+Supabase-style users with profiles and mints a JWT for each, boots the app
+(gunicorn with gunicorn.conf.py when installed, else runserver) and replays
+the scenario mix at the target rate. The JSON report has p50/p95/p99
+latency, error and throttle rates per scenario, and worker saturation from
+the server's own /api/metrics/. Pass --target to load an already running
+server instead; it must share this settings module's SECRET_KEY/JWT key and
+METRICS_TOKEN, and its database must first be seeded with --seed-only
+(DATABASE_URL pointing at it), after which the run is started with --seeded.
+"""
+
+import json
+import math
+import os
+import runpy
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import requests
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from file_upload import loadgen, metrics
+from file_upload.llm_stub import StubConfig, StubServer, parse_latency
+from file_upload.models import Profile
+from file_upload.request_middleware import QUIET_ROUTES
+
+
+BOOT_TIMEOUT = 90
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class MetricsPoller(threading.Thread):
+    """Samples the server's thread-pool queue depth while the load runs"""
+
+    def __init__(self, metrics_url: str, token: str, interval: float = 1.0):
+        super().__init__(name="metrics-poller", daemon=True)
+        self.metrics_url = metrics_url
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.max_queue_depth = 0.0
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                gauges = requests.get(self.metrics_url, headers=self.headers, timeout=5).json()["gauges"]
+            except (requests.RequestException, ValueError, KeyError):
+                continue
+            depth = sum(v for name, _, v in gauges if name == "executor_queue_depth")
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+
+class Command(BaseCommand):
+    help = "Load test the production API against local services and report latency percentiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rps", type=float, default=5.0, help="Target request rate")
+        parser.add_argument("--duration", type=float, default=60.0, help="Seconds of load")
+        parser.add_argument("--mix", default=loadgen.DEFAULT_MIX, help="Scenario weights, e.g. upload=2,analysis=1")
+        parser.add_argument("--arrival", choices=("poisson", "constant"), default="poisson")
+        parser.add_argument("--concurrency", type=int, default=64, help="Client threads (max requests in flight)")
+        parser.add_argument("--users", type=int, default=20,
+                            help="Users to spread load over; raised automatically to stay under the throttle budget")
+        parser.add_argument("--job-pages", type=int, default=10,
+                            help="Distinct job posting URLs (fewer means more job cache hits)")
+        parser.add_argument("--resume", action="append", default=[], help="Resume file to upload (repeatable)")
+        parser.add_argument("--corpus", help="generate_corpus output to take resumes and job pages from")
+        parser.add_argument("--server", choices=("auto", "gunicorn", "runserver"), default="auto")
+        parser.add_argument("--target", help="Base URL of an already running server; skips booting one")
+        parser.add_argument("--seed-only", action="store_true",
+                            help="Migrate and seed the users and profiles into DATABASE_URL, then exit")
+        parser.add_argument("--seeded", action="store_true",
+                            help="With --target: the target's database already has the users (see --seed-only)")
+        parser.add_argument("--slots", type=int, help="Server request slots (workers x threads) for utilization")
+        parser.add_argument("--llm-latency", default="lognormal:1200,0.5", help="LLM stub latency spec")
+        parser.add_argument("--llm-error-rate", type=float, default=0.0)
+        parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report here")
+        parser.add_argument("--baseline", help="Earlier report to compare against")
+        parser.add_argument("--max-regression-pct", type=float,
+                            default=float(os.getenv("LOADTEST_MAX_REGRESSION_PCT", "20")),
+                            help="Fail when a scenario's p50/p95/p99 grows by more than this")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            raise CommandError(
+                "Run with production views: --settings=file_upload_project.settings_loadtest"
+            )
+        try:
+            mix = loadgen.parse_mix(options["mix"])
+            parse_latency(options["llm_latency"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options["seed_only"]:
+            users = self._user_count(mix, options)
+            call_command("migrate", interactive=False, verbosity=0)
+            self._seed_users(users)
+            self.stdout.write(self.style.SUCCESS(
+                f"Seeded {users} users with profiles into the {connection.vendor} database "
+                f"{connection.settings_dict['NAME']}"
+            ))
+            return
+        if options["target"] and not options["seeded"]:
+            # Seeding here would write to this machine's database, not the target's
+            raise CommandError(
+                "--target needs the load-test users in the target's database: run --seed-only with the "
+                "target's DATABASE_URL and the same --users/--rps/--duration/--mix, then pass --seeded"
+            )
+
+        run_dir = tempfile.mkdtemp(prefix="preppad_loadtest_")
+        resumes = [self._read_resume(path) for path in options["resume"]]
+        job_ids = [str(i) for i in range(max(1, options["job_pages"]))]
+        if options["corpus"]:
+            try:
+                resumes = resumes or loadgen.corpus_resumes(options["corpus"])
+                job_ids = loadgen.corpus_job_ids(options["corpus"]) or job_ids
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Could not read corpus {options['corpus']}: {e}")
+        resumes = resumes or loadgen.sample_resumes(options["seed"])
+        stub = StubServer(StubConfig(
+            latency=options["llm_latency"],
+            error_rate=options["llm_error_rate"],
+            rate_limit_rate=options["llm_rate_limit_rate"],
+            seed=options["seed"],
+            jobs_dir=os.path.join(options["corpus"], "jobs") if options["corpus"] else None,
+        )).start()
+        server, server_kind, slots = None, "external", options["slots"]
+        try:
+            users = self._user_count(mix, options)
+            if options["target"]:
+                base_url = options["target"].rstrip("/")
+                user_ids = self._user_ids(users)
+            else:
+                call_command("migrate", interactive=False, verbosity=0)
+                base_url = None
+                user_ids = self._seed_users(users)
+            tokens = [self._mint_token(user_id, options["duration"]) for user_id in user_ids]
+
+            if not options["target"]:
+                port = free_port()
+                base_url = f"http://127.0.0.1:{port}"
+                server, server_kind, booted_slots = self._boot_server(options["server"], port, stub, run_dir)
+                slots = slots or booted_slots
+            self.stdout.write(f"Server: {server_kind} at {base_url} (slots: {slots or 'unknown'}); "
+                              f"LLM stub at {stub.base_url}; {users} users; run dir {run_dir}")
+
+            poller = MetricsPoller(f"{base_url}/api/metrics/?format=json", metrics.METRICS_TOKEN)
+            poller.start()
+            plan = loadgen.LoadPlan(
+                base_url=base_url,
+                tokens=tokens,
+                job_urls=[f"{stub.base_url}/jobs/{job_id}" for job_id in job_ids],
+                resumes=resumes,
+                mix=mix,
+                rps=options["rps"],
+                duration=options["duration"],
+                concurrency=options["concurrency"],
+                arrival=options["arrival"],
+                seed=options["seed"],
+            )
+            generator = loadgen.LoadGenerator(
+                plan, on_progress=lambda done, total: self.stdout.write(f"  {done}/{total} requests sent")
+            )
+            started_at = datetime.now(timezone.utc)
+            results = generator.run()
+            poller.stopped.set()
+
+            report = {
+                "started_at": started_at.isoformat(),
+                "config": {
+                    key: options[key] for key in (
+                        "rps", "duration", "mix", "arrival", "concurrency", "job_pages", "corpus",
+                        "llm_latency", "llm_error_rate", "llm_rate_limit_rate", "seed",
+                    )
+                },
+                "server": {"kind": server_kind, "slots": slots, "settings": settings.SETTINGS_MODULE,
+                           "database": connection.vendor, "users": users},
+                "wall_s": round(generator.wall_s, 2),
+                "results": loadgen.summarize_results(results, generator.wall_s),
+                "client": {"peak_in_flight": generator.peak_in_flight,
+                           "saturated_requests": generator.client_saturated},
+                "saturation": self._saturation(base_url, generator.wall_s, slots, results, poller),
+                "llm_stub": stub.stats,
+            }
+        finally:
+            if server is not None:
+                self._stop_server(server)
+            stub.stop()
+
+        self._write_report(report, options, run_dir)
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+            regressions = loadgen.compare(report, baseline, options["max_regression_pct"])
+            if regressions:
+                raise CommandError("Load test regressed against baseline:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS(f"Within {options['max_regression_pct']:.0f}% of baseline"))
+
+    def _read_resume(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        content_type = {".pdf": "application/pdf", ".docx": loadgen.DOCX_MIME}.get(extension)
+        if not content_type:
+            raise CommandError(f"Resumes must be .pdf or .docx: {path}")
+        with open(path, "rb") as f:
+            return os.path.basename(path), f.read(), content_type
+
+    def _user_count(self, mix, options) -> int:
+        """Enough users that the expected load stays within each user's daily throttle budget"""
+        rate = settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {}).get("user_weighted")
+        if not rate:
+            return options["users"]
+        budget = int(rate.split("/")[0])
+        mean_cost = sum(w * loadgen.SCENARIO_THROTTLES[s].cost for s, w in mix.items()) / sum(mix.values())
+        expected_cost = options["rps"] * options["duration"] * mean_cost
+        return max(options["users"], math.ceil(expected_cost / (budget * 0.8)))
+
+    def _user_ids(self, count):
+        """Stable ids, so a run against --target finds the users --seed-only created"""
+        return [str(uuid.uuid5(uuid.NAMESPACE_URL, f"preppad-loadtest-{i}")) for i in range(count)]
+
+    def _seed_users(self, count):
+        """Supabase-style users rows (id, email, name), each with a profile"""
+        user_ids = self._user_ids(count)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS users (id VARCHAR(64) PRIMARY KEY, email VARCHAR(255), name VARCHAR(255))"
+            )
+            for i, user_id in enumerate(user_ids):
+                cursor.execute(
+                    "INSERT INTO users (id, email, name) VALUES (%s, %s, %s) ON CONFLICT (id) DO NOTHING",
+                    [user_id, f"loadtest{i}@example.com", f"Load Test {i}"],
+                )
+        for i, user_id in enumerate(user_ids):
+            Profile.objects.get_or_create(
+                user_id=user_id,
+                defaults={"firstName": "Load", "lastName": f"Test {i}", "email": f"loadtest{i}@example.com"},
+            )
+        return user_ids
+
+    def _mint_token(self, user_id, duration):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        token = AccessToken()
+        token["user_id"] = user_id
+        # Outlive the run, however long the server takes to drain
+        token.set_exp(lifetime=timedelta(seconds=duration + 3600))
+        return str(token)
+
+    def _boot_server(self, kind, port, stub, run_dir):
+        if kind == "auto":
+            kind = "gunicorn" if self._has_gunicorn() else "runserver"
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE,
+            DEEPSEEK_API_BASE=stub.base_url,
+            METRICS_DIR=os.path.join(run_dir, "metrics"),
+            THROTTLE_SQLITE_PATH=os.path.join(run_dir, "throttle.sqlite3"),
+            GUNICORN_BIND=f"127.0.0.1:{port}",
+            REQUEST_LOG_SAMPLE_RATE="0",
+            LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"),
+        )
+        slots = None
+        if kind == "gunicorn":
+            command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+            with mock.patch.dict(os.environ, env):
+                config = runpy.run_path(os.path.join(settings.BASE_DIR, "gunicorn.conf.py"))
+            slots = config["workers"] * config["threads"]
+        else:
+            command = [sys.executable, "manage.py", "runserver", "--noreload", f"127.0.0.1:{port}"]
+
+        log_path = os.path.join(run_dir, "server.log")
+        log = open(log_path, "w")
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + BOOT_TIMEOUT
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"{kind} exited with {server.returncode}; see {log_path}")
+            try:
+                if requests.get(f"http://127.0.0.1:{port}/api/live/", timeout=2).status_code == 200:
+                    return server, kind, slots
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        self._stop_server(server)
+        raise CommandError(f"{kind} did not answer /api/live/ within {BOOT_TIMEOUT}s; see {log_path}")
+
+    def _has_gunicorn(self):
+        import importlib.util
+
+        return importlib.util.find_spec("gunicorn") is not None
+
+    def _stop_server(self, server):
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=35)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+    def _saturation(self, base_url, wall_s, slots, results, poller):
+        """Server busy time over capacity, from the app's request duration histograms"""
+        try:
+            histograms = requests.get(
+                f"{base_url}/api/metrics/?format=json", headers=poller.headers, timeout=10
+            ).json()["histograms"]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            return {"error": f"metrics unavailable: {e}"}
+        count, busy_ms = 0, 0.0
+        for name, labels, hist in histograms:
+            if name == "http_request_duration_ms" and labels.get("view") not in QUIET_ROUTES:
+                count += hist["count"]
+                busy_ms += hist["sum_ms"]
+        client_ms = [r.service_ms for r in results if r.status]
+        server_mean = busy_ms / count if count else None
+        client_mean = sum(client_ms) / len(client_ms) if client_ms else None
+        return {
+            "server_requests": count,
+            "server_busy_s": round(busy_ms / 1000, 2),
+            # Share of request slots busy on average; near 1.0 means requests queue for a worker
+            "utilization": round(busy_ms / (wall_s * 1000 * slots), 3) if slots and wall_s else None,
+            "server_mean_ms": round(server_mean, 1) if server_mean is not None else None,
+            # Time outside the view: accept queue, middleware before timing, network
+            "queue_mean_ms": round(client_mean - server_mean, 1) if server_mean is not None and client_mean else None,
+            "max_executor_queue_depth": poller.max_queue_depth,
+        }
+
+    def _write_report(self, report, options, run_dir):
+        output = options["output"] or os.path.join(run_dir, "report.json")
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        overall = report["results"]["overall"]
+        self.stdout.write(f"\n{overall['requests']} requests in {report['wall_s']}s "
+                          f"({overall['throughput_rps']} ok/s), error rate {overall['error_rate']:.2%}, "
+                          f"throttled {overall['throttled']}")
+        self.stdout.write(f"{'scenario':<10} {'reqs':>6} {'err%':>7} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for name, row in sorted(report["results"]["scenarios"].items()) + [("overall", overall)]:
+            latency = row["latency_ms"]
+            self.stdout.write(f"{name:<10} {row['requests']:>6} {row['error_rate']:>7.2%} "
+                              f"{latency['p50']:>7}ms {latency['p95']:>7}ms {latency['p99']:>7}ms")
+        saturation = report["saturation"]
+        self.stdout.write(f"Saturation: utilization={saturation.get('utilization')} "
+                          f"queue_mean_ms={saturation.get('queue_mean_ms')} "
+                          f"max_executor_queue_depth={saturation.get('max_executor_queue_depth')}")
+        for error in report["results"]["sample_errors"]:
+            self.stdout.write(self.style.WARNING(f"  {error}"))
+        self.stdout.write(f"Report: {output}")
@@ -0,0 +1,97 @@
+"""
+Run the extraction, anonymization, HTML and prompt micro-benchmarks.
+
+Usage:
+    python manage.py run_benchmarks
+    python manage.py run_benchmarks --filter extract.pdf --rounds 20
+    python manage.py run_benchmarks --save-baseline          # record this machine's baseline
+    python manage.py run_benchmarks --max-regression-pct 15  # exits 1 on a regression
+
+Results are compared with the baseline at --baseline (default
+BENCHMARK_BASELINE, else benchmark_baseline.json next to manage.py). A
+benchmark regresses when its median time or peak memory grows by more than
+the allowed percentage. Baselines are machine-specific: record them on the
+machine (or CI runner class) that will be compared against them.
+"""
+
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from file_upload import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Run micro-benchmarks, store baselines and fail on time or memory regressions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+        parser.add_argument("--rounds", type=int, default=10, help="Timed rounds per benchmark")
+        parser.add_argument("--max-time", type=float, default=2.0,
+                            help="Seconds per benchmark after which rounds stop (minimum 3 rounds)")
+        parser.add_argument("--seed", type=int, default=0, help="Synthetic corpus seed")
+        parser.add_argument("--baseline", default=os.getenv(
+            "BENCHMARK_BASELINE", os.path.join(settings.BASE_DIR, "benchmark_baseline.json")
+        ))
+        parser.add_argument("--save-baseline", action="store_true", help="Write results to the baseline file")
+        parser.add_argument("--max-regression-pct", type=float,
+                            default=float(os.getenv("BENCHMARK_MAX_REGRESSION_PCT", "25")),
+                            help="Allowed growth of median time")
+        parser.add_argument("--max-memory-regression-pct", type=float,
+                            default=float(os.getenv("BENCHMARK_MAX_MEMORY_REGRESSION_PCT", "25")),
+                            help="Allowed growth of peak memory")
+        parser.add_argument("--output", help="Also write the results as JSON here")
+
+    def handle(self, *args, **options):
+        suite = benchmarks.build_suite(options["seed"], options["filter"])
+        if not suite:
+            raise CommandError(f"No benchmark matches '{options['filter']}'")
+
+        baseline = benchmarks.load_report(options["baseline"])
+        baseline_rows = (baseline or {}).get("benchmarks", {})
+        self.stdout.write(f"{'benchmark':<44} {'median':>10} {'min':>10} {'peak':>9} {'vs base':>8}")
+        measurements = []
+        for benchmark in suite:
+            m = benchmarks.measure(benchmark, options["rounds"], options["max_time"])
+            measurements.append(m)
+            previous = baseline_rows.get(m.name)
+            change = f"{(m.median_ms / previous['median_ms'] - 1) * 100:+.0f}%" if previous else "-"
+            self.stdout.write(
+                f"{m.name:<44} {m.median_ms:>8.2f}ms {m.min_ms:>8.2f}ms {m.peak_kb:>7.0f}KB {change:>8}"
+            )
+
+        report = benchmarks.to_report(measurements, options["seed"])
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+
+        if options["save_baseline"]:
+            # Keep entries for benchmarks that were filtered out of this run
+            merged = dict(baseline_rows, **report["benchmarks"])
+            with open(options["baseline"], "w") as f:
+                json.dump(dict(report, benchmarks=merged), f, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+            return
+
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(
+                f"No baseline at {options['baseline']}; run with --save-baseline to record one"
+            ))
+            return
+        if baseline.get("machine") != report["machine"]:
+            self.stdout.write(self.style.WARNING("Baseline was recorded on a different machine or Python"))
+        unmatched = [m.name for m in measurements if m.name not in baseline_rows]
+        if unmatched:
+            # New or renamed benchmarks are not compared; say so rather than pass them silently
+            self.stdout.write(self.style.WARNING(
+                f"{len(unmatched)} benchmarks have no baseline entry and were not compared "
+                f"(re-run with --save-baseline): {', '.join(unmatched)}"
+            ))
+        regressions = benchmarks.compare(
+            report, baseline, options["max_regression_pct"], options["max_memory_regression_pct"]
+        )
+        if regressions:
+            raise CommandError("Benchmark regressions:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
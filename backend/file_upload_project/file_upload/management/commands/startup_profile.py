@@ -0,0 +1,119 @@
+"""
+Measure worker cold start: import time, boot wall time and resident memory.
+
+Usage:
+    python manage.py startup_profile
+    python manage.py startup_profile --settings=file_upload_project.settings_production --top 30
+    python manage.py startup_profile --budget-ms 1500 --budget-rss-mb 150   # exits 1 when over budget
+
+Each run boots a fresh interpreter under `python -X importtime`, loads the
+WSGI application and resolves the URLconf (what a gunicorn worker does
+before its first request), then reports the slowest imports. Budgets default
+to STARTUP_BUDGET_MS and STARTUP_BUDGET_RSS_MB so CI can enforce them.
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+BOOT_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+from file_upload_project.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+boot_ms = (time.perf_counter() - started) * 1000
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"boot_ms": boot_ms, "rss_mb": rss_kb / 1024, "modules": len(sys.modules)}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str):
+    """(module, self_us, cumulative_us, depth) for each -X importtime line"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Profile worker cold-start time, imports and RSS, optionally enforcing a budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to boot; the median is reported")
+        parser.add_argument("--top", type=int, default=20, help="Slowest imports to list")
+        parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "0")),
+                            help="Fail when the median boot time exceeds this (0 disables)")
+        parser.add_argument("--budget-rss-mb", type=float, default=float(os.getenv("STARTUP_BUDGET_RSS_MB", "0")),
+                            help="Fail when the median peak RSS after boot exceeds this (0 disables)")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def boot_once(self):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Worker boot failed:\n{result.stderr[-2000:]}")
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        return stats, parse_importtime(result.stderr)
+
+    def handle(self, *args, **options):
+        runs = [self.boot_once() for _ in range(max(1, options["runs"]))]
+        boot_ms = statistics.median(stats["boot_ms"] for stats, _ in runs)
+        rss_mb = statistics.median(stats["rss_mb"] for stats, _ in runs)
+
+        # Import timings from the median-time run
+        _, rows = sorted(runs, key=lambda run: run[0]["boot_ms"])[len(runs) // 2]
+        top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+        by_self = sorted(rows, key=lambda r: r[1], reverse=True)
+
+        report = {
+            "settings": settings.SETTINGS_MODULE,
+            "runs": len(runs),
+            "boot_ms": round(boot_ms, 1),
+            "rss_mb": round(rss_mb, 1),
+            "modules": runs[0][0]["modules"],
+            "top_cumulative_ms": {m: round(c / 1000, 1) for m, _, c, _ in top_level[:options["top"]]},
+            "top_self_ms": {m: round(s / 1000, 1) for m, s, _, _ in by_self[:options["top"]]},
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(f"Settings: {report['settings']} ({report['runs']} runs, median)")
+            self.stdout.write(f"Boot time: {report['boot_ms']}ms")
+            self.stdout.write(f"Peak RSS: {report['rss_mb']}MB")
+            self.stdout.write(f"Modules loaded: {report['modules']}")
+            self.stdout.write("\nSlowest top-level imports (cumulative):")
+            for module, ms in report["top_cumulative_ms"].items():
+                self.stdout.write(f"  {ms:8.1f}ms  {module}")
+            self.stdout.write("\nSlowest modules (self time):")
+            for module, ms in report["top_self_ms"].items():
+                self.stdout.write(f"  {ms:8.1f}ms  {module}")
+
+        failures = []
+        if options["budget_ms"] and boot_ms > options["budget_ms"]:
+            failures.append(f"boot time {boot_ms:.1f}ms > {options['budget_ms']:.0f}ms")
+        if options["budget_rss_mb"] and rss_mb > options["budget_rss_mb"]:
+            failures.append(f"RSS {rss_mb:.1f}MB > {options['budget_rss_mb']:.0f}MB")
+        if failures:
+            raise CommandError("Startup budget exceeded: " + "; ".join(failures))
+        if options["budget_ms"] or options["budget_rss_mb"]:
+            self.stdout.write(self.style.SUCCESS("Startup within budget"))
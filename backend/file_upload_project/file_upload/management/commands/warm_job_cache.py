@@ -0,0 +1,61 @@
+"""
+Warm the job posting cache ahead of peak hours.
+
+Usage:
+    python manage.py warm_job_cache https://example.com/jobs/1 https://example.com/jobs/2
+    python manage.py warm_job_cache --file saved_search_urls.txt --concurrency 16
+
+Only useful with a shared cache backend (REDIS_URL); a per-process
+LocMemCache is discarded when this command exits.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from file_upload.job_scraper import JobScraper
+
+
+class Command(BaseCommand):
+    help = "Scrape and analyze job posting URLs concurrently to warm the job posting cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="*", help="Job posting URLs")
+        parser.add_argument("--file", help="File with one job posting URL per line")
+        parser.add_argument("--concurrency", type=int, default=8, help="Global concurrency cap")
+        parser.add_argument("--per-host", type=int, default=2, help="Max concurrent fetches per host")
+        parser.add_argument("--min-interval", type=float, default=1.0,
+                            help="Minimum seconds between fetches to the same host")
+        parser.add_argument("--refresh", action="store_true",
+                            help="Re-scrape URLs that are already cached and overwrite their entries")
+
+    def handle(self, *args, **options):
+        urls = list(options["urls"])
+        if options["file"]:
+            try:
+                with open(options["file"]) as f:
+                    for line in f:
+                        line = line.strip()
+                        if line and not line.startswith("#"):
+                            urls.append(line)
+            except OSError as e:
+                raise CommandError(f"Could not read {options['file']}: {e}")
+        if not urls:
+            raise CommandError("No URLs given")
+
+        scraper = JobScraper(
+            max_workers=options["concurrency"],
+            per_host=options["per_host"],
+            min_interval=options["min_interval"],
+            refresh=options["refresh"],
+        )
+
+        succeeded = failed = 0
+        for result in scraper.scrape(urls):
+            if result.ok:
+                succeeded += 1
+                self.stdout.write(f"✅ {result.url} ({result.elapsed:.1f}s)")
+            else:
+                failed += 1
+                description = result.job_details.get("description", "unknown error")
+                self.stdout.write(self.style.WARNING(f"⚠️  {result.url}: {description}"))
+
+        self.stdout.write(self.style.SUCCESS(f"Warmed {succeeded} job postings, {failed} failed"))
@@ -0,0 +1,371 @@
+"""
+Metrics Module
+Process-local counters, gauges and latency histograms, exported in the
+Prometheus text format by the /api/metrics/ endpoint.
+
+Every process periodically writes its registry to its own JSON file in
+METRICS_DIR (replaced atomically), and the endpoint merges all files on the
+host, so each gunicorn worker's numbers show up no matter which worker serves
+the scrape. Files left by processes that have exited are folded into an
+archive file: their counters and histograms survive worker restarts, their
+gauges are dropped.
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .timing import BUCKETS_MS, Histogram, histogram_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: archive writes are not serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+# Shared by every worker on the host; empty string keeps metrics per-process
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "preppad_metrics"))
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+# /api/metrics/ requires "Authorization: Bearer <token>"; without a token it is
+# only served when DEBUG is on
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+NAMESPACE = "preppad"
+ARCHIVE_FILE = "archive.json"
+
+# name -> (type, help)
+METRICS = {
+    "http_requests_total": ("counter", "HTTP requests by view, method and status code"),
+    "http_request_duration_ms": ("histogram", "HTTP request latency in milliseconds by view"),
+    "llm_requests_total": ("counter", "DeepSeek API calls by purpose and outcome"),
+    "llm_request_duration_ms": ("histogram", "DeepSeek API call latency in milliseconds by purpose"),
+    "llm_tokens_total": ("counter", "DeepSeek tokens reported in the usage field, by purpose and direction"),
+    "cache_requests_total": ("counter", "Cache lookups by cache and result"),
+    "cache_hit_ratio": ("gauge", "Cache hits over hits plus misses"),
+    "throttle_rejections_total": ("counter", "Requests rejected by a throttle, by scope"),
+    "executor_queue_depth": ("gauge", "Tasks submitted to a thread pool and not yet finished"),
+    "stage_duration_ms": ("histogram", "Pipeline stage latency in milliseconds from timing spans"),
+}
+
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Registry:
+    """Metrics recorded by the current process since it started"""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.token = uuid.uuid4().hex
+        self.counters: Dict[Key, float] = {}
+        self.gauges: Dict[Key, float] = {}
+        self.histograms: Dict[Key, Histogram] = {}
+        self.lock = threading.Lock()
+        self.last_flush = 0.0
+        self.adopted = False
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            counters = [[n, dict(l), v] for (n, l), v in self.counters.items()]
+            gauges = [[n, dict(l), v] for (n, l), v in self.gauges.items()]
+            histograms = [[n, dict(l), h.snapshot()] for (n, l), h in self.histograms.items()]
+        for stage, hist in histogram_snapshot().items():
+            histograms.append(["stage_duration_ms", {"stage": stage}, hist])
+        return {
+            "pid": self.pid,
+            "token": self.token,
+            "written_at": time.time(),
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+        }
+
+
+_registry: Optional[Registry] = None
+_registry_lock = threading.Lock()
+
+
+def registry() -> Registry:
+    """This process's registry; a forked worker starts with a fresh one"""
+    global _registry
+    reg = _registry
+    if reg is None or reg.pid != os.getpid():
+        with _registry_lock:
+            if _registry is None or _registry.pid != os.getpid():
+                _registry = Registry()
+            reg = _registry
+    return reg
+
+
+def inc(name: str, amount: float = 1, **labels):
+    if not METRICS_ENABLED:
+        return
+    reg = registry()
+    key = _key(name, labels)
+    with reg.lock:
+        reg.counters[key] = reg.counters.get(key, 0) + amount
+
+
+def gauge_add(name: str, amount: float, **labels):
+    if not METRICS_ENABLED:
+        return
+    reg = registry()
+    key = _key(name, labels)
+    with reg.lock:
+        reg.gauges[key] = reg.gauges.get(key, 0) + amount
+
+
+def observe(name: str, duration_ms: float, **labels):
+    if not METRICS_ENABLED:
+        return
+    reg = registry()
+    key = _key(name, labels)
+    with reg.lock:
+        hist = reg.histograms.get(key)
+        if hist is None:
+            hist = reg.histograms[key] = Histogram()
+        hist.observe(duration_ms)
+
+
+def track_submit(executor: str, future):
+    """Count a submitted future in executor_queue_depth until it finishes"""
+    gauge_add("executor_queue_depth", 1, executor=executor)
+    future.add_done_callback(lambda _: gauge_add("executor_queue_depth", -1, executor=executor))
+    return future
+
+
+# Shared directory
+
+def _process_path(pid: int) -> str:
+    return os.path.join(METRICS_DIR, f"metrics_{pid}.json")
+
+
+def _read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: Dict):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def _archive_lock():
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(METRICS_DIR, "archive.lock"), "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _archive(paths: Iterable[str]):
+    """Fold files of exited processes into the archive and remove them"""
+    archive_path = os.path.join(METRICS_DIR, ARCHIVE_FILE)
+    with _archive_lock():
+        merged = Aggregate()
+        merged.add(_read_json(archive_path), include_gauges=False)
+        folded = []
+        for path in paths:
+            # Another reader may have archived it while we waited for the lock
+            snapshot = _read_json(path)
+            if snapshot is not None:
+                merged.add(snapshot, include_gauges=False)
+                folded.append(path)
+        if folded:
+            _write_json(archive_path, merged.to_json())
+            for path in folded:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def flush(force: bool = False):
+    """Write this process's snapshot to METRICS_DIR, at most once per interval"""
+    if not METRICS_ENABLED or not METRICS_DIR:
+        return
+    reg = registry()
+    now = time.monotonic()
+    if not force and now - reg.last_flush < METRICS_FLUSH_INTERVAL:
+        return
+    reg.last_flush = now
+    path = _process_path(reg.pid)
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        if not reg.adopted:
+            # A file under our PID was left by an earlier process that reused it
+            reg.adopted = True
+            previous = _read_json(path)
+            if previous is not None and previous.get("token") != reg.token:
+                _archive([path])
+        _write_json(path, reg.snapshot())
+    except OSError as e:
+        logger.warning("⚠️  Could not write metrics to %s: %s", METRICS_DIR, e)
+
+
+atexit.register(flush, force=True)
+
+
+# Aggregation and export
+
+class Aggregate:
+    """Metrics merged across process snapshots"""
+
+    def __init__(self):
+        self.counters: Dict[Key, float] = {}
+        self.gauges: Dict[Key, float] = {}
+        self.histograms: Dict[Key, Dict] = {}
+
+    def add(self, snapshot: Optional[Dict], include_gauges: bool = True):
+        if not snapshot:
+            return
+        for name, labels, value in snapshot.get("counters", []):
+            key = _key(name, labels)
+            self.counters[key] = self.counters.get(key, 0) + value
+        if include_gauges:
+            for name, labels, value in snapshot.get("gauges", []):
+                key = _key(name, labels)
+                self.gauges[key] = self.gauges.get(key, 0) + value
+        for name, labels, hist in snapshot.get("histograms", []):
+            key = _key(name, labels)
+            merged = self.histograms.get(key)
+            if merged is None:
+                self.histograms[key] = {**hist, "buckets": list(hist["buckets"])}
+            elif len(merged["buckets"]) == len(hist["buckets"]):
+                merged["count"] += hist["count"]
+                merged["sum_ms"] += hist["sum_ms"]
+                merged["max_ms"] = max(merged["max_ms"], hist["max_ms"])
+                merged["buckets"] = [a + b for a, b in zip(merged["buckets"], hist["buckets"])]
+
+    def cache_hit_ratios(self) -> Dict[str, float]:
+        totals: Dict[str, List[float]] = {}
+        for (name, labels), value in self.counters.items():
+            if name != "cache_requests_total":
+                continue
+            label_map = dict(labels)
+            hits_misses = totals.setdefault(label_map.get("cache", ""), [0, 0])
+            if label_map.get("result") == "hit":
+                hits_misses[0] += value
+            elif label_map.get("result") == "miss":
+                hits_misses[1] += value
+        return {cache: hits / (hits + misses) for cache, (hits, misses) in totals.items() if hits + misses}
+
+    def to_json(self) -> Dict:
+        return {
+            "counters": [[n, dict(l), v] for (n, l), v in sorted(self.counters.items())],
+            "gauges": [[n, dict(l), v] for (n, l), v in sorted(self.gauges.items())],
+            "histograms": [[n, dict(l), h] for (n, l), h in sorted(self.histograms.items())],
+        }
+
+
+def collect() -> Aggregate:
+    """Merge the snapshots of every process on the host (or just this one)"""
+    aggregate = Aggregate()
+    if not METRICS_DIR:
+        aggregate.add(registry().snapshot())
+        return aggregate
+
+    flush(force=True)
+    dead = []
+    try:
+        names = os.listdir(METRICS_DIR)
+    except OSError:
+        names = []
+    for name in names:
+        if not (name.startswith("metrics_") and name.endswith(".json")):
+            continue
+        path = os.path.join(METRICS_DIR, name)
+        snapshot = _read_json(path)
+        if snapshot is None:
+            continue
+        if _pid_alive(snapshot.get("pid", 0)):
+            aggregate.add(snapshot)
+        else:
+            dead.append(path)
+    if dead:
+        _archive(dead)
+    aggregate.add(_read_json(os.path.join(METRICS_DIR, ARCHIVE_FILE)), include_gauges=False)
+    return aggregate
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Iterable[Tuple[str, str]]) -> str:
+    labels = list(labels)
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(round(value, 6))
+
+
+def render_prometheus(aggregate: Aggregate) -> str:
+    """Prometheus text exposition format (version 0.0.4)"""
+    samples: Dict[str, List] = {}
+    for (name, labels), value in list(aggregate.counters.items()) + list(aggregate.gauges.items()):
+        samples.setdefault(name, []).append((labels, value))
+    for cache_name, ratio in aggregate.cache_hit_ratios().items():
+        samples.setdefault("cache_hit_ratio", []).append(((("cache", cache_name),), ratio))
+    for (name, labels), hist in aggregate.histograms.items():
+        samples.setdefault(name, []).append((labels, hist))
+
+    lines = []
+    for name in list(METRICS) + sorted(set(samples) - set(METRICS)):
+        if name not in samples:
+            continue
+        metric_type, help_text = METRICS.get(name, ("untyped", name))
+        full_name = f"{NAMESPACE}_{name}"
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {metric_type}")
+        for labels, value in sorted(samples[name], key=lambda s: s[0]):
+            if metric_type != "histogram":
+                lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(BUCKETS_MS) + ["+Inf"], value["buckets"]):
+                cumulative += count
+                lines.append(f"{full_name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{full_name}_sum{_labels(labels)} {_number(value['sum_ms'])}")
+            lines.append(f"{full_name}_count{_labels(labels)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
@@ -0,0 +1,108 @@
+"""
+Convert UploadedFile.processed_content from a JSON string in a TextField to a
+JSONField (jsonb on PostgreSQL), and index the keys the app filters on.
+
+Rows are copied into a new column first so a failed conversion never loses the
+original text; values that are not valid JSON are kept as {"raw_content": ...}.
+"""
+
+import json
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+GIN_INDEXES = (
+    # Containment lookups on the whole document (processed_content__contains)
+    (
+        "file_upload_upl_content_gin",
+        "CREATE INDEX IF NOT EXISTS file_upload_upl_content_gin "
+        "ON file_upload_uploadedfile USING gin (processed_content jsonb_path_ops)",
+    ),
+    # Skill matching (processed_content__skills__contains=[...])
+    (
+        "file_upload_upl_skills_gin",
+        "CREATE INDEX IF NOT EXISTS file_upload_upl_skills_gin "
+        "ON file_upload_uploadedfile USING gin ((processed_content -> 'skills'))",
+    ),
+    # Duplicate upload detection (processed_content__content_sha256=...)
+    (
+        "file_upload_upl_sha256_idx",
+        "CREATE INDEX IF NOT EXISTS file_upload_upl_sha256_idx "
+        "ON file_upload_uploadedfile ((processed_content ->> 'content_sha256'))",
+    ),
+)
+
+
+def text_to_json(apps, schema_editor):
+    UploadedFile = apps.get_model("file_upload", "UploadedFile")
+    batch = []
+    for row in UploadedFile.objects.only("id", "processed_content").iterator(chunk_size=BATCH_SIZE):
+        if not row.processed_content:
+            continue
+        try:
+            row.processed_data = json.loads(row.processed_content)
+        except json.JSONDecodeError:
+            row.processed_data = {"raw_content": row.processed_content}
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            UploadedFile.objects.bulk_update(batch, ["processed_data"])
+            batch = []
+    if batch:
+        UploadedFile.objects.bulk_update(batch, ["processed_data"])
+
+
+def json_to_text(apps, schema_editor):
+    UploadedFile = apps.get_model("file_upload", "UploadedFile")
+    batch = []
+    for row in UploadedFile.objects.only("id", "processed_data").iterator(chunk_size=BATCH_SIZE):
+        if row.processed_data is None:
+            continue
+        row.processed_content = json.dumps(row.processed_data)
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            UploadedFile.objects.bulk_update(batch, ["processed_content"])
+            batch = []
+    if batch:
+        UploadedFile.objects.bulk_update(batch, ["processed_content"])
+
+
+def create_gin_indexes(apps, schema_editor):
+    # jsonb operator classes only exist on PostgreSQL; SQLite dev databases skip this
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _, sql in GIN_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _ in GIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("file_upload", "0003_jobposting_profile_resume_experience_education_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="uploadedfile",
+            name="processed_data",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(text_to_json, json_to_text),
+        migrations.RemoveField(
+            model_name="uploadedfile",
+            name="processed_content",
+        ),
+        migrations.RenameField(
+            model_name="uploadedfile",
+            old_name="processed_data",
+            new_name="processed_content",
+        ),
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
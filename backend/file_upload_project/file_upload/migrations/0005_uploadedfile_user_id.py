@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("file_upload", "0004_uploadedfile_processed_content_json"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="uploadedfile",
+            name="user_id",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="uploadedfile",
+            index=models.Index(fields=["user_id", "-uploaded_at", "-id"], name="upl_user_uploaded_idx"),
+        ),
+    ]
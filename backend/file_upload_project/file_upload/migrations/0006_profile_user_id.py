@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("file_upload", "0005_uploadedfile_user_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="user_id",
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
@@ -1,4 +1,23 @@
 from django.db import models
+from django.db.models.fields.json import KeyTextTransform, KeyTransform
+
+from .content_storage import pack_processed_content, unpack_processed_content
+
+
+class UploadedFileQuerySet(models.QuerySet):
+    def with_content_keys(self, *keys, as_text=False):
+        """
+        Project top-level keys of processed_content without loading the blob.
+
+        Each key is annotated as `content_<key>` and processed_content itself
+        is deferred, so only the requested values leave the database. Keys
+        must be among content_storage.INDEXED_KEYS to be reliable when
+        compression is enabled.
+        """
+        transform = KeyTextTransform if as_text else KeyTransform
+        return self.defer("processed_content").annotate(
+            **{f"content_{key}": transform(key, "processed_content") for key in keys}
+        )
 
 
 # Model for handling uploaded files
@@ -9,15 +28,32 @@ class UploadedFile(models.Model):
     Fields:
         file: FileField - Uploaded resume file
         uploaded_at: DateTimeField - Upload timestamp
-        processed_content: TextField - JSON string of processed data
+        user_id: CharField - Owning user's ID (Supabase or Django user)
+        processed_content: JSONField - Processed data (jsonb on PostgreSQL),
+            written with set_processed_content and read with get_processed_content
     """
     file = models.FileField(upload_to="uploads/")
     uploaded_at = models.DateTimeField(auto_now_add=True)
-    processed_content = models.TextField(blank=True, null=True)
+    processed_content = models.JSONField(blank=True, null=True)
+    user_id = models.CharField(max_length=64, blank=True, null=True)
+
+    objects = UploadedFileQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of a user's files (see file_listing.py)
+            models.Index(fields=["user_id", "-uploaded_at", "-id"], name="upl_user_uploaded_idx"),
+        ]
 
     def __str__(self):
         return self.file.name
 
+    def set_processed_content(self, content):
+        self.processed_content = pack_processed_content(content)
+
+    def get_processed_content(self) -> dict:
+        return unpack_processed_content(self.processed_content)
+
     def file_path(self):
         return self.file.path
 
@@ -63,14 +99,19 @@ class Profile(models.Model):
         email: EmailField
         phone: CharField
         zipCode: CharField
+        user_id: CharField - Owning user's ID (Supabase or Django user)
         created_at: DateTimeField
         updated_at: DateTimeField
+
+    Related:
+        experiences, education, skills: reverse FKs from the models below
     """
     firstName = models.CharField(max_length=255)
     lastName = models.CharField(max_length=255)
     email = models.EmailField()
-    phone = models.CharField(max_length=20)
-    zipCode = models.CharField(max_length=10)
+    phone = models.CharField(max_length=20, blank=True)
+    zipCode = models.CharField(max_length=10, blank=True)
+    user_id = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -78,3 +119,35 @@ class Profile(models.Model):
         return f"{self.firstName} {self.lastName}"
 
 
+class Experience(models.Model):
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="experiences")
+    jobTitle = models.CharField(max_length=255)
+    company = models.CharField(max_length=255)
+    startDate = models.CharField(max_length=50)
+    endDate = models.CharField(max_length=50)
+    location = models.CharField(max_length=255, blank=True)
+    jobDescription = models.TextField()
+
+    def __str__(self):
+        return f"{self.jobTitle} at {self.company}"
+
+
+class Education(models.Model):
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="education")
+    highestDegree = models.CharField(max_length=255)
+    fieldOfStudy = models.CharField(max_length=255)
+    institution = models.CharField(max_length=255)
+    graduationYear = models.CharField(max_length=50)
+
+    def __str__(self):
+        return f"{self.highestDegree}, {self.institution}"
+
+
+class Skills(models.Model):
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="skills")
+    skills = models.JSONField()
+
+    def __str__(self):
+        return f"Skills for profile {self.profile_id}"
+
+
@@ -10,6 +10,8 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import hashlib
 
+from .timing import span
+
 
 @dataclass
 class PIIMatch:
@@ -170,10 +172,14 @@ class PIIAnonymizer:
         
         # Detect all PII
         all_matches = []
-        all_matches.extend(self.detect_emails(text))
-        all_matches.extend(self.detect_phones(text))
-        all_matches.extend(self.detect_addresses(text))
-        all_matches.extend(self.detect_names_from_structure(text))
+        with span("pii.emails"):
+            all_matches.extend(self.detect_emails(text))
+        with span("pii.phones"):
+            all_matches.extend(self.detect_phones(text))
+        with span("pii.addresses"):
+            all_matches.extend(self.detect_addresses(text))
+        with span("pii.names"):
+            all_matches.extend(self.detect_names_from_structure(text))
         
         # Sort matches by position (reverse order for replacement)
         all_matches.sort(key=lambda x: x.start_pos, reverse=True)
@@ -0,0 +1,113 @@
+"""
+Profile Cache Module
+Read path for the profile API views: one query for the profile plus one per
+related table via prefetch_related, serialized once and cached per profile.
+Signal handlers in signals.py invalidate the entry whenever the profile or
+any of its experience/education/skills rows change.
+"""
+
+import os
+from typing import Dict, Optional
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from . import metrics
+from .models import Education, Experience, Profile, Skills
+
+
+PROFILE_CACHE_TTL = int(os.getenv("PROFILE_CACHE_TTL", "300"))
+CACHE_PREFIX = "profile:v1"
+
+
+def profile_cache_key(profile_id: int) -> str:
+    return f"{CACHE_PREFIX}:{profile_id}"
+
+
+def owner_cache_key(user_id: str) -> str:
+    return f"{CACHE_PREFIX}:user:{user_id}"
+
+
+def profile_queryset():
+    """Profiles with their related rows loaded in one query per table"""
+    return Profile.objects.prefetch_related(
+        Prefetch("experiences", queryset=Experience.objects.order_by("id")),
+        Prefetch("education", queryset=Education.objects.order_by("id")),
+        Prefetch("skills", queryset=Skills.objects.order_by("id")),
+    )
+
+
+def serialize_profile(profile: Profile) -> Dict:
+    """Response payload shared by ProfileAPIView and ProfileDetailAPIView"""
+    return {
+        'id': profile.id,
+        'firstName': profile.firstName,
+        'lastName': profile.lastName,
+        'email': profile.email,
+        'phone': profile.phone,
+        'zipCode': profile.zipCode,
+        'owner_id': profile.user_id,
+        'experience': [{
+            'jobTitle': exp.jobTitle,
+            'company': exp.company,
+            'startDate': exp.startDate,
+            'endDate': exp.endDate,
+            'location': exp.location,
+            'jobDescription': exp.jobDescription
+        } for exp in profile.experiences.all()],
+        'education': [{
+            'highestDegree': edu.highestDegree,
+            'fieldOfStudy': edu.fieldOfStudy,
+            'institution': edu.institution,
+            'graduationYear': edu.graduationYear
+        } for edu in profile.education.all()],
+        'skills': [skill.skills for skill in profile.skills.all()],
+    }
+
+
+def get_profile_data(profile_id: int) -> Dict:
+    """
+    Serialized profile by ID, from cache when possible.
+
+    Raises:
+        Profile.DoesNotExist: If no profile has this ID
+    """
+    key = profile_cache_key(profile_id)
+    data = cache.get(key)
+    metrics.inc("cache_requests_total", cache="profile", result="miss" if data is None else "hit")
+    if data is None:
+        data = serialize_profile(profile_queryset().get(id=profile_id))
+        cache.set(key, data, PROFILE_CACHE_TTL)
+    return data
+
+
+def get_profile_data_for_user(user_id: Optional[str]) -> Dict:
+    """
+    Serialized profile owned by a user; with user_id=None, the most recent
+    profile (the development views have no authenticated user).
+
+    Raises:
+        Profile.DoesNotExist: If the user has no profile
+    """
+    key = owner_cache_key(user_id) if user_id is not None else None
+    profile_id = cache.get(key) if key else None
+    if key:
+        metrics.inc("cache_requests_total", cache="profile_owner", result="miss" if profile_id is None else "hit")
+    if profile_id is None:
+        profiles = Profile.objects.order_by("-id")
+        if user_id is not None:
+            profiles = profiles.filter(user_id=user_id)
+        profile_id = profiles.values_list("id", flat=True).first()
+        if profile_id is None:
+            raise Profile.DoesNotExist("Profile not found")
+        if key:
+            cache.set(key, profile_id, PROFILE_CACHE_TTL)
+    return get_profile_data(profile_id)
+
+
+def invalidate_profile(profile_id: int, user_id: Optional[str] = None):
+    """Drop cached payloads for a profile (and its owner lookup)"""
+    keys = [profile_cache_key(profile_id)]
+    if user_id:
+        keys.append(owner_cache_key(user_id))
+    cache.delete_many(keys)
@@ -0,0 +1,170 @@
+"""
+Prompt Builder Module
+Projects resume and job posting data down to the fields the analysis prompt
+actually uses and serializes them compactly, within a token budget, before
+they are sent to the external AI service.
+"""
+
+import json
+import math
+import os
+from typing import Any, Dict, Optional, Tuple
+
+
+# Fields of the structured resume (see resumeProcessorPrompt) that matter for
+# the comparison. Contact details and processing bookkeeping are left out.
+RESUME_FIELDS = (
+    "skills",
+    "work_experience",
+    "education",
+    "projects",
+    "certifications",
+    "languages",
+)
+
+# Fields of the structured job posting (see jobProcessorPrompt)
+JOB_FIELDS = (
+    "title",
+    "company_name",
+    "skills",
+    "qualifications",
+    "responsibilities",
+    "description",
+    "location",
+    "salary_range",
+)
+
+# Order in which fields are shrunk, then dropped, when the payload is over
+# budget. Fields not listed here (resume and job skills) are never dropped.
+TRUNCATION_ORDER = (
+    ("resume", "languages"),
+    ("resume", "certifications"),
+    ("job", "salary_range"),
+    ("job", "location"),
+    ("resume", "projects"),
+    ("job", "description"),
+    ("resume", "education"),
+    ("job", "responsibilities"),
+    ("job", "qualifications"),
+    ("job", "company_name"),
+    ("resume", "work_experience"),
+)
+
+# Rough characters-per-token ratio for English text with JSON punctuation
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("ANALYSIS_PROMPT_TOKEN_BUDGET", "3000"))
+
+# Strings shorter than this are never shortened, only dropped with their field
+MIN_STRING_LENGTH = 80
+
+
+def compact_json(data: Any) -> str:
+    """Serialize data as minified JSON (no indentation, no spaces after separators)"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting; avoids loading a tokenizer"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _prune(value: Any) -> Any:
+    """Recursively remove null, empty and bookkeeping (underscore-prefixed) values"""
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            if isinstance(key, str) and key.startswith("_"):
+                continue
+            item = _prune(item)
+            if item not in (None, "", [], {}):
+                pruned[key] = item
+        return pruned
+    if isinstance(value, list):
+        return [item for item in (_prune(v) for v in value) if item not in (None, "", [], {})]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def project_resume(resume_data: Optional[Dict]) -> Dict:
+    """Keep only the analysis-relevant fields of a processed resume"""
+    if not isinstance(resume_data, dict):
+        return {}
+    return _prune({field: resume_data.get(field) for field in RESUME_FIELDS})
+
+
+def project_job(job_data: Optional[Dict]) -> Dict:
+    """
+    Keep only the analysis-relevant fields of a processed job posting.
+
+    extractJobDescription returns an error structure (with status_code) when the
+    AI step fails; in that case the scraped text is the only usable content.
+    """
+    if not isinstance(job_data, dict):
+        return {}
+    if "status_code" in job_data:
+        return _prune({"description": job_data.get("full_text")})
+    return _prune({field: job_data.get(field) for field in JOB_FIELDS})
+
+
+def _shrink(value: Any) -> Any:
+    """Halve long strings and lists inside a value"""
+    if isinstance(value, str):
+        if len(value) <= MIN_STRING_LENGTH:
+            return value
+        return value[: max(MIN_STRING_LENGTH, len(value) // 2)].rstrip() + "…"
+    if isinstance(value, list):
+        keep = max(1, math.ceil(len(value) / 2))
+        return [_shrink(item) for item in value[:keep]]
+    if isinstance(value, dict):
+        return {key: _shrink(item) for key, item in value.items()}
+    return value
+
+
+def _total_tokens(payloads: Dict[str, Dict]) -> int:
+    return sum(estimate_tokens(compact_json(p)) for p in payloads.values())
+
+
+def build_analysis_inputs(
+    resume_data: Optional[Dict],
+    job_data: Optional[Dict],
+    token_budget: Optional[int] = None,
+) -> Tuple[str, str]:
+    """
+    Build the resume and job strings that are interpolated into analysisPrompt.
+
+    Args:
+        resume_data: Structured resume data from processResume/processResumeFromContent
+        job_data: Structured job posting data from extractJobDescription
+        token_budget: Combined token budget for both payloads
+
+    Returns:
+        Tuple of (resume_json, job_json) as minified JSON strings
+    """
+    budget = token_budget or DEFAULT_TOKEN_BUDGET
+    payloads = {"resume": project_resume(resume_data), "job": project_job(job_data)}
+
+    for side, field in TRUNCATION_ORDER:
+        if _total_tokens(payloads) <= budget:
+            break
+        if field not in payloads[side]:
+            continue
+        # Shrink the field step by step; drop it once it cannot shrink further
+        shrunk = _shrink(payloads[side][field])
+        while shrunk != payloads[side][field]:
+            payloads[side][field] = shrunk
+            if _total_tokens(payloads) <= budget:
+                break
+            shrunk = _shrink(shrunk)
+        else:
+            del payloads[side][field]
+
+    # Last resort: whatever is left (skills) is shrunk as a whole, so the
+    # result stays valid JSON even when it cannot fit the budget
+    shrunk = _shrink(payloads)
+    while _total_tokens(payloads) > budget and shrunk != payloads:
+        payloads = shrunk
+        shrunk = _shrink(payloads)
+
+    return compact_json(payloads["resume"]), compact_json(payloads["job"])
@@ -0,0 +1,61 @@
+"""
+Request Middleware Module
+Per-request accounting for production: every request is counted and timed
+in the metrics registry, while only a sample of them (plus every server
+error and slow request) is written to the access log. Health probes are
+counted but never logged.
+"""
+
+import logging
+import random
+import time
+
+from django.conf import settings
+
+from . import metrics
+from .structured_logging import event
+
+
+logger = logging.getLogger("file_upload.requests")
+
+# Load balancer and scraper endpoints; these arrive every few seconds
+QUIET_ROUTES = {"health-check", "health-simple", "ready-check", "live-check", "metrics"}
+
+
+class RequestMetricsMiddleware:
+    """
+    Records method, route, status and duration of each request.
+
+    settings.REQUEST_LOG_SAMPLE_RATE is the fraction of ordinary requests
+    written to the access log; 5xx responses and requests slower than
+    settings.REQUEST_LOG_SLOW_MS are always logged.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "REQUEST_LOG_SAMPLE_RATE", 1.0)
+        self.slow_ms = getattr(settings, "REQUEST_LOG_SLOW_MS", 2000)
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or match.view_name) if match else "unmatched"
+        method = request.method if request.method in metrics.KNOWN_METHODS else "other"
+        status = response.status_code
+        metrics.inc("http_requests_total", view=view, method=method, status=status)
+        metrics.observe("http_request_duration_ms", duration_ms, view=view)
+        metrics.flush()
+
+        if view in QUIET_ROUTES:
+            return response
+        if status >= 500 or duration_ms >= self.slow_ms or random.random() < self.sample_rate:
+            logger.log(
+                logging.WARNING if status >= 500 else logging.INFO,
+                "%s %s %s %.1fms",
+                method, match.route if match else request.path, status, duration_ms,
+                extra=event("http.request", view=view, status=status, duration_ms=round(duration_ms, 1)),
+            )
+        return response
@@ -0,0 +1,441 @@
+"""
+Resume Extraction Module
+Opens resume sources (bytes, file-like objects, paths and Django uploads)
+as seekable binary streams without copying them into memory again, hashes
+them, and extracts their plain text.
+"""
+
+import contextlib
+import functools
+import hashlib
+import io
+import mmap
+import os
+import re
+import zipfile
+from typing import BinaryIO, Iterator, Optional, Union
+
+from lxml import etree
+
+from . import lazy_imports
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+ResumeSource = Union[bytes, bytearray, memoryview, str, os.PathLike, BinaryIO]
+
+
+class MappedFile(io.RawIOBase):
+    """
+    Read-only file object over a memory-mapped file.
+
+    mmap objects lack seekable()/readable(), which zipfile (python-docx) and
+    pdfminer expect, so they are wrapped rather than passed directly.
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        super().__init__()
+        self._mapped = mapped
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        return self._mapped.read() if size is None or size < 0 else self._mapped.read(size)
+
+    def readinto(self, buffer) -> int:
+        data = self._mapped.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+
+    def tell(self) -> int:
+        return self._mapped.tell()
+
+    def getbuffer(self) -> memoryview:
+        return memoryview(self._mapped)
+
+    def close(self):
+        if not self.closed:
+            self._mapped.close()
+        super().close()
+
+
+@contextlib.contextmanager
+def _open_path(path) -> Iterator[BinaryIO]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be memory-mapped
+            yield f
+            return
+        mapped = MappedFile(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+@contextlib.contextmanager
+def open_resume_stream(source: ResumeSource) -> Iterator[BinaryIO]:
+    """
+    Open a resume source as a seekable binary stream positioned at offset 0.
+
+    Args:
+        source: Raw bytes, a filesystem path, a Django UploadedFile or any
+            seekable binary file object
+
+    Yields:
+        BinaryIO: Stream over the resume content; paths and uploads spilled
+        to disk (TemporaryUploadedFile) are memory-mapped rather than read
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # BytesIO shares the bytes buffer until it is written to
+        yield io.BytesIO(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with _open_path(source) as stream:
+            yield stream
+    elif hasattr(source, "temporary_file_path"):
+        with _open_path(source.temporary_file_path()) as stream:
+            yield stream
+    else:
+        # InMemoryUploadedFile and plain file objects: use the underlying file
+        stream = getattr(source, "file", None) or source
+        stream.seek(0)
+        yield stream
+        stream.seek(0)
+
+
+def hash_stream(stream: BinaryIO) -> str:
+    """
+    SHA-256 of a stream's content, leaving the stream at offset 0.
+    Buffer-backed streams are hashed in place; others in fixed-size chunks.
+    """
+    getbuffer = getattr(stream, "getbuffer", None)
+    if getbuffer is not None:
+        with getbuffer() as view:
+            return hashlib.sha256(view).hexdigest()
+
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+class PdfTextBackend:
+    """
+    Interface for PDF text extraction backends.
+    Subclasses set `name` and implement extract().
+    """
+
+    name = ""
+
+    def available(self) -> bool:
+        return True
+
+    def extract(self, stream: BinaryIO, max_pages: Optional[int] = None) -> str:
+        raise NotImplementedError(".extract() must be overridden")
+
+
+class PdfPlumberBackend(PdfTextBackend):
+    """
+    Full layout analysis via pdfplumber. Slowest, but keeps columns and
+    tables in reading order; used as the fallback.
+    """
+
+    name = "pdfplumber"
+
+    def extract(self, stream: BinaryIO, max_pages: Optional[int] = None) -> str:
+        page_texts = []
+        with lazy_imports.pdfplumber().open(stream) as pdf:
+            for page in pdf.pages[:max_pages]:
+                page_text = page.extract_text()
+                if page_text:
+                    page_texts.append(page_text)
+                # Release cached layout objects once a page is done
+                page.close()
+        return "\n".join(page_texts)
+
+
+@functools.lru_cache(maxsize=None)
+def _plain_text_device_class():
+    """Defined on first use so pdfminer is only imported when a PDF is parsed"""
+    pdfminer = lazy_imports.pdfminer()
+
+    class _PlainTextDevice(pdfminer.PDFTextDevice):
+        """
+        pdfminer device that writes characters in content-stream order without
+        building layout objects. Line breaks and spaces are inferred from jumps
+        in character position.
+        """
+
+        def __init__(self, rsrcmgr):
+            super().__init__(rsrcmgr)
+            self.parts = []
+            self._last_y = None
+            self._last_end_x = None
+
+        def begin_page(self, page, ctm):
+            super().begin_page(page, ctm)
+            if self.parts:
+                self.parts.append("\n")
+            self._last_y = self._last_end_x = None
+
+        def render_char(self, matrix, font, fontsize, scaling, rise, cid, *args):
+            try:
+                text = font.to_unichr(cid)
+            except pdfminer.PDFUnicodeNotDefined:
+                text = ""
+            adv = font.char_width(cid) * fontsize * scaling
+            x, y = matrix[4], matrix[5]
+            x_scale = abs(matrix[0]) or 1.0
+            y_scale = abs(matrix[3]) or 1.0
+            if self._last_y is not None:
+                if abs(y - self._last_y) > 0.5 * fontsize * y_scale or x < self._last_end_x - fontsize * x_scale:
+                    self.parts.append("\n")
+                elif x - self._last_end_x > 0.2 * fontsize * x_scale:
+                    self.parts.append(" ")
+            self.parts.append(text)
+            self._last_y = y
+            self._last_end_x = x + adv * x_scale
+            return adv
+
+        def get_text(self) -> str:
+            return "".join(self.parts)
+
+    return _PlainTextDevice
+
+
+class PdfMinerBackend(PdfTextBackend):
+    """
+    Fast plain-text path: pdfminer's interpreter with layout analysis
+    disabled. Several times faster than pdfplumber on text-only resumes.
+    """
+
+    name = "pdfminer"
+
+    def extract(self, stream: BinaryIO, max_pages: Optional[int] = None) -> str:
+        pdfminer = lazy_imports.pdfminer()
+        rsrcmgr = pdfminer.PDFResourceManager(caching=True)
+        device = _plain_text_device_class()(rsrcmgr)
+        interpreter = pdfminer.PDFPageInterpreter(rsrcmgr, device)
+        for page in pdfminer.PDFPage.get_pages(stream, maxpages=max_pages or 0):
+            interpreter.process_page(page)
+        device.close()
+        return device.get_text()
+
+
+class PypdfBackend(PdfTextBackend):
+    """Plain-text path via pypdf, used only when pypdf is installed"""
+
+    name = "pypdf"
+
+    def available(self) -> bool:
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def extract(self, stream: BinaryIO, max_pages: Optional[int] = None) -> str:
+        import pypdf
+        reader = pypdf.PdfReader(stream)
+        return "\n".join((page.extract_text() or "") for page in reader.pages[:max_pages])
+
+
+PDF_BACKENDS = {
+    backend.name: backend
+    for backend in (PdfMinerBackend(), PypdfBackend(), PdfPlumberBackend())
+}
+
+# 'auto' tries the fast backend and falls back to pdfplumber on low quality
+PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "auto")
+FAST_PDF_BACKEND = os.getenv("RESUME_FAST_PDF_BACKEND", "pdfminer")
+MIN_TEXT_QUALITY = float(os.getenv("RESUME_MIN_TEXT_QUALITY", "0.75"))
+
+
+def text_quality(text: str, page_count: int = 1) -> float:
+    """
+    Heuristic 0..1 score for extracted text.
+
+    Penalizes unmapped glyphs, control/garbage characters, run-together words
+    (missing spaces), and pages with almost no text (scans, or content the
+    fast path missed).
+    """
+    stripped = text.strip()
+    if not stripped:
+        return 0.0
+
+    printable = sum(1 for ch in stripped if ch.isalnum() or ch.isspace() or ch in ".,;:-()/&@+#'%$!?*\"")
+    score = printable / len(stripped)
+
+    words = stripped.split()
+    long_words = sum(1 for w in words if len(w) > 25 and not w.startswith(("http", "www.")))
+    score -= min(0.5, 5 * long_words / max(len(words), 1))
+
+    if stripped.count("(cid:") or "\ufffd" in stripped:
+        score -= 0.3
+
+    if len(stripped) / max(page_count, 1) < 200:
+        score -= 0.3
+    return max(0.0, min(1.0, score))
+
+
+def extract_pdf_text(
+    stream: BinaryIO,
+    max_pages: Optional[int] = None,
+    backend: Optional[str] = None,
+    page_count: Optional[int] = None,
+) -> str:
+    """
+    Extract text from a PDF stream, reading at most max_pages.
+
+    With the 'auto' backend the fast plain-text path runs first and the
+    pdfplumber layout path is only used when text_quality rates the fast
+    result below RESUME_MIN_TEXT_QUALITY.
+    """
+    choice = backend or PDF_BACKEND
+    if choice != "auto":
+        return PDF_BACKENDS[choice].extract(stream, max_pages=max_pages)
+
+    fast = PDF_BACKENDS.get(FAST_PDF_BACKEND)
+    if fast is not None and fast.available():
+        start = stream.tell()
+        try:
+            text = fast.extract(stream, max_pages=max_pages)
+        except Exception:
+            text = ""
+        pages_read = min(page_count or 1, max_pages or page_count or 1)
+        if text_quality(text, pages_read) >= MIN_TEXT_QUALITY:
+            return text
+        stream.seek(start)
+    return PDF_BACKENDS["pdfplumber"].extract(stream, max_pages=max_pages)
+
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_W_TEXT = WORD_NS + "t"
+_W_PARAGRAPH = WORD_NS + "p"
+_W_TAB = WORD_NS + "tab"
+_W_BREAKS = (WORD_NS + "br", WORD_NS + "cr")
+_W_CELL = WORD_NS + "tc"
+
+_HEADER_PART = re.compile(r"^word/header\d*\.xml$")
+_FOOTER_PART = re.compile(r"^word/footer\d*\.xml$")
+
+
+def _docx_part_names(names) -> list:
+    """Parts to read, in output order: headers, the body, then footers"""
+    def part_number(name):
+        digits = re.sub(r"\D", "", name)
+        return int(digits) if digits else 0
+
+    headers = sorted((n for n in names if _HEADER_PART.match(n)), key=part_number)
+    footers = sorted((n for n in names if _FOOTER_PART.match(n)), key=part_number)
+    return headers + ["word/document.xml"] + footers
+
+
+def _iter_part_text(part: BinaryIO) -> Iterator[str]:
+    """
+    Yield the text of one WordprocessingML part in document order.
+
+    Every w:t run is emitted, including those in tables and text boxes;
+    mc:Fallback copies of text boxes are skipped so they are not duplicated.
+    Finished paragraphs are cleared so memory stays bounded.
+    """
+    skip_depth = 0
+    context = etree.iterparse(
+        part,
+        events=("start", "end"),
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=False,
+    )
+    for event, elem in context:
+        tag = elem.tag
+        if event == "start":
+            if tag == MC_FALLBACK:
+                skip_depth += 1
+            continue
+
+        if tag == MC_FALLBACK:
+            skip_depth -= 1
+        elif not skip_depth:
+            if tag == _W_TEXT:
+                if elem.text:
+                    yield elem.text
+            elif tag == _W_TAB:
+                yield "\t"
+            elif tag in _W_BREAKS:
+                yield "\n"
+            elif tag == _W_CELL:
+                yield "\t"
+            elif tag == _W_PARAGRAPH:
+                yield "\n"
+
+        if tag in (_W_PARAGRAPH, MC_FALLBACK):
+            # Free the finished subtree and any already-processed siblings
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def extract_docx_text(stream: BinaryIO) -> str:
+    """
+    Extract text from a DOCX stream in one streaming XML pass per part.
+
+    Reads headers, the document body (including tables and text boxes) and
+    footers straight out of the zip with lxml iterparse instead of building
+    python-docx's object model.
+    """
+    pieces = []
+    with zipfile.ZipFile(stream) as archive:
+        names = set(archive.namelist())
+        for name in _docx_part_names(names):
+            if name not in names:
+                continue
+            with archive.open(name) as part:
+                pieces.extend(_iter_part_text(part))
+            pieces.append("\n")
+    return "".join(pieces)
+
+
+def extract_resume_text(
+    stream: BinaryIO,
+    filename: str,
+    kind: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    page_count: Optional[int] = None,
+) -> str:
+    """
+    Extract raw text from a resume stream.
+
+    Args:
+        stream: Seekable binary stream
+        filename: Original filename, used to pick the parser when kind is not given
+        kind: 'pdf' or 'docx' as detected by resume_preflight
+        max_pages: Stop PDF extraction after this many pages
+        page_count: PDF page count from preflight, used by the quality heuristic
+    Raises:
+        ValueError: If file format is not supported
+    """
+    if kind is None:
+        if filename.lower().endswith(".pdf"):
+            kind = "pdf"
+        elif filename.lower().endswith(".docx"):
+            kind = "docx"
+    if kind == "pdf":
+        return extract_pdf_text(stream, max_pages=max_pages, page_count=page_count)
+    elif kind == "docx":
+        return extract_docx_text(stream)
+    raise ValueError("Unsupported file format. Only PDF and DOCX files are supported.")
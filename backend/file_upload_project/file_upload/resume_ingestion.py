@@ -0,0 +1,231 @@
+"""
+Resume Ingestion Module
+Maps the structured JSON from resumeProcessorPrompt onto the Profile,
+Experience, Education and Skills models. A batch of resumes is written in
+one transaction with a fixed number of queries per table, and re-ingesting
+a resume only writes the rows that actually changed.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Education, Experience, Profile, Skills
+from .profile_cache import invalidate_profile
+
+
+PROFILE_FIELDS = ("firstName", "lastName", "email", "phone", "zipCode")
+EXPERIENCE_FIELDS = ("jobTitle", "company", "startDate", "endDate", "location", "jobDescription")
+EDUCATION_FIELDS = ("highestDegree", "fieldOfStudy", "institution", "graduationYear")
+
+
+@dataclass
+class IngestionResult:
+    """Row counts written by ingest_resumes, per model and operation"""
+    profile_ids: List[int] = field(default_factory=list)
+    created: Counter = field(default_factory=Counter)
+    updated: Counter = field(default_factory=Counter)
+    deleted: Counter = field(default_factory=Counter)
+
+
+def _text(value, model, field_name: str) -> str:
+    """Coerce an LLM value to a string that fits the model column"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(v) for v in value if v)
+    text = str(value).strip()
+    max_length = model._meta.get_field(field_name).max_length
+    return text[:max_length] if max_length else text
+
+
+def _entries(value) -> List[Dict]:
+    """The prompt asks for one object per section, but lists come back too"""
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [v for v in value if isinstance(v, dict) and any(v.values())]
+
+
+def map_profile(data: Dict) -> Dict:
+    contact = data.get("contact_info") or {}
+    if not isinstance(contact, dict):
+        contact = {}
+    first, _, last = _text(data.get("name"), Profile, "firstName").partition(" ")
+    return {
+        "firstName": _text(first, Profile, "firstName"),
+        "lastName": _text(last, Profile, "lastName"),
+        "email": _text(contact.get("email"), Profile, "email"),
+        "phone": _text(contact.get("phone"), Profile, "phone"),
+        "zipCode": _text(contact.get("zipCode"), Profile, "zipCode"),
+    }
+
+
+def map_experiences(data: Dict) -> List[Tuple]:
+    return [
+        tuple(_text(entry.get(name), Experience, name) for name in EXPERIENCE_FIELDS)
+        for entry in _entries(data.get("work_experience"))
+    ]
+
+
+def map_education(data: Dict) -> List[Tuple]:
+    return [
+        tuple(_text(entry.get(name), Education, name) for name in EDUCATION_FIELDS)
+        for entry in _entries(data.get("education"))
+    ]
+
+
+def map_skills(data: Dict) -> List[str]:
+    skills = data.get("skills") or []
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    return list(dict.fromkeys(str(s).strip() for s in skills if s and str(s).strip()))
+
+
+def _diff_rows(existing: List, desired: List[Tuple], fields: Tuple[str, ...]):
+    """
+    Match existing rows to desired value tuples as multisets.
+
+    Returns:
+        (ids_to_delete, tuples_to_create)
+    """
+    remaining = Counter(desired)
+    to_delete = []
+    for row in existing:
+        key = tuple(getattr(row, name) for name in fields)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            to_delete.append(row.id)
+    return to_delete, list(remaining.elements())
+
+
+def _sync_children(model, fields, desired_by_profile: Dict[int, List[Tuple]], result: IngestionResult):
+    """Diff and write one child table for every profile in the batch"""
+    existing = defaultdict(list)
+    for row in model.objects.filter(profile_id__in=desired_by_profile).order_by("id"):
+        existing[row.profile_id].append(row)
+
+    delete_ids, new_rows = [], []
+    for profile_id, desired in desired_by_profile.items():
+        stale, missing = _diff_rows(existing[profile_id], desired, fields)
+        delete_ids.extend(stale)
+        new_rows.extend(model(profile_id=profile_id, **dict(zip(fields, values))) for values in missing)
+
+    if delete_ids:
+        model.objects.filter(id__in=delete_ids).delete()
+        result.deleted[model.__name__] += len(delete_ids)
+    if new_rows:
+        model.objects.bulk_create(new_rows)
+        result.created[model.__name__] += len(new_rows)
+
+
+def _sync_skills(desired_by_profile: Dict[int, List[str]], result: IngestionResult):
+    """Keep exactly one Skills row (a JSON list) per profile"""
+    existing = defaultdict(list)
+    for row in Skills.objects.filter(profile_id__in=desired_by_profile).order_by("id"):
+        existing[row.profile_id].append(row)
+
+    to_create, to_update, delete_ids = [], [], []
+    for profile_id, skills in desired_by_profile.items():
+        rows = existing[profile_id]
+        delete_ids.extend(row.id for row in rows[1:])
+        if not skills:
+            delete_ids.extend(row.id for row in rows[:1])
+        elif not rows:
+            to_create.append(Skills(profile_id=profile_id, skills=skills))
+        elif rows[0].skills != skills:
+            rows[0].skills = skills
+            to_update.append(rows[0])
+
+    if delete_ids:
+        Skills.objects.filter(id__in=delete_ids).delete()
+        result.deleted["Skills"] += len(delete_ids)
+    if to_update:
+        Skills.objects.bulk_update(to_update, ["skills"])
+        result.updated["Skills"] += len(to_update)
+    if to_create:
+        Skills.objects.bulk_create(to_create)
+        result.created["Skills"] += len(to_create)
+
+
+def ingest_resumes(records: Iterable[Tuple[Optional[str], Dict]]) -> IngestionResult:
+    """
+    Normalize processed resumes into Profile and its related tables.
+
+    Args:
+        records: (user_id, processed resume dict) pairs. A user's most
+            recent profile is updated in place; records without a user_id
+            (or users without a profile) create new profiles. When a user
+            appears more than once, the last record wins.
+
+    Returns:
+        IngestionResult: IDs of the profiles written and per-model counts
+    """
+    by_user: Dict[Optional[str], Dict] = {}
+    anonymous: List[Dict] = []
+    for user_id, data in records:
+        if not isinstance(data, dict) or data.get("processing_failed"):
+            continue
+        if user_id is None:
+            anonymous.append(data)
+        else:
+            by_user[str(user_id)] = data
+
+    result = IngestionResult()
+    if not by_user and not anonymous:
+        return result
+
+    with transaction.atomic():
+        # Latest profile per user in one query
+        profiles: Dict[str, Profile] = {}
+        for profile in Profile.objects.filter(user_id__in=list(by_user)).order_by("id"):
+            profiles[profile.user_id] = profile
+
+        changed, new_profiles, new_data = [], [], []
+        for user_id, data in by_user.items():
+            fields = map_profile(data)
+            profile = profiles.get(user_id)
+            if profile is None:
+                new_profiles.append(Profile(user_id=user_id, **fields))
+                new_data.append(data)
+            elif any(getattr(profile, name) != value for name, value in fields.items()):
+                for name, value in fields.items():
+                    setattr(profile, name, value)
+                profile.updated_at = timezone.now()  # auto_now is skipped by bulk_update
+                changed.append(profile)
+        for data in anonymous:
+            new_profiles.append(Profile(**map_profile(data)))
+            new_data.append(data)
+
+        if changed:
+            Profile.objects.bulk_update(changed, list(PROFILE_FIELDS) + ["updated_at"])
+            result.updated["Profile"] += len(changed)
+        if new_profiles:
+            Profile.objects.bulk_create(new_profiles)
+            result.created["Profile"] += len(new_profiles)
+
+        payloads = {profiles[user_id].id: data for user_id, data in by_user.items() if user_id in profiles}
+        payloads.update({profile.id: data for profile, data in zip(new_profiles, new_data)})
+
+        _sync_children(Experience, EXPERIENCE_FIELDS,
+                       {pid: map_experiences(data) for pid, data in payloads.items()}, result)
+        _sync_children(Education, EDUCATION_FIELDS,
+                       {pid: map_education(data) for pid, data in payloads.items()}, result)
+        _sync_skills({pid: map_skills(data) for pid, data in payloads.items()}, result)
+
+        result.profile_ids = list(payloads)
+        owners = {profile.id: profile.user_id for profile in list(profiles.values()) + new_profiles}
+
+        def invalidate():
+            # bulk operations bypass the signals that keep the profile cache coherent
+            for profile_id in result.profile_ids:
+                invalidate_profile(profile_id, owners.get(profile_id))
+
+        transaction.on_commit(invalidate)
+
+    return result
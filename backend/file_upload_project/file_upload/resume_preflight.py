@@ -0,0 +1,195 @@
+"""
+Resume Preflight Module
+Cheap checks that run before any PDF/DOCX parsing: magic-byte sniffing,
+size limits, PDF page counting and DOCX decompression limits. Untrusted or
+oversized files are rejected with an error code the views can return.
+"""
+
+import os
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+
+MAX_FILE_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+MAX_TEXT_CHARS = int(os.getenv("RESUME_MAX_CHARS", "50000"))
+MAX_UNCOMPRESSED_BYTES = int(os.getenv("RESUME_MAX_UNCOMPRESSED_BYTES", str(50 * 1024 * 1024)))
+MAX_COMPRESSION_RATIO = int(os.getenv("RESUME_MAX_COMPRESSION_RATIO", "100"))
+
+SCAN_CHUNK_SIZE = 256 * 1024
+SCAN_OVERLAP = 64
+
+# The PDF header may be preceded by junk within the first 1024 bytes
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+
+# Object boundaries, page and page-tree types, and /Count entries, in file order.
+# /Count also appears in outline (bookmark) dictionaries, so it is only
+# trusted inside an object that is a /Type /Pages node.
+_PDF_TOKEN = re.compile(
+    rb"(?P<end>endobj)"
+    rb"|(?P<obj>\d+\s+\d+\s+obj)(?![a-zA-Z])"
+    rb"|/Type\s*/(?P<type>Pages?)(?![a-zA-Z])"
+    rb"|/Count\s+(?P<count>\d+)"
+)
+
+
+class ResumeRejected(ValueError):
+    """
+    Raised when a resume fails preflight checks.
+
+    Attributes:
+        code: Stable machine-readable error code
+        http_status: Status code the API views should respond with
+    """
+
+    def __init__(self, message: str, code: str, http_status: int = 400):
+        super().__init__(message)
+        self.code = code
+        self.http_status = http_status
+
+
+@dataclass
+class PreflightReport:
+    """What preflight learned about a resume without parsing it"""
+    kind: str  # 'pdf' or 'docx'
+    size: int
+    page_count: Optional[int] = None
+    uncompressed_size: Optional[int] = None
+
+
+def sniff_kind(stream: BinaryIO) -> Optional[str]:
+    """Identify PDF or DOCX (zip) content from its leading bytes"""
+    stream.seek(0)
+    head = stream.read(1024)
+    stream.seek(0)
+    if head.startswith(ZIP_MAGIC):
+        return "docx"
+    if PDF_MAGIC in head:
+        return "pdf"
+    return None
+
+
+def count_pdf_pages(stream: BinaryIO) -> Optional[int]:
+    """
+    Estimate a PDF's page count by scanning its raw bytes in chunks.
+
+    Uses the largest /Count of a /Type /Pages node when the page tree is
+    stored uncompressed, otherwise counts /Type /Page objects. Returns None
+    when both are hidden inside compressed object streams.
+    """
+    max_count = 0
+    page_objects = 0
+    # Within the current object: is it a page tree node, and its largest /Count
+    in_pages = False
+    object_count = 0
+    stream.seek(0)
+    tail = b""
+    while True:
+        chunk = stream.read(SCAN_CHUNK_SIZE)
+        if not chunk:
+            break
+        window = tail + chunk
+        # Only count matches that start past the overlap to avoid double counting
+        offset = len(tail)
+        for match in _PDF_TOKEN.finditer(window):
+            if match.end() <= offset:
+                continue
+            if match.group("end") or match.group("obj"):
+                if in_pages:
+                    max_count = max(max_count, object_count)
+                in_pages, object_count = False, 0
+            elif match.group("type") == b"Pages":
+                in_pages = True
+            elif match.group("type"):
+                page_objects += 1
+            else:
+                object_count = max(object_count, int(match.group("count")))
+        tail = window[-SCAN_OVERLAP:]
+    if in_pages:
+        max_count = max(max_count, object_count)
+    stream.seek(0)
+    return max_count or page_objects or None
+
+
+def inspect_docx(stream: BinaryIO) -> int:
+    """
+    Check a DOCX zip's central directory without decompressing any part.
+
+    Returns:
+        int: Total uncompressed size of all parts
+    Raises:
+        ResumeRejected: If the zip is corrupt, not a Word document, or could
+            decompress beyond the configured limits
+    """
+    try:
+        with zipfile.ZipFile(stream) as archive:
+            infos = archive.infolist()
+    except zipfile.BadZipFile:
+        raise ResumeRejected("The DOCX file is corrupt.", "corrupt_file")
+    finally:
+        stream.seek(0)
+
+    if not any(info.filename == "word/document.xml" for info in infos):
+        raise ResumeRejected("The file is not a Word document.", "unsupported_type", 415)
+
+    total = sum(info.file_size for info in infos)
+    if total > MAX_UNCOMPRESSED_BYTES:
+        raise ResumeRejected("The DOCX file expands beyond the allowed size.", "decompression_limit", 413)
+    for info in infos:
+        ratio = info.file_size / max(info.compress_size, 1)
+        if info.file_size > 1024 * 1024 and ratio > MAX_COMPRESSION_RATIO:
+            raise ResumeRejected("The DOCX file has a suspicious compression ratio.", "decompression_limit", 413)
+    return total
+
+
+def preflight_resume(stream: BinaryIO, filename: str) -> PreflightReport:
+    """
+    Validate a resume stream before handing it to pdfplumber/python-docx.
+
+    Args:
+        stream: Seekable binary stream positioned anywhere
+        filename: Original filename, used only for the allowed extensions
+
+    Returns:
+        PreflightReport: Detected type (from magic bytes) and size figures
+    Raises:
+        ResumeRejected: With code unsupported_type, empty_file, file_too_large,
+            too_many_pages, decompression_limit or corrupt_file
+    """
+    if not filename.lower().endswith((".pdf", ".docx")):
+        raise ResumeRejected("Unsupported file format. Only PDF and DOCX files are supported.", "unsupported_type", 415)
+
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(0)
+    if size == 0:
+        raise ResumeRejected("The uploaded file is empty.", "empty_file")
+    if size > MAX_FILE_BYTES:
+        raise ResumeRejected(
+            f"The file is larger than {MAX_FILE_BYTES // (1024 * 1024)}MB.", "file_too_large", 413
+        )
+
+    # The content decides the parser; a mislabeled extension is not trusted
+    kind = sniff_kind(stream)
+    if kind is None:
+        raise ResumeRejected("The file content is not a PDF or DOCX document.", "unsupported_type", 415)
+
+    report = PreflightReport(kind=kind, size=size)
+    if kind == "pdf":
+        report.page_count = count_pdf_pages(stream)
+        if report.page_count and report.page_count > MAX_PAGES:
+            raise ResumeRejected(
+                f"The resume has {report.page_count} pages; at most {MAX_PAGES} are allowed.",
+                "too_many_pages",
+                413,
+            )
+    else:
+        report.uncompressed_size = inspect_docx(stream)
+    return report
+
+
+def limit_text(text: str) -> str:
+    """Truncate extracted text to the configured character limit"""
+    return text[:MAX_TEXT_CHARS]
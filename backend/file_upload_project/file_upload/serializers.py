@@ -1,4 +1,4 @@
-from rest_framework.serializers import Serializer, ModelSerializer, URLField, FileField
+from rest_framework.serializers import Serializer, ModelSerializer, URLField, FileField, BooleanField
 from .models import UploadedFile, Resume
 import json
 
@@ -24,6 +24,8 @@ class ResumeSerializer(ModelSerializer):
 
 class JobPostingSerializer(Serializer):
     job_posting_url = URLField(max_length=500)
+    # Raw HTML is only returned when explicitly requested
+    include_html = BooleanField(required=False, default=False)
 
 
 class AnalysisSerializer(Serializer):
@@ -0,0 +1,52 @@
+"""
+Signal handlers that keep the profile cache (profile_cache.py) and the
+resume embedding index (embeddings.py) coherent.
+Registered from fileUploadConfig.ready().
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import embeddings
+from .models import Education, Experience, Profile, Skills, UploadedFile
+from .profile_cache import invalidate_profile
+
+
+@receiver(pre_save, sender=Profile)
+def remember_profile_owner(sender, instance, **kwargs):
+    # The owner lookup is cached per user, so a change of owner must also drop the old user's entry
+    instance._previous_user_id = (
+        Profile.objects.filter(pk=instance.pk).values_list("user_id", flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    invalidate_profile(instance.id, instance.user_id)
+    previous_user_id = getattr(instance, "_previous_user_id", None)
+    if previous_user_id and previous_user_id != instance.user_id:
+        invalidate_profile(instance.id, previous_user_id)
+
+
+@receiver([post_save, post_delete], sender=Experience)
+@receiver([post_save, post_delete], sender=Education)
+@receiver([post_save, post_delete], sender=Skills)
+def invalidate_related_profile_cache(sender, instance, **kwargs):
+    invalidate_profile(instance.profile_id)
+
+
+@receiver(post_save, sender=UploadedFile)
+def index_resume_embedding(sender, instance, **kwargs):
+    if not embeddings.EMBEDDING_INDEX_ENABLED or not instance.processed_content:
+        return
+    resume_id, content = instance.id, instance.get_processed_content()
+    transaction.on_commit(lambda: embeddings.schedule_resume(resume_id, content))
+
+
+@receiver(post_delete, sender=UploadedFile)
+def forget_resume_embedding(sender, instance, **kwargs):
+    if embeddings.EMBEDDING_INDEX_ENABLED:
+        resume_id = instance.id
+        transaction.on_commit(lambda: embeddings.forget_resume(resume_id))
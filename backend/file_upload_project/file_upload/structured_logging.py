@@ -0,0 +1,142 @@
+"""
+Structured Logging Module
+Logging helpers for the request path, wired up through settings.LOGGING.
+
+    logger.debug("Raw API response: %s", LazyPayload(result), extra=event("llm.response", purpose="job"))
+
+LazyPayload defers serialization until a handler actually emits the record,
+so a DEBUG payload under an INFO logger costs one isEnabledFor() check, and
+even when emitted it is compact JSON truncated to LOG_MAX_PAYLOAD_CHARS.
+
+Filters and formatter for the LOGGING dict:
+    SamplingFilter  - keeps a configured fraction of each event below WARNING
+    RedactionFilter - masks emails and phone numbers, caps message size
+    JSONFormatter   - one JSON object per line for log aggregation
+"""
+
+import json
+import logging
+import os
+import random
+import re
+from typing import Dict, Optional
+
+
+LOG_MAX_PAYLOAD_CHARS = int(os.getenv("LOG_MAX_PAYLOAD_CHARS", "2000"))
+LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "4000"))
+# Comma-separated event=rate pairs, e.g. "llm.response=0.01,llm.prompt=0,*=1"
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?<!\d)(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)")
+
+# LogRecord attributes that are not user-supplied extras
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def truncate(text: str, limit: int = LOG_MAX_PAYLOAD_CHARS) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… [{len(text) - limit} more chars]"
+
+
+class LazyPayload:
+    """Log argument that serializes a structure (or text) only when formatted"""
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: int = LOG_MAX_PAYLOAD_CHARS):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        if isinstance(self.value, str):
+            return truncate(self.value, self.limit)
+        try:
+            text = json.dumps(self.value, separators=(",", ":"), ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            text = repr(self.value)
+        return truncate(text, self.limit)
+
+
+def event(name: str, **fields) -> Dict:
+    """`extra` for a log call: names the event for sampling and adds fields to JSON output"""
+    return {"event": name, **fields}
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    rates = {}
+    for pair in spec.split(","):
+        name, _, rate = pair.partition("=")
+        if name.strip() and rate.strip():
+            try:
+                rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+            except ValueError:
+                continue
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of records per event name. A rate for 'llm' also covers
+    'llm.response'; '*' sets the default. WARNING and above are never dropped.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rates = parse_sample_rates(LOG_SAMPLE_RATES) if rates is None else dict(rates)
+        self.default = self.rates.pop("*", 1.0)
+        self._resolved: Dict[Optional[str], float] = {}
+
+    def rate_for(self, name: Optional[str]) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = self.default
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(getattr(record, "event", None))
+        return rate >= 1.0 or random.random() < rate
+
+
+def redact(text: str) -> str:
+    return PHONE_RE.sub("[PHONE]", EMAIL_RE.sub("[EMAIL]", text))
+
+
+class RedactionFilter(logging.Filter):
+    """
+    Mask emails and phone numbers in the formatted message and cap its size.
+    Attach after SamplingFilter so dropped records are never formatted.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = truncate(redact(record.getMessage()), LOG_MAX_MESSAGE_CHARS)
+        record.args = None
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One compact JSON object per record, with any `extra` fields inlined"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "pid": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str)
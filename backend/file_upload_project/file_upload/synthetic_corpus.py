@@ -0,0 +1,600 @@
+"""
+Synthetic Corpus Module
+Deterministic, PII-free stand-ins for real resumes and job postings, for the
+micro-benchmarks and load tests. Everything is derived from a random.Random
+passed in by the caller, so the same seed always yields byte-identical
+documents; write_corpus() seeds each document separately, so a document
+does not change when the corpus size does.
+
+Resumes come in three layouts (single column, two columns, and a narrow
+sidebar beside the main column), optionally with tables, at a chosen page
+count and PII density. The PII covers every phone format the anonymizer's
+phone_patterns match, street addresses and ZIP codes, emails, and names
+with titles, and each document records the values it contains so
+anonymizer recall can be checked. Job postings are HTML pages with or
+without schema.org JSON-LD, and with or without heavy boilerplate.
+
+PDFs are written directly (uncompressed content streams, standard Helvetica
+font) so no PDF library is needed; DOCX files are built with python-docx.
+"""
+
+import io
+import json
+import os
+import random
+import textwrap
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+FIRST_NAMES = ("Jordan", "Avery", "Riley", "Morgan", "Casey", "Taylor", "Quinn", "Harper", "Rowan", "Elliot")
+LAST_NAMES = ("Nguyen", "Okafor", "Schmidt", "Castillo", "Haddad", "Kowalski", "Tanaka", "Moreau", "Singh", "Larsen")
+TITLES = ("Mr.", "Ms.", "Mrs.", "Dr.")
+STREET_NAMES = ("Maple", "Oak", "Pine", "Cedar", "Elm", "Birch", "Harbor", "Lincoln", "Sunset", "Mill")
+# Every suffix the anonymizer's address pattern recognises
+STREET_SUFFIXES = (
+    "Street", "St", "Avenue", "Ave", "Road", "Rd", "Boulevard", "Blvd", "Drive", "Dr",
+    "Lane", "Ln", "Court", "Ct", "Circle", "Cir", "Way", "Place", "Pl",
+)
+CITIES = (("Springfield", "IL"), ("Riverside", "CA"), ("Fairview", "TX"), ("Madison", "WI"), ("Salem", "OR"))
+EMAIL_DOMAINS = ("example.com", "example.org", "mail.example.net")
+# One per phone_patterns entry, then the variants only the optional-+1 pattern matches
+PHONE_FORMATS = (
+    "{a}-{e}-{l}",
+    "({a}) {e}-{l}",
+    "{a}.{e}.{l}",
+    "{a} {e} {l}",
+    "+1 {a} {e} {l}",
+    "+1-{a}-{e}-{l}",
+    "1 ({a}) {e}.{l}",
+    "+1({a}){e}{l}",
+)
+COMPANIES = ("Northwind Analytics", "Contoso Labs", "Fabrikam Health", "Tailspin Logistics", "Litware Systems")
+JOB_TITLES = ("Software Engineer", "Data Analyst", "Product Manager", "DevOps Engineer", "QA Engineer")
+DEGREES = ("B.S. Computer Science", "B.A. Economics", "M.S. Data Science", "B.Eng. Electrical Engineering")
+SKILLS = (
+    "Python", "Django", "PostgreSQL", "Docker", "Kubernetes", "React", "TypeScript", "AWS", "Redis",
+    "GraphQL", "Terraform", "Pandas", "Airflow", "Go", "Java", "CI/CD", "REST APIs", "Linux",
+)
+WORDS = (
+    "built", "designed", "migrated", "reduced", "improved", "automated", "led", "shipped", "scaled",
+    "service", "pipeline", "latency", "throughput", "platform", "team", "customers", "reporting",
+    "infrastructure", "deployment", "tests", "dashboards", "queries", "costs", "reliability", "features",
+    "across", "with", "for", "by", "the", "a", "new", "internal", "critical", "daily", "weekly",
+)
+SECTIONS = ("Summary", "Experience", "Projects", "Education", "Skills", "Certifications")
+
+LAYOUTS = ("single", "two_column", "sidebar")
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Letter page, 10pt Helvetica on 12pt leading
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN, LEADING, FONT_SIZE = 54, 12, 10
+LINES_PER_COLUMN = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+GUTTER = 18
+# Wide enough for the longest generated email on one row
+SIDEBAR_WIDTH = 180
+
+
+# --- PII values -----------------------------------------------------------
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def titled_name(rng: random.Random) -> str:
+    return f"{rng.choice(TITLES)} {person_name(rng)}"
+
+
+def email_address(rng: random.Random, name: Optional[str] = None) -> str:
+    first, last = (name or person_name(rng)).lower().split()[-2:]
+    return f"{first}.{last}{rng.randint(1, 99)}@{rng.choice(EMAIL_DOMAINS)}"
+
+
+def phone_number(rng: random.Random, fmt: Optional[str] = None) -> str:
+    area, exchange, line = rng.randint(200, 989), rng.randint(200, 999), rng.randint(0, 9999)
+    return (fmt or rng.choice(PHONE_FORMATS)).format(a=area, e=exchange, l=f"{line:04d}")
+
+
+def zip_code(rng: random.Random) -> str:
+    code = f"{rng.randint(10000, 99999)}"
+    return f"{code}-{rng.randint(0, 9999):04d}" if rng.random() < 0.3 else code
+
+
+def street_address(rng: random.Random) -> str:
+    city, state = rng.choice(CITIES)
+    return (f"{rng.randint(1, 9999)} {rng.choice(STREET_NAMES)} {rng.choice(STREET_SUFFIXES)}, "
+            f"{city}, {state} {zip_code(rng)}")
+
+
+PII_GENERATORS = {
+    "email": email_address,
+    "phone": phone_number,
+    "address": street_address,
+    "name": titled_name,
+}
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+# --- Resumes --------------------------------------------------------------
+
+@dataclass
+class ResumeContent:
+    """
+    Text of one resume. Blocks are either a line of text or a table (a list
+    of rows); sidebar blocks go in the narrow column of the sidebar layout
+    and lead the main flow in the others. pii lists every (type, value)
+    placed in the text.
+    """
+    sidebar: List = field(default_factory=list)
+    main: List = field(default_factory=list)
+    pii: List[Tuple[str, str]] = field(default_factory=list)
+
+    def lines(self) -> List[str]:
+        """All text, tables flattened to one line per row"""
+        return [row if isinstance(row, str) else " | ".join(row) for row in _flatten(self.sidebar + self.main)]
+
+
+def _flatten(blocks: List) -> List:
+    out = []
+    for block in blocks:
+        if isinstance(block, str):
+            out.append(block)
+        else:
+            out.extend(block)
+    return out
+
+
+def _draw_pii(rng: random.Random, kind: Optional[str] = None) -> Tuple[str, str]:
+    kind = kind or rng.choice(tuple(PII_GENERATORS))
+    return kind, PII_GENERATORS[kind](rng)
+
+
+def _pii(rng: random.Random, content: ResumeContent, kind: Optional[str] = None) -> str:
+    kind, value = _draw_pii(rng, kind)
+    content.pii.append((kind, value))
+    return value
+
+
+def _wrap(line: str, width: Optional[int], keep: Sequence[str] = ()) -> List[str]:
+    """
+    Rows of at most `width` characters, broken at spaces but never inside a
+    `keep` value that fits on one row. No width keeps the line whole.
+    """
+    if not width or len(line) <= width:
+        return [line]
+    for value in keep:
+        if len(value) <= width:
+            line = line.replace(value, value.replace(" ", "\x00"))
+    rows = textwrap.wrap(line, width, break_long_words=False, break_on_hyphens=False)
+    return [row.replace("\x00", " ") for row in rows]
+
+
+def _table(rng: random.Random, kind: str) -> List[List[str]]:
+    if kind == "skills":
+        rows = [["Skill", "Years", "Level"]]
+        rows += [[s, str(rng.randint(1, 12)), rng.choice(("Expert", "Advanced", "Intermediate"))]
+                 for s in rng.sample(SKILLS, rng.randint(4, 8))]
+    else:
+        rows = [["Company", "Title", "Dates"]]
+        rows += [[rng.choice(COMPANIES), rng.choice(JOB_TITLES), f"{y} - {y + rng.randint(1, 4)}"]
+                 for y in sorted(rng.sample(range(2008, 2022), rng.randint(2, 5)))]
+    return rows
+
+
+def resume_content(
+    rng: random.Random,
+    main_lines: int,
+    pii_density: float = 0.05,
+    tables: int = 0,
+    sidebar: bool = False,
+    widths: Optional[Dict[str, int]] = None,
+) -> ResumeContent:
+    """
+    Generate resume text.
+
+    Args:
+        rng: Source of randomness
+        main_lines: Rows (table rows included) in the main flow, exactly
+        pii_density: Share of body lines that carry a PII value
+        tables: Skills/experience tables to place in the main flow
+        sidebar: Put contact details and skills in the sidebar flow
+        widths: Characters per row of the "main" and "sidebar" flows, as the
+            PDF renderer lays them out; longer lines are wrapped onto several
+            rows so no text (or PII) is cut off. None keeps one row per line
+    """
+    widths = widths or {}
+    content = ResumeContent()
+    name = person_name(rng)
+    content.pii.append(("name", name))
+    contact = [_pii(rng, content, "email"), _pii(rng, content, "phone"), _pii(rng, content, "address")]
+    header = content.sidebar if sidebar else content.main
+    header.append(name)
+    if sidebar:
+        for line in ["Contact"] + contact + ["Skills"] + list(rng.sample(SKILLS, 8)):
+            header.extend(_wrap(line, widths.get("sidebar"), contact))
+    else:
+        header.extend(_wrap(" | ".join(contact), widths.get("main"), contact))
+
+    table_at = sorted(rng.sample(range(1, max(2, main_lines)), min(tables, max(1, main_lines - 1))))
+    # Stop at exactly main_lines, so a PDF fills the requested pages and no more
+    used = len(_flatten(content.main))
+    while used < main_lines:
+        if table_at and used >= table_at[0]:
+            table_at.pop(0)
+            table = _table(rng, rng.choice(("skills", "experience")))[:main_lines - used]
+            content.main.append(table)
+            used += len(table)
+            continue
+        section = rng.choice(SECTIONS)
+        content.main.append(section)
+        used += 1
+        for _ in range(rng.randint(3, 8)):
+            if used >= main_lines:
+                break
+            if section == "Skills":
+                line = ", ".join(rng.sample(SKILLS, 6))
+            elif section == "Education":
+                line = f"{rng.choice(DEGREES)}, State University, {rng.randint(2005, 2023)}"
+            elif section == "Experience" and rng.random() < 0.3:
+                line = f"{rng.choice(JOB_TITLES)}, {rng.choice(COMPANIES)}, {rng.randint(2012, 2024)} - Present"
+            else:
+                line = "- " + sentence(rng, rng.randint(8, 16))
+            pii = _draw_pii(rng) if rng.random() < pii_density else None
+            if pii:
+                line += f" Contact: {pii[1]}"
+            rows = _wrap(line, widths.get("main"), [pii[1]] if pii else ())[:main_lines - used]
+            # Only record a value that made it onto the page
+            if pii and pii[1] in " ".join(rows):
+                content.pii.append(pii)
+            content.main.extend(rows)
+            used += len(rows)
+    return content
+
+
+def resume_lines(rng: random.Random, line_count: int, pii_density: float = 0.05) -> List[str]:
+    """Plain resume lines, without tables or sidebar"""
+    return resume_content(rng, line_count, pii_density).lines()[:line_count]
+
+
+def resume_text(rng: random.Random, chars: int, pii_density: float = 0.05) -> str:
+    """Newline-joined resume lines of roughly `chars` characters"""
+    lines = resume_lines(rng, chars // 40 + 10, pii_density)
+    while sum(len(line) + 1 for line in lines) < chars:
+        lines += resume_lines(rng, 40, pii_density)[2:]
+    return "\n".join(lines)[:chars]
+
+
+# --- PDF rendering --------------------------------------------------------
+
+def _columns(layout: str) -> List[Tuple[int, int, str]]:
+    """(x, width, flow) for each column of a page"""
+    usable = PAGE_WIDTH - 2 * MARGIN
+    if layout == "two_column":
+        width = (usable - GUTTER) // 2
+        return [(MARGIN, width, "main"), (MARGIN + width + GUTTER, width, "main")]
+    if layout == "sidebar":
+        return [(MARGIN, SIDEBAR_WIDTH, "sidebar"),
+                (MARGIN + SIDEBAR_WIDTH + GUTTER, usable - SIDEBAR_WIDTH - GUTTER, "main")]
+    return [(MARGIN, usable, "main")]
+
+
+def _pdf_escape(text: str) -> bytes:
+    encoded = text.encode("latin-1", "replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _text_op(x: float, y: float, text: str, max_chars: int) -> bytes:
+    return b"BT /F1 %d Tf %.1f %.1f Td (" % (FONT_SIZE, x, y) + _pdf_escape(text[:max_chars]) + b") Tj ET"
+
+
+def _row_chars(width: float) -> int:
+    """Characters that fit in width points (average Helvetica glyph: half the font size)"""
+    return int(width / (FONT_SIZE * 0.5))
+
+
+def column_chars(layout: str) -> Dict[str, int]:
+    """Characters per row of each flow, for resume_content(widths=...)"""
+    return {flow: _row_chars(width) for _, width, flow in _columns(layout)}
+
+
+def _render_column(rows: List, x: int, width: int) -> bytes:
+    """rows: text lines or table rows (lists of cells), one per LEADING"""
+    ops = []
+    chars = _row_chars(width)
+    y = PAGE_HEIGHT - MARGIN
+    for row in rows:
+        if isinstance(row, str):
+            ops.append(_text_op(x, y, row, chars))
+        else:
+            cell_width = width / len(row)
+            for i, cell in enumerate(row):
+                ops.append(_text_op(x + i * cell_width + 2, y, cell, _row_chars(cell_width) - 1))
+            # Rule under the row, as table borders draw
+            ops.append(b"0.5 w %.1f %.1f m %.1f %.1f l S" % (x, y - 3, x + width, y - 3))
+        y -= LEADING
+    return b"\n".join(ops)
+
+
+def render_pdf(content: ResumeContent, layout: str = "single") -> bytes:
+    columns = _columns(layout)
+    flows = {"main": _flatten(content.main), "sidebar": _flatten(content.sidebar)}
+    if not any(flow == "sidebar" for _, _, flow in columns):
+        flows["main"] = flows.pop("sidebar") + flows["main"]
+    positions = {name: 0 for name in flows}
+
+    pages = []
+    while any(positions[name] < len(rows) for name, rows in flows.items()) or not pages:
+        ops = []
+        for x, width, flow in columns:
+            start = positions[flow]
+            rows = flows[flow][start:start + LINES_PER_COLUMN]
+            positions[flow] = start + len(rows)
+            if rows:
+                ops.append(_render_column(rows, x, width))
+        pages.append(b"\n".join(ops))
+    return build_pdf_pages(pages)
+
+
+def build_pdf_pages(streams: List[bytes]) -> bytes:
+    """A PDF with one page per content stream, using font /F1 (Helvetica)"""
+    # 1: catalog, 2: page tree, 3: font, then a page and a content stream per page
+    page_ids = [4 + 2 * i for i in range(len(streams))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % pid for pid in page_ids) + b"] /Count %d >>" % len(streams),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for page_id, stream in zip(page_ids, streams):
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_at = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at))
+    return out.getvalue()
+
+
+# --- DOCX rendering -------------------------------------------------------
+
+def _docx_blocks(container, blocks: List):
+    for block in blocks:
+        if isinstance(block, str):
+            if block in SECTIONS or block in ("Contact",):
+                container.add_paragraph(block, style="Heading 2")
+            else:
+                container.add_paragraph(block)
+        else:
+            table = container.add_table(rows=len(block), cols=len(block[0]))
+            table.style = "Table Grid"
+            for row, values in zip(table.rows, block):
+                for cell, value in zip(row.cells, values):
+                    cell.text = value
+
+
+def render_docx(content: ResumeContent, layout: str = "single") -> bytes:
+    """
+    single and two_column are flowing paragraphs (two section columns for
+    the latter); sidebar is the common template shape, a borderless
+    two-cell table holding the sidebar and main flows.
+    """
+    from docx import Document
+    from docx.oxml.ns import qn
+    from docx.shared import Inches
+
+    document = Document()
+    if layout == "two_column":
+        cols = document.sections[0]._sectPr.xpath("./w:cols")
+        if cols:
+            cols[0].set(qn("w:num"), "2")
+    if layout == "sidebar":
+        frame = document.add_table(rows=1, cols=2)
+        side, main = frame.rows[0].cells
+        side.width, main.width = Inches(2.1), Inches(4.4)
+        # The cells start with an empty paragraph; drop it so text starts at the top
+        for cell, blocks in ((side, content.sidebar), (main, content.main)):
+            cell._tc.remove(cell.paragraphs[0]._p)
+            _docx_blocks(cell, blocks)
+            if not cell.paragraphs:
+                cell.add_paragraph("")
+    else:
+        _docx_blocks(document, content.sidebar + content.main)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _main_lines(pages: int, layout: str) -> int:
+    main_columns = sum(1 for _, _, flow in _columns(layout) if flow == "main")
+    return pages * LINES_PER_COLUMN * main_columns
+
+
+def resume_pdf(rng: random.Random, pages: int, layout: str = "single", pii_density: float = 0.05,
+               tables: int = 0) -> bytes:
+    content = resume_content(rng, _main_lines(pages, layout), pii_density, tables,
+                             sidebar=layout == "sidebar", widths=column_chars(layout))
+    return render_pdf(content, layout)
+
+
+def resume_docx(rng: random.Random, pages: int, layout: str = "single", pii_density: float = 0.05,
+                tables: int = 0) -> bytes:
+    # About as much text as the PDF of the same page count
+    content = resume_content(rng, _main_lines(pages, layout), pii_density, tables, sidebar=layout == "sidebar")
+    return render_docx(content, layout)
+
+
+# --- Job postings ---------------------------------------------------------
+
+def job_posting(rng: random.Random) -> Dict:
+    """Structured fields of a posting, in the shape analyzeJobPosting extracts"""
+    low = rng.randrange(60, 160) * 1000
+    return {
+        "title": rng.choice(JOB_TITLES),
+        "company_name": rng.choice(COMPANIES),
+        "description": " ".join(sentence(rng, 20) for _ in range(4)),
+        "qualifications": [f"{rng.randint(2, 8)}+ years with {s}" for s in rng.sample(SKILLS, 5)],
+        "skills": rng.sample(SKILLS, 6),
+        "responsibilities": [sentence(rng) for _ in range(6)],
+        "salary_range": f"${low:,} - ${low + rng.randrange(10, 60) * 1000:,}",
+        "location": "{}, {}".format(*rng.choice(CITIES)),
+        "posted_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+    }
+
+
+def job_json_ld(job: Dict) -> str:
+    """schema.org JobPosting markup, as job boards embed for search engines"""
+    low, high = (int(v.strip(" $").replace(",", "")) for v in job["salary_range"].split("-"))
+    city, state = job["location"].split(", ")
+    return json.dumps({
+        "@context": "https://schema.org/",
+        "@type": "JobPosting",
+        "title": job["title"],
+        "description": job["description"],
+        "datePosted": job["posted_date"],
+        "hiringOrganization": {"@type": "Organization", "name": job["company_name"]},
+        "jobLocation": {"@type": "Place", "address": {
+            "@type": "PostalAddress", "addressLocality": city, "addressRegion": state, "addressCountry": "US",
+        }},
+        "baseSalary": {"@type": "MonetaryAmount", "currency": "USD", "value": {
+            "@type": "QuantitativeValue", "minValue": low, "maxValue": high, "unitText": "YEAR",
+        }},
+        "skills": ", ".join(job["skills"]),
+        "qualifications": " ".join(job["qualifications"]),
+        "responsibilities": " ".join(job["responsibilities"]),
+    })
+
+
+def _boilerplate(rng: random.Random, target_bytes: int) -> List[str]:
+    blocks, size = [], 0
+    while size < target_bytes:
+        block = rng.randrange(5)
+        if block == 0:
+            chunk = "<script>window.__STATE__=" + ",".join(str(rng.random()) for _ in range(200)) + ";</script>"
+        elif block == 1:
+            chunk = "<style>" + "".join(
+                f".c{rng.randint(0, 9999)}{{margin:{rng.randint(0, 9)}px}}" for _ in range(80)) + "</style>"
+        elif block == 2:
+            chunk = "<nav><ul>" + "".join(
+                f"<li><a href='/jobs/{rng.randint(0, 99999)}'>{rng.choice(JOB_TITLES)}</a></li>"
+                for _ in range(40)) + "</ul></nav>"
+        elif block == 3:
+            chunk = "<aside class='similar-jobs'>" + "".join(
+                f"<div class='card'><h3>{rng.choice(JOB_TITLES)}</h3><p>{rng.choice(COMPANIES)}</p>"
+                f"<p>{sentence(rng, 10)}</p></div>" for _ in range(12)) + "</aside>"
+        else:
+            chunk = "<footer>" + "".join(
+                f"<div class='legal'><p>{sentence(rng, 25)}</p></div>" for _ in range(10)) + "</footer>"
+        blocks.append(chunk)
+        size += len(chunk)
+    return blocks
+
+
+def job_posting_html(
+    rng: random.Random,
+    target_bytes: int = 200_000,
+    json_ld: bool = False,
+    job: Optional[Dict] = None,
+) -> str:
+    """
+    A job posting page shaped like a real job board's. Navigation, inline
+    scripts and styles, similar-job cards and long footers pad the page to
+    about target_bytes; with target_bytes=0 it is the bare posting.
+    """
+    job = job or job_posting(rng)
+    posting = (
+        f"<h1>{job['title']}</h1><p class='company'>{job['company_name']} - {job['location']}</p>"
+        f"<p class='salary'>{job['salary_range']}</p><p class='posted'>Posted {job['posted_date']}</p>"
+        f"<h2>About the role</h2><p>{job['description']}</p>"
+        "<h2>Responsibilities</h2><ul>" + "".join(f"<li>{r}</li>" for r in job["responsibilities"]) + "</ul>"
+        "<h2>Qualifications</h2><ul>" + "".join(f"<li>{q}</li>" for q in job["qualifications"]) + "</ul>"
+        "<h2>Skills</h2><p>" + ", ".join(job["skills"]) + "</p>"
+    )
+    ld = f'<script type="application/ld+json">{job_json_ld(job)}</script>' if json_ld else ""
+    boilerplate = _boilerplate(rng, target_bytes - len(posting))
+    head = "".join(b for b in boilerplate if b.startswith(("<script", "<style")))
+    body = "".join(b for b in boilerplate if not b.startswith(("<script", "<style")))
+    return (
+        f"<!DOCTYPE html><html><head><title>{job['title']} - {job['company_name']}</title>{ld}{head}</head>"
+        f"<body><main>{posting}</main>{body}</body></html>"
+    )
+
+
+# --- Corpus on disk -------------------------------------------------------
+
+@dataclass
+class CorpusSpec:
+    seed: int = 0
+    resumes: int = 40
+    jobs: int = 20
+    formats: Sequence[str] = ("pdf", "docx")
+    layouts: Sequence[str] = LAYOUTS
+    min_pages: int = 1
+    max_pages: int = 20
+    pii_densities: Sequence[float] = (0.0, 0.02, 0.1, 0.3)
+    max_tables: int = 2
+    # Job pages: share with JSON-LD, and page sizes (0 for no boilerplate)
+    json_ld_share: float = 0.5
+    job_page_bytes: Sequence[int] = (0, 200_000, 1_000_000)
+
+
+def write_corpus(out_dir: str, spec: CorpusSpec) -> Dict:
+    """
+    Write resumes/ and jobs/ under out_dir, plus manifest.json describing
+    every file: its parameters, the PII it contains (resumes) and the
+    expected fields (job postings).
+
+    Returns:
+        dict: The manifest
+    """
+    os.makedirs(os.path.join(out_dir, "resumes"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "jobs"), exist_ok=True)
+    manifest = {"spec": asdict(spec), "resumes": [], "jobs": []}
+
+    for i in range(spec.resumes):
+        rng = random.Random(f"{spec.seed}:resume:{i}")
+        fmt = spec.formats[i % len(spec.formats)]
+        layout = rng.choice(spec.layouts)
+        pages = rng.randint(spec.min_pages, spec.max_pages)
+        density = rng.choice(spec.pii_densities)
+        tables = rng.randint(0, spec.max_tables)
+        content = resume_content(rng, _main_lines(pages, layout), density, tables, sidebar=layout == "sidebar",
+                                 widths=column_chars(layout) if fmt == "pdf" else None)
+        data = render_pdf(content, layout) if fmt == "pdf" else render_docx(content, layout)
+        name = f"resume_{i:04d}.{fmt}"
+        with open(os.path.join(out_dir, "resumes", name), "wb") as f:
+            f.write(data)
+        manifest["resumes"].append({
+            "file": f"resumes/{name}", "format": fmt, "layout": layout, "pages": pages,
+            "pii_density": density, "tables": tables, "bytes": len(data),
+            "pii": [{"type": kind, "value": value} for kind, value in content.pii],
+        })
+
+    for i in range(spec.jobs):
+        rng = random.Random(f"{spec.seed}:job:{i}")
+        job = job_posting(rng)
+        json_ld = rng.random() < spec.json_ld_share
+        html = job_posting_html(rng, rng.choice(spec.job_page_bytes), json_ld=json_ld, job=job)
+        name = f"job_{i:04d}.html"
+        with open(os.path.join(out_dir, "jobs", name), "w", encoding="utf-8") as f:
+            f.write(html)
+        manifest["jobs"].append({
+            "file": f"jobs/{name}", "json_ld": json_ld, "bytes": len(html.encode("utf-8")), "expected": job,
+        })
+
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase
+
+from file_upload.benchmarks import compare
+
+
+def report(**benchmarks):
+    return {"benchmarks": {name: {"median_ms": ms, "peak_kb": kb} for name, (ms, kb) in benchmarks.items()}}
+
+
+class CompareTests(SimpleTestCase):
+    def test_flags_time_and_memory_regressions(self):
+        baseline = report(extract=(10.0, 1000), prompt=(1.0, 100))
+        current = report(extract=(13.0, 1000), prompt=(1.0, 400))
+        regressions = compare(current, baseline, max_time_pct=20, max_memory_pct=50)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("extract: median"))
+        self.assertTrue(regressions[1].startswith("prompt: peak memory"))
+
+    def test_ignores_noise_and_new_benchmarks(self):
+        baseline = report(tiny=(0.01, 10))
+        # +300% but below the absolute noise floors
+        current = report(tiny=(0.04, 60), new=(100.0, 10000))
+        self.assertEqual(compare(current, baseline, max_time_pct=10, max_memory_pct=10), [])
+        self.assertEqual(compare(current, {}, max_time_pct=10, max_memory_pct=10), [])
+
+    def test_within_budget(self):
+        baseline = report(extract=(10.0, 1000))
+        current = report(extract=(11.0, 1100))
+        self.assertEqual(compare(current, baseline, max_time_pct=20, max_memory_pct=20), [])
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from file_upload import content_storage
+from file_upload.content_storage import PACKED_KEY, pack_processed_content, unpack_processed_content
+
+
+CONTENT = {
+    "name": "Jane Doe",
+    "skills": ["Python", "SQL"],
+    "work_experience": [{"jobTitle": "Engineer", "jobDescription": "Built things. " * 50}],
+    "_anonymization_report": {"total_items": 3, "types": {"EMAIL": 2, "PHONE": 1}, "items": ["secret"]},
+}
+
+
+class ContentStorageTests(SimpleTestCase):
+    def test_uncompressed_reduces_report(self):
+        with mock.patch.object(content_storage, "COMPRESSION", "none"):
+            packed = pack_processed_content(CONTENT)
+        self.assertNotIn("_anonymization_report", packed)
+        self.assertEqual(packed["pii_items_anonymized"], 3)
+        self.assertEqual(packed["pii_types"], {"EMAIL": 2, "PHONE": 1})
+        self.assertNotIn(PACKED_KEY, packed)
+        self.assertEqual(unpack_processed_content(packed), packed)
+
+    def test_compressed_round_trip(self):
+        with mock.patch.multiple(content_storage, COMPRESSION="zlib", COMPRESS_MIN_BYTES=64):
+            packed = pack_processed_content(CONTENT)
+        self.assertEqual(packed[PACKED_KEY]["codec"], "zlib")
+        self.assertEqual(packed["name"], "Jane Doe")
+        self.assertEqual(packed["skills"], ["Python", "SQL"])
+        self.assertNotIn("work_experience", packed)
+
+        unpacked = unpack_processed_content(packed)
+        self.assertEqual(unpacked["work_experience"], CONTENT["work_experience"])
+        self.assertEqual(unpacked["pii_items_anonymized"], 3)
+        self.assertNotIn(PACKED_KEY, unpacked)
+
+    def test_small_content_is_not_compressed(self):
+        with mock.patch.multiple(content_storage, COMPRESSION="zlib", COMPRESS_MIN_BYTES=1 << 20):
+            self.assertNotIn(PACKED_KEY, pack_processed_content(CONTENT))
+
+    def test_legacy_values(self):
+        self.assertIsNone(pack_processed_content(None))
+        self.assertEqual(unpack_processed_content(None), {})
+        self.assertEqual(unpack_processed_content('{"name": "A"}'), {"name": "A"})
+        self.assertEqual(unpack_processed_content("plain text"), {"raw_content": "plain text"})
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            unpack_processed_content({PACKED_KEY: {"codec": "lz4", "data": ""}})
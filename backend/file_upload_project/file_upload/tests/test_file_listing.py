@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from django.test import TestCase
+
+from file_upload.file_listing import InvalidCursor, decode_cursor, encode_cursor, list_files_page
+from file_upload.models import UploadedFile
+
+
+class CursorTests(TestCase):
+    def test_round_trip(self):
+        uploaded_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(uploaded_at, 42)), (uploaded_at, 42))
+
+    def test_invalid_cursor(self):
+        for cursor in ("not base64!", encode_cursor(datetime(2024, 1, 1), 1)[:-4], "bm9waXBl"):
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+    def test_pages_cover_every_file_once(self):
+        same_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        ids = []
+        for i in range(5):
+            f = UploadedFile.objects.create(file=f"uploads/{i}.pdf", user_id="u1")
+            f.set_processed_content({"name": f"Person {i}", "summary": "x" * 100})
+            f.save()
+            ids.append(f.id)
+        UploadedFile.objects.create(file="uploads/other.pdf", user_id="u2")
+        # Ties on uploaded_at are broken by id
+        UploadedFile.objects.filter(id__in=ids[:3]).update(uploaded_at=same_time)
+
+        seen, cursor = [], None
+        while True:
+            page = list_files_page("u1", cursor, page_size=2)
+            self.assertLessEqual(len(page.files), 2)
+            seen.extend(page.files)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        expected = list(UploadedFile.objects.filter(user_id="u1").order_by("-uploaded_at", "-id"))
+        self.assertEqual([f.id for f in seen], [f.id for f in expected])
+        self.assertEqual(seen[0].content_name, expected[0].get_processed_content()["name"])
+        self.assertEqual(len(list_files_page(None, page_size=100).files), 6)
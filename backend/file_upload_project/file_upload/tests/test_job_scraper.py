@@ -0,0 +1,58 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from file_upload.job_cache import get_cached_job, set_cached_job
+from file_upload.job_fetcher import JobPage
+from file_upload.job_scraper import JobScraper
+
+
+URL = "https://jobs.example.com/postings/1"
+
+
+class RefreshTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        set_cached_job(URL, {"title": "Stale"})
+        self.fetch = self.patch("fetch_job_page", return_value=JobPage(URL, 200, "OK", text="Backend Engineer"))
+        self.patch("analyzeJobPosting", return_value={"title": "Fresh"})
+        self.patch("API_KEY", "test-key")
+
+    def patch(self, name, *args, **kwargs):
+        patcher = mock.patch(f"file_upload.utils.{name}", *args, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def scrape(self, **kwargs):
+        return list(JobScraper(min_interval=0, dns_ttl=0, **kwargs).scrape([URL]))
+
+    def test_cached_urls_are_not_fetched(self):
+        [result] = self.scrape()
+        self.assertEqual(result.job_details, {"title": "Stale"})
+        self.fetch.assert_not_called()
+
+    def test_refresh_fetches_and_overwrites_the_cache(self):
+        [result] = self.scrape(refresh=True)
+        self.assertEqual(result.job_details, {"title": "Fresh"})
+        self.fetch.assert_called_once()
+        self.assertEqual(get_cached_job(URL), {"title": "Fresh"})
+
+    def test_without_cache_nothing_is_written(self):
+        self.scrape(use_cache=False)
+        self.fetch.assert_called_once()
+        self.assertEqual(get_cached_job(URL), {"title": "Stale"})
+
+    def test_warm_job_cache_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(f"# saved search\n  # indented comment\n\n  {URL}  \n{URL}\n")
+        self.addCleanup(os.remove, f.name)
+        out = StringIO()
+        call_command("warm_job_cache", "--file", f.name, "--refresh", "--min-interval", "0", stdout=out)
+        self.fetch.assert_called_once()
+        self.assertEqual(get_cached_job(URL), {"title": "Fresh"})
+        self.assertIn("Warmed 1 job postings, 0 failed", out.getvalue())
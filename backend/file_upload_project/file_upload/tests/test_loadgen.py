@@ -0,0 +1,39 @@
+from django.test import SimpleTestCase
+
+from file_upload.loadgen import compare, parse_mix, percentile
+
+
+def report(**scenarios):
+    return {"results": {"scenarios": {
+        name: {"latency_ms": {"p50": p50, "p95": p95, "p99": p99}, "error_rate": error_rate}
+        for name, (p50, p95, p99, error_rate) in scenarios.items()
+    }}}
+
+
+class CompareTests(SimpleTestCase):
+    def test_flags_latency_and_error_rate(self):
+        baseline = report(upload=(100, 200, 300, 0.0), analysis=(1000, 2000, 3000, 0.01))
+        current = report(upload=(100, 260, 300, 0.0), analysis=(1000, 2100, 3000, 0.05))
+        self.assertEqual(compare(current, baseline, max_regression_pct=20), [
+            "upload p95 200ms -> 260ms (+30%)",
+            "analysis error rate 1.00% -> 5.00%",
+        ])
+
+    def test_skips_missing_scenarios_and_percentiles(self):
+        baseline = report(upload=(100, None, 300, 0.0))
+        current = report(upload=(100, 900, 300, 0.0), job=(5000, 5000, 5000, 1.0))
+        self.assertEqual(compare(current, baseline, max_regression_pct=20), [])
+
+
+class HelperTests(SimpleTestCase):
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 50), 2.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 99), 4.0)
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix("upload=2, analysis"), {"upload": 2.0, "analysis": 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix("unknown=1")
+        with self.assertRaises(ValueError):
+            parse_mix("upload=0")
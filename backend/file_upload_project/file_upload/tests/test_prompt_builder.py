@@ -0,0 +1,57 @@
+import json
+
+from django.test import SimpleTestCase
+
+from file_upload.prompt_builder import build_analysis_inputs, compact_json, estimate_tokens
+
+
+RESUME = {
+    "name": "Jane Doe",
+    "contact_info": {"email": "jane@example.com"},
+    "skills": ["Python", "Django", "SQL"],
+    "work_experience": [{"jobTitle": "Engineer", "jobDescription": "Built APIs " * 200}],
+    "education": [{"institution": "State University", "highestDegree": "BSc"}],
+    "languages": [],
+    "_anonymization_report": {"total_items": 2},
+}
+
+JOB = {
+    "title": "Backend Engineer",
+    "company_name": "Acme",
+    "skills": ["Python", "PostgreSQL"],
+    "description": "Work on the platform. " * 300,
+    "responsibilities": ["Ship features"] * 40,
+    "location": None,
+}
+
+
+class BuildAnalysisInputsTests(SimpleTestCase):
+    def test_projects_relevant_fields(self):
+        resume_json, job_json = build_analysis_inputs(RESUME, JOB, token_budget=100000)
+        resume, job = json.loads(resume_json), json.loads(job_json)
+        self.assertNotIn("name", resume)
+        self.assertNotIn("contact_info", resume)
+        self.assertNotIn("_anonymization_report", resume)
+        self.assertNotIn("languages", resume)
+        self.assertNotIn("location", job)
+        self.assertEqual(resume["skills"], RESUME["skills"])
+        self.assertEqual(resume_json, compact_json(resume))
+
+    def test_fits_budget_and_keeps_skills(self):
+        resume_json, job_json = build_analysis_inputs(RESUME, JOB, token_budget=300)
+        self.assertLessEqual(estimate_tokens(resume_json) + estimate_tokens(job_json), 300)
+        self.assertEqual(json.loads(resume_json)["skills"], RESUME["skills"])
+        self.assertEqual(json.loads(job_json)["skills"], JOB["skills"])
+
+    def test_stays_valid_json_when_budget_cannot_be_met(self):
+        resume = dict(RESUME, skills=["skill %d " % i + "x" * 100 for i in range(50)])
+        resume_json, job_json = build_analysis_inputs(resume, JOB, token_budget=5)
+        self.assertIsInstance(json.loads(resume_json)["skills"], list)
+        self.assertIsInstance(json.loads(job_json), dict)
+
+    def test_failed_job_extraction_uses_scraped_text(self):
+        _, job_json = build_analysis_inputs(RESUME, {"status_code": 500, "full_text": " Posting text "})
+        self.assertEqual(json.loads(job_json), {"description": "Posting text"})
+
+    def test_missing_inputs(self):
+        self.assertEqual(build_analysis_inputs(None, "not a dict"), ("{}", "{}"))
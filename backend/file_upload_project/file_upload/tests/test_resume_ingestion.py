@@ -0,0 +1,78 @@
+from django.test import TestCase
+
+from file_upload.models import Education, Experience, Profile, Skills
+from file_upload.resume_ingestion import ingest_resumes, map_profile, map_skills
+
+
+def resume(**overrides):
+    data = {
+        "name": "Jane Q Doe",
+        "contact_info": {"email": "jane@example.com", "phone": "555-0100", "zipCode": "12345"},
+        "work_experience": [
+            {"jobTitle": "Engineer", "company": "Acme", "startDate": "2020", "endDate": "2023",
+             "jobDescription": "Built APIs"},
+            {"jobTitle": "Intern", "company": "Initech", "startDate": "2019", "endDate": "2019",
+             "jobDescription": "Fixed bugs"},
+        ],
+        "education": {"highestDegree": "BSc", "fieldOfStudy": "CS", "institution": "State",
+                      "graduationYear": "2019"},
+        "skills": ["Python", "SQL", "Python"],
+    }
+    data.update(overrides)
+    return data
+
+
+class MappingTests(TestCase):
+    def test_map_profile(self):
+        fields = map_profile(resume(contact_info="not a dict"))
+        self.assertEqual((fields["firstName"], fields["lastName"]), ("Jane", "Q Doe"))
+        self.assertEqual(fields["email"], "")
+
+    def test_map_skills(self):
+        self.assertEqual(map_skills(resume()), ["Python", "SQL"])
+        self.assertEqual(map_skills({"skills": " Go, Rust ,, "}), ["Go", "Rust"])
+
+
+class IngestResumesTests(TestCase):
+    def test_creates_profile_and_children(self):
+        result = ingest_resumes([("u1", resume()), (None, resume(name="Anon Person")),
+                                 ("u2", {"processing_failed": True})])
+        self.assertEqual(len(result.profile_ids), 2)
+        self.assertEqual(result.created["Profile"], 2)
+        profile = Profile.objects.get(user_id="u1")
+        self.assertEqual(profile.email, "jane@example.com")
+        self.assertEqual(profile.experiences.count(), 2)
+        self.assertEqual(profile.education.get().institution, "State")
+        self.assertEqual(profile.skills.get().skills, ["Python", "SQL"])
+        self.assertFalse(Profile.objects.filter(user_id="u2").exists())
+
+    def test_reingest_writes_only_changes(self):
+        ingest_resumes([("u1", resume())])
+        experience_ids = set(Experience.objects.values_list("id", flat=True))
+
+        result = ingest_resumes([("u1", resume())])
+        self.assertFalse(result.created or result.updated or result.deleted)
+
+        changed = resume(skills=["Python"], education=[])
+        changed["work_experience"][1] = dict(changed["work_experience"][1], endDate="2020")
+        # Savepoint and profiles, then per child table one select, a delete (collector
+        # select + DELETE) and one insert or update
+        with self.assertNumQueries(12):
+            result = ingest_resumes([("u1", changed)])
+        self.assertEqual(result.created, {"Experience": 1})
+        self.assertEqual(result.deleted, {"Experience": 1, "Education": 1})
+        self.assertEqual(result.updated, {"Skills": 1})
+        self.assertEqual(Profile.objects.count(), 1)
+        self.assertEqual(len(experience_ids & set(Experience.objects.values_list("id", flat=True))), 1)
+        self.assertFalse(Education.objects.exists())
+        self.assertEqual(Skills.objects.get().skills, ["Python"])
+
+    def test_profile_fields_update_in_place(self):
+        ingest_resumes([("u1", resume())])
+        result = ingest_resumes([("u1", resume(name="Janet Doe"))])
+        self.assertEqual(result.updated["Profile"], 1)
+        self.assertEqual(Profile.objects.get(user_id="u1").firstName, "Janet")
+
+    def test_last_record_per_user_wins(self):
+        ingest_resumes([("u1", resume(name="First Try")), ("u1", resume(name="Second Try"))])
+        self.assertEqual(Profile.objects.get(user_id="u1").firstName, "Second")
@@ -0,0 +1,76 @@
+import io
+import random
+import zipfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from file_upload import resume_preflight, synthetic_corpus
+from file_upload.resume_preflight import MAX_PAGES, ResumeRejected, count_pdf_pages, preflight_resume
+
+
+def _zip(names):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name in names:
+            archive.writestr(name, "<xml/>")
+    return buffer.getvalue()
+
+
+class PreflightResumeTests(SimpleTestCase):
+    def assertRejected(self, data, filename, code, http_status):
+        with self.assertRaises(ResumeRejected) as ctx:
+            preflight_resume(io.BytesIO(data), filename)
+        self.assertEqual(ctx.exception.code, code)
+        self.assertEqual(ctx.exception.http_status, http_status)
+
+    def test_pdf_page_count(self):
+        pdf = synthetic_corpus.resume_pdf(random.Random(0), 2)
+        report = preflight_resume(io.BytesIO(pdf), "resume.pdf")
+        self.assertEqual((report.kind, report.size, report.page_count), ("pdf", len(pdf), 2))
+
+    def test_too_many_pages(self):
+        pdf = synthetic_corpus.resume_pdf(random.Random(0), MAX_PAGES + 1)
+        self.assertRejected(pdf, "resume.pdf", "too_many_pages", 413)
+
+    def test_outline_count_is_not_a_page_count(self):
+        pdf = synthetic_corpus.resume_pdf(random.Random(0), 2)
+        outline = b"90 0 obj\n<< /Type /Outlines /First 91 0 R /Count %d >>\nendobj\n" % (MAX_PAGES + 30)
+        pdf = pdf.replace(b"1 0 obj", outline + b"1 0 obj", 1)
+        self.assertEqual(preflight_resume(io.BytesIO(pdf), "resume.pdf").page_count, 2)
+
+    def test_page_tree_count_in_any_key_order(self):
+        pdf = (b"%PDF-1.4\n1 0 obj\n<< /Count 3 /Kids [4 0 R] /Type /Pages >>\nendobj\n"
+               b"2 0 obj << /Count 40 >> endobj\n")
+        self.assertEqual(count_pdf_pages(io.BytesIO(pdf)), 3)
+
+    def test_page_count_across_chunks(self):
+        pdf = synthetic_corpus.resume_pdf(random.Random(0), 5)
+        with mock.patch.object(resume_preflight, "SCAN_CHUNK_SIZE", 97):
+            self.assertEqual(count_pdf_pages(io.BytesIO(pdf)), 5)
+        # Page objects alone, as when the page tree is not visible
+        without_tree = pdf.replace(b"/Type /Pages", b"/Type /Other")
+        self.assertEqual(count_pdf_pages(io.BytesIO(without_tree)), 5)
+
+    def test_docx(self):
+        docx = synthetic_corpus.resume_docx(random.Random(0), 1)
+        report = preflight_resume(io.BytesIO(docx), "resume.docx")
+        self.assertEqual(report.kind, "docx")
+        self.assertGreater(report.uncompressed_size, 0)
+
+    def test_content_decides_kind_over_extension(self):
+        docx = synthetic_corpus.resume_docx(random.Random(0), 1)
+        self.assertEqual(preflight_resume(io.BytesIO(docx), "resume.pdf").kind, "docx")
+        self.assertRejected(b"just some text", "resume.pdf", "unsupported_type", 415)
+
+    def test_rejections(self):
+        self.assertRejected(b"%PDF-1.4", "resume.txt", "unsupported_type", 415)
+        self.assertRejected(b"", "resume.pdf", "empty_file", 400)
+        self.assertRejected(_zip(["xl/workbook.xml"]), "resume.docx", "unsupported_type", 415)
+        self.assertRejected(b"PK\x03\x04 truncated", "resume.docx", "corrupt_file", 400)
+
+    def test_decompression_limit(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("word/document.xml", b"\0" * (4 * 1024 * 1024))
+        self.assertRejected(buffer.getvalue(), "resume.docx", "decompression_limit", 413)
@@ -0,0 +1,86 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from file_upload import throttling
+from file_upload.throttling import CacheCounterStore, SQLiteCounterStore, WeightedUserThrottle
+
+
+class BudgetThrottle(WeightedUserThrottle):
+    rate = "10/hour"
+    cost = 4
+
+
+class CheapThrottle(BudgetThrottle):
+    cost = 2
+
+
+def _request(user_id):
+    return SimpleNamespace(user=SimpleNamespace(is_authenticated=True, pk=user_id), META={})
+
+
+class CounterStoreTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def stores(self):
+        return [CacheCounterStore(), SQLiteCounterStore(os.path.join(self.tmpdir.name, "counters.sqlite3"))]
+
+    def test_incr_and_decr(self):
+        for store in self.stores():
+            with self.subTest(store=type(store).__name__):
+                self.assertEqual(store.incr("k", 3, 60), 3)
+                self.assertEqual(store.incr("k", 2, 60), 5)
+                store.decr("k", 2)
+                self.assertEqual(store.incr("k", 1, 60), 4)
+                self.assertEqual(store.incr("other", 1, 60), 1)
+
+    def test_decr_of_missing_key(self):
+        for store in self.stores():
+            with self.subTest(store=type(store).__name__):
+                store.decr("missing", 1)
+
+
+class FixedWindowThrottleTests(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        store = SQLiteCounterStore(os.path.join(tmpdir.name, "counters.sqlite3"))
+        patcher = mock.patch.object(throttling, "get_counter_store", return_value=store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def allow(self, user_id=1, now=1000.0):
+        throttle = BudgetThrottle()
+        throttle.timer = lambda: now
+        return throttle.allow_request(_request(user_id), None), throttle
+
+    def test_cost_weighted_budget(self):
+        self.assertTrue(self.allow()[0])
+        self.assertTrue(self.allow()[0])
+        allowed, throttle = self.allow()
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 3600 - 1000)
+        self.assertTrue(self.allow(user_id=2)[0])
+
+    def test_rejections_do_not_consume_budget(self):
+        self.allow()
+        self.allow()
+        for _ in range(5):
+            self.assertFalse(self.allow()[0])
+        # 8 of 10 units used; a cheaper view still fits
+        cheap = CheapThrottle()
+        cheap.timer = lambda: 1000.0
+        self.assertTrue(cheap.allow_request(_request(1), None))
+
+    def test_new_window_resets(self):
+        self.allow()
+        self.allow()
+        self.assertFalse(self.allow()[0])
+        self.assertTrue(self.allow(now=3600.0)[0])
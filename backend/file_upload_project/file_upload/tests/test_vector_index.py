@@ -0,0 +1,80 @@
+import tempfile
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from file_upload import vector_index
+from file_upload.vector_index import VectorIndex, normalize
+
+
+class VectorIndexTests(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.index = VectorIndex(tmpdir.name, "test")
+        self.rng = np.random.default_rng(0)
+        self.vectors = self.rng.normal(size=(50, 8)).astype(np.float32)
+        self.ids = [f"v{i}" for i in range(50)]
+        self.index.add(self.ids, self.vectors, [{"n": i} for i in range(50)], model="m")
+
+    def brute_force(self, query, ids, vectors, k):
+        scores = normalize(vectors) @ normalize(query)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [ids[i] for i in order]
+
+    def test_search_matches_brute_force(self):
+        queries = self.rng.normal(size=(3, 8))
+        # Small chunks exercise the running top-k merge
+        with mock.patch.object(vector_index, "SEARCH_CHUNK_ROWS", 7):
+            results = self.index.search(queries, k=5)
+        for query, hits in zip(queries, results):
+            self.assertEqual([id_ for id_, _ in hits], self.brute_force(query, self.ids, self.vectors, 5))
+            self.assertEqual(hits, sorted(hits, key=lambda hit: -hit[1]))
+
+    def test_search_restricted_to_ids(self):
+        query = self.rng.normal(size=8)
+        subset = ["v3", "v10", "v20", "unknown"]
+        hits = self.index.search(query, k=10, ids=subset)[0]
+        self.assertEqual([id_ for id_, _ in hits],
+                         self.brute_force(query, subset[:3], self.vectors[[3, 10, 20]], 10))
+        self.assertEqual(self.index.search(query, ids=["unknown"]), [[]])
+
+    def test_replace_remove_and_compact(self):
+        self.index.add(["v0"], self.vectors[1], [{"extra": True}])
+        self.assertEqual(self.index.label("v0"), {"n": 0, "extra": True})
+        np.testing.assert_allclose(self.index.vector("v0"), normalize(self.vectors[1]), rtol=1e-6)
+
+        self.assertEqual(self.index.remove(["v1", "v2", "missing"]), 2)
+        self.assertEqual(len(self.index), 48)
+        self.assertNotIn("v1", self.index)
+        query = self.rng.normal(size=8)
+        before = self.index.search(query, k=48)[0]
+        self.assertNotIn("v1", [id_ for id_, _ in before])
+
+        self.assertEqual(self.index.compact(), 3)
+        self.assertEqual(self.index.stats()["dead"], 0)
+        after = self.index.search(query, k=48)[0]
+        self.assertEqual([id_ for id_, _ in after], [id_ for id_, _ in before])
+
+    def test_labels(self):
+        updated = self.index.update_labels(["v1", "v2", "missing"], lambda label: dict(label, owners=["u1"]))
+        self.assertEqual(updated, 2)
+        self.assertEqual(sorted(self.index.find(lambda label: "u1" in label.get("owners", ()))), ["v1", "v2"])
+        # A later add() keeps fields it does not set
+        self.index.add(["v1"], self.vectors[1], [{"n": 100}])
+        self.assertEqual(self.index.label("v1"), {"n": 100, "owners": ["u1"]})
+
+    def test_rejects_mismatched_vectors(self):
+        with self.assertRaises(ValueError):
+            self.index.add(["x"], np.ones(4))
+        with self.assertRaises(ValueError):
+            self.index.add(["x"], np.ones(8), model="other")
+        with self.assertRaises(ValueError):
+            self.index.search(np.ones(4))
+
+    def test_reopen(self):
+        reopened = VectorIndex(self.index.directory, "test")
+        self.assertEqual(len(reopened), 50)
+        self.assertEqual(reopened.model, "m")
+        self.assertEqual(reopened.label("v7"), {"n": 7})
@@ -0,0 +1,26 @@
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from file_upload import metrics
+from file_upload.views_health import metrics_export
+
+
+class MetricsExportAuthTests(SimpleTestCase):
+    def get(self, authorization=None):
+        headers = {"HTTP_AUTHORIZATION": authorization} if authorization is not None else {}
+        return metrics_export(RequestFactory().get("/api/metrics/", **headers)).status_code
+
+    @mock.patch.object(metrics, "METRICS_TOKEN", "secret")
+    def test_token_required(self):
+        self.assertEqual(self.get("Bearer secret"), 200)
+        self.assertEqual(self.get(), 403)
+        self.assertEqual(self.get("Bearer wrong"), 403)
+        self.assertEqual(self.get("Bearer sécret"), 403)
+
+    @mock.patch.object(metrics, "METRICS_TOKEN", "")
+    def test_without_token_only_debug_serves_metrics(self):
+        with override_settings(DEBUG=False):
+            self.assertEqual(self.get(), 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.get(), 200)
@@ -0,0 +1,208 @@
+"""
+Throttling Module
+Fixed-window, cost-weighted DRF throttles backed by a counter store that is
+shared across gunicorn workers. Each request is one atomic increment of a
+small integer, instead of DRF's read-modify-write of a timestamp history list.
+
+Counter stores:
+    cache  - CACHES['default'] via cache.incr (atomic INCRBY on Redis)
+    sqlite - A local SQLite file shared by every worker on the host, used when
+             the default cache is per-process (LocMemCache) or when
+             THROTTLE_BACKEND=sqlite
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from django.core.cache import cache, caches
+from rest_framework.throttling import SimpleRateThrottle
+
+from . import metrics
+
+
+# 'auto', 'cache' or 'sqlite'
+THROTTLE_BACKEND = os.getenv("THROTTLE_BACKEND", "auto").lower()
+THROTTLE_SQLITE_PATH = os.getenv(
+    "THROTTLE_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "preppad_throttle.sqlite3")
+)
+
+# Caches whose counters are not visible to other worker processes
+PROCESS_LOCAL_CACHES = ("LocMemCache", "DummyCache")
+
+
+class CacheCounterStore:
+    """Fixed-window counters in the Django cache"""
+
+    def incr(self, key: str, amount: int, ttl: int) -> int:
+        # add() is a no-op when the window's counter already exists
+        cache.add(key, 0, ttl)
+        try:
+            return cache.incr(key, amount)
+        except ValueError:
+            # The key expired between add() and incr()
+            cache.set(key, amount, ttl)
+            return amount
+
+    def decr(self, key: str, amount: int):
+        try:
+            cache.decr(key, amount)
+        except ValueError:
+            # The window's counter is already gone
+            pass
+
+
+class SQLiteCounterStore:
+    """
+    Fixed-window counters in a host-local SQLite file.
+
+    A single UPSERT ... RETURNING statement makes each increment atomic across
+    processes; WAL mode keeps concurrent workers from blocking readers.
+    """
+
+    PURGE_INTERVAL = 300
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_counters "
+                "(key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def incr(self, key: str, amount: int, ttl: int) -> int:
+        conn = self._connection()
+        now = time.time()
+        (count,) = conn.execute(
+            "INSERT INTO throttle_counters (key, count, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET count = count + excluded.count "
+            "RETURNING count",
+            (key, amount, now + ttl),
+        ).fetchone()
+        if now - self._last_purge > self.PURGE_INTERVAL:
+            self._last_purge = now
+            conn.execute("DELETE FROM throttle_counters WHERE expires_at < ?", (now,))
+        return count
+
+    def decr(self, key: str, amount: int):
+        self._connection().execute(
+            "UPDATE throttle_counters SET count = count - ? WHERE key = ?", (amount, key)
+        )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_counter_store():
+    """The process-wide counter store selected by THROTTLE_BACKEND"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = THROTTLE_BACKEND
+                if backend == "auto":
+                    local = type(caches["default"]).__name__ in PROCESS_LOCAL_CACHES
+                    backend = "sqlite" if local else "cache"
+                _store = SQLiteCounterStore(THROTTLE_SQLITE_PATH) if backend == "sqlite" else CacheCounterStore()
+    return _store
+
+
+class FixedWindowRateThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with a fixed-window counter and a per-view cost.
+
+    The rate for `scope` is a budget of cost units per window, e.g.
+    '1000/day'. A request is allowed while the window's total, including
+    its own cost, stays within the budget; a rejected request is not counted.
+    """
+    cost = 1
+    cache_format = "throttle:%(scope)s:%(ident)s:%(window)d"
+
+    def get_ident_key(self, request) -> Optional[str]:
+        raise NotImplementedError(".get_ident_key() must be overridden")
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident, "window": self.window}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.now = self.timer()
+        self.window = int(self.now // self.duration)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        store = get_counter_store()
+        self.count = store.incr(self.key, self.cost, self.duration)
+        if self.count > self.num_requests:
+            # Rejected requests give their cost back, so retries do not burn the budget
+            store.decr(self.key, self.cost)
+            metrics.inc("throttle_rejections_total", scope=self.scope, throttle=type(self).__name__)
+            return False
+        return True
+
+    def wait(self):
+        return (self.window + 1) * self.duration - self.now
+
+
+class AnonFixedWindowThrottle(FixedWindowRateThrottle):
+    """Budget for unauthenticated clients, keyed by IP"""
+    scope = "anon"
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class UserFixedWindowThrottle(FixedWindowRateThrottle):
+    """Budget per authenticated user (or per IP when anonymous)"""
+    scope = "user"
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return str(request.user.pk)
+        return self.get_ident(request)
+
+
+class WeightedUserThrottle(UserFixedWindowThrottle):
+    """Shared 'user_weighted' budget that each API view draws on by cost"""
+    scope = "user_weighted"
+
+
+class AnalysisThrottle(WeightedUserThrottle):
+    # Scrape + two LLM calls + the comparison call
+    cost = 10
+
+
+class UploadThrottle(WeightedUserThrottle):
+    # Resume extraction + one LLM call
+    cost = 5
+
+
+class JobPostingThrottle(WeightedUserThrottle):
+    # Scrape + one LLM call (often served from the job cache)
+    cost = 3
+
+
+class ProfileThrottle(WeightedUserThrottle):
+    cost = 1
@@ -0,0 +1,187 @@
+"""
+Timing Module
+Lightweight per-stage latency spans for the analysis pipeline. A span is
+timed with a monotonic clock, added to a process-wide histogram for its
+name, and appended to the current request's trace so ServerTimingMiddleware
+can report it in a Server-Timing header (and views in a `_timings` field).
+
+Usage:
+    with span("resume.extract"):
+        text = extract_resume_text(...)
+
+Work handed to a thread pool only joins the request's trace when submitted
+through propagate(), since context variables don't follow threads.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+
+# Upper bounds in milliseconds; the last bucket is unbounded
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; cheap enough to update on every span"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": list(self.counts),
+        }
+
+
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def histogram_snapshot() -> Dict[str, Dict]:
+    """Copy of every span histogram recorded by this process"""
+    with _histograms_lock:
+        return {name: hist.snapshot() for name, hist in sorted(_histograms.items())}
+
+
+class Trace:
+    """Spans recorded while handling one request, in completion order"""
+
+    def __init__(self):
+        self.spans: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, duration_ms: float):
+        with self._lock:
+            self.spans.append((name, duration_ms))
+
+    def totals(self) -> "OrderedDict[str, float]":
+        """Milliseconds per span name, summed over repeats"""
+        totals = OrderedDict()
+        with self._lock:
+            for name, duration_ms in self.spans:
+                totals[name] = totals.get(name, 0.0) + duration_ms
+        return totals
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("timing_trace", default=None)
+
+
+def start_trace() -> contextvars.Token:
+    return _current_trace.set(Trace())
+
+
+def end_trace(token: contextvars.Token):
+    _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def record(name: str, duration_ms: float):
+    """Record an already-measured duration under a span name"""
+    with _histograms_lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.observe(duration_ms)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, duration_ms)
+
+
+@contextlib.contextmanager
+def span(name: str):
+    """Time the enclosed block; recorded even if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - started) * 1000)
+
+
+def timed(name: str):
+    """Decorator form of span()"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """Bind func to the caller's context so spans in worker threads join its trace"""
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+    return wrapper
+
+
+def timings_enabled() -> bool:
+    return getattr(settings, "SERVER_TIMING", False)
+
+
+def current_timings() -> Dict[str, float]:
+    """The current request's span totals in milliseconds, for a `_timings` field"""
+    trace = _current_trace.get()
+    if trace is None:
+        return {}
+    return {name: round(ms, 2) for name, ms in trace.totals().items()}
+
+
+def timings_field() -> Dict[str, Dict[str, float]]:
+    """{"_timings": {...}} to splat into API responses when timings are enabled"""
+    return {"_timings": current_timings()} if timings_enabled() else {}
+
+
+def server_timing_header(trace: Trace, total_ms: float) -> str:
+    parts = [f"{name};dur={ms:.1f}" for name, ms in trace.totals().items()]
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """
+    Opens a trace per request and, when settings.SERVER_TIMING is on,
+    reports its spans in a Server-Timing response header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = start_trace()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+            total_ms = (time.perf_counter() - started) * 1000
+            if timings_enabled():
+                response["Server-Timing"] = server_timing_header(current_trace(), total_ms)
+            record("request", total_ms)
+            return response
+        finally:
+            end_trace(token)
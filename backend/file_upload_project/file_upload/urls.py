@@ -1,11 +1,13 @@
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
-from . import views
 from . import views_health
 
-# Enable production views with proper JWT authentication
-if not settings.DEBUG:
+# Import only the active view module: production views with JWT authentication,
+# or the unauthenticated development views
+if settings.DEBUG:
+    from . import views
+else:
     from . import views_production as views
 
 urlpatterns = [
@@ -23,10 +25,15 @@ urlpatterns = [
     # Development detail endpoints (no authentication required)
     path('api/profile/<int:profile_id>/', views.ProfileDetailAPIView.as_view(), name='profile-detail'),
     path('api/resume/<int:resume_id>/', views.ResumeDetailAPIView.as_view(), name='resume-detail'),
+    path('api/resume/<int:resume_id>/matches/', views.ResumeMatchesAPIView.as_view(), name='resume-matches'),
+    path('api/rank-resumes/', views.RankResumesAPIView.as_view(), name='rank-resumes'),
+    path('api/files/', views.FileListAPIView.as_view(), name='file-list'),
     
     # Health check endpoints for production deployment (no auth required)
     path('api/health/', views_health.health_check, name='health-check'),
     path('api/ready/', views_health.ready_check, name='ready-check'),
+    path('api/live/', views_health.live_check, name='live-check'),
     path('api/version/', views_health.version_info, name='version-info'),
+    path('api/metrics/', views_health.metrics_export, name='metrics'),
     path('health/', views_health.health_check, name='health-simple'),  # Simple alias for Railway
 ]
\ No newline at end of file
@@ -1,35 +1,124 @@
 import re
 import json
-from xml.dom.minidom import Document
-# Remove heavy imports from module level - will import when needed
+import contextlib
+import textwrap
 import requests
-import pdfplumber
-from docx import Document
-from lxml import html
+from lxml import etree
 import os
-from dotenv import load_dotenv
+import logging
+from typing import Optional
 from .pii_anonymizer import PIIAnonymizer, anonymize_resume_text, anonymize_resume_data
-
-# Load environment variables
-load_dotenv()
-
-# Get API key from environment
+from .prompt_builder import build_analysis_inputs
+from .job_fetcher import fetch_job_page, UnsupportedContentType
+from .job_cache import get_cached_job, set_cached_job
+from .resume_extraction import ResumeSource, open_resume_stream, hash_stream, extract_resume_text
+from .resume_preflight import MAX_PAGES, ResumeRejected, preflight_resume, limit_text
+from .timing import span, propagate
+from .llm_client import post_chat_completion
+# pdfplumber, python-docx and the ML libraries load on first use (see lazy_imports)
+from . import embeddings, lazy_imports, metrics
+from .structured_logging import LazyPayload, event
+
+logger = logging.getLogger(__name__)
+
+# Get API key from environment (.env is loaded by settings)
 API_KEY = os.getenv("DEEPSEEK_API_KEY")
 
 # Verify API key is loaded
 if not API_KEY:
-    print("❌ DEEPSEEK_API_KEY environment variable not set")
+    logger.error("❌ DEEPSEEK_API_KEY environment variable not set")
 
 # Remove model loading from module level - will load when needed
 
 
+ANALYSIS_PROMPT_TEMPLATE = textwrap.dedent("""\
+    Here is the analysis of the applicant's resume: {resume_text}
+    Here is the analysis of the job posting: {job_details}
+    Now, run a comparison between the two analyses to provide feedback to the applicant.
+    Create a JSON response with the following structure:
+    {{
+        "strengths": [list of strengths compared to job posting],
+        "weaknesses": [list of weaknesses compared to job posting],
+        "improvement_tips": [list of tips to improve resume],
+        "keywords_missing": [list of keywords from job posting not found in resume],
+        "keywords_found": [list of keywords from job posting found in resume],
+        "match_score": number between 0 and 100
+    }}
+    """)
+
+RESUME_PROMPT_TEMPLATE = textwrap.dedent("""\
+    Here is the text from your resume: {resume_text}
+
+    Look through the text that is given to find the following details and format them as a JSON object:
+
+    {{
+        "name": "",
+        "contact_info": {{
+            "email": "",
+            "phone": "",
+            "zipCode": ""
+        }},
+        "work_experience": {{
+            "company": "",
+            "jobTitle": "",
+            "startDate": "",
+            "endDate": "",
+            "jobDescription": "",
+            "yearsOfExperience": ""
+        }},
+        "education": {{
+            "institution": "",
+            "highestDegree": "",
+            "fieldOfStudy": "",
+            "graduationYear": ""
+        }},
+        "projects": {{
+            "projectName": "",
+            "projectDescription": "",
+            "technologiesUsed": ""
+        }},
+        "certifications": {{
+            "certificationName": "",
+            "issuingOrganization": "",
+            "issueDate": "",
+            "expirationDate": ""
+        }},
+        "languages": {{
+            "language": "",
+            "proficiency": ""
+        }},
+        "linkedinUrl": "",
+        "skills": []
+    }}
+
+    For each field, include If a field has no value, set it to null. For skills, provide an array of strings.
+    """)
+
+JOB_PROMPT_TEMPLATE = textwrap.dedent("""\
+    Look through the text that is given to find the following details and include as much information as possible:
+
+    title = string
+    description = string
+    qualifications = list[string]
+    skills = list[string]
+    responsibilities =list[string]
+    salary_range = string
+    location = string
+    posted_date = string
+    company_name = string
+    Here is the given text: {job_posting}
+
+    Once you have found the details, please put them into a JSON object. If nothing can be found for a field, set it to null.
+    """)
+
+
 def analysisPrompt(resume_text: str, job_details: str) -> list:
     """
     Creates a prompt for comparing resume against job posting.
     
     Args:
-        resume_text: Processed resume text
-        job_details: Processed job posting details
+        resume_text: Processed resume data, serialized by prompt_builder
+        job_details: Processed job posting details, serialized by prompt_builder
     
     Returns:
         list: Structured prompt for DeepSeek API with system and user messages
@@ -41,20 +130,7 @@ def analysisPrompt(resume_text: str, job_details: str) -> list:
         },
         {
             "role": "user",
-            "content": f"""
-                Here is the analysis of the applicant's resume: {resume_text}
-                Here is the analysis of the job posting: {job_details}
-                Now, run a comparison between the two analyses to provide feedback to the applicant.
-                Create a JSON response with the following structure:
-                {{
-                    "strengths": [list of strengths compared to job posting],
-                    "weaknesses": [list of weaknesses compared to job posting],
-                    "improvement_tips": [list of tips to improve resume],
-                    "keywords_missing": [list of keywords from job posting not found in resume],
-                    "keywords_found": [list of keywords from job posting found in resume],
-                    "match_score": number between 0 and 100
-                }}
-                    """,
+            "content": ANALYSIS_PROMPT_TEMPLATE.format(resume_text=resume_text, job_details=job_details),
         },
     ]
     return prompt
@@ -77,52 +153,7 @@ def resumeProcessorPrompt(resume_text: str) -> list:
         },
         {
             "role": "user",
-            "content": f"""Here is the text from your resume: {resume_text}
-
-                    Look through the text that is given to find the following details and format them as a JSON object:
-                    
-                    {{
-                        "name": "",
-                        "contact_info": {{
-                            "email": "",
-                            "phone": "",
-                            "zipCode": ""
-                        }},
-                        "work_experience": {{
-                            "company": "",
-                            "jobTitle": "",
-                            "startDate": "",
-                            "endDate": "",
-                            "jobDescription": "",
-                            "yearsOfExperience": ""
-                        }},
-                        "education": {{
-                            "institution": "",
-                            "highestDegree": "",
-                            "fieldOfStudy": "",
-                            "graduationYear": ""
-                        }},
-                        "projects": {{
-                            "projectName": "",
-                            "projectDescription": "",
-                            "technologiesUsed": ""
-                        }},
-                        "certifications": {{
-                            "certificationName": "",
-                            "issuingOrganization": "",
-                            "issueDate": "",
-                            "expirationDate": ""
-                        }},
-                        "languages": {{
-                            "language": "",
-                            "proficiency": ""
-                        }},
-                        "linkedinUrl": "",
-                        "skills": []
-                    }}
-
-                    For each field, include If a field has no value, set it to null. For skills, provide an array of strings.
-                    """,
+            "content": RESUME_PROMPT_TEMPLATE.format(resume_text=resume_text),
         },
     ]
     return prompt
@@ -145,22 +176,7 @@ def jobProcessorPrompt(job_posting: str) -> list:
         },
         {
             "role": "user",
-            "content": f"""
-                        Look through the text that is given to find the following details and include as much information as possible:
-                        
-                        title = string
-                        description = string
-                        qualifications = list[string]
-                        skills = list[string]
-                        responsibilities =list[string]
-                        salary_range = string
-                        location = string
-                        posted_date = string
-                        company_name = string
-                        Here is the given text: {job_posting}
-
-                        Once you have found the details, please put them into a JSON object. If nothing can be found for a field, set it to null.
-                        """,
+            "content": JOB_PROMPT_TEMPLATE.format(job_posting=job_posting),
         },
     ]
     return prompt
@@ -180,34 +196,41 @@ def resumeJobDescAnalysis(resume_file_path: str, job_posting_url: str, anonymize
         dict: Analysis results including match score, strengths, weaknesses
     Raises:
         ValueError: If resume processing or job analysis fails
+        ResumeRejected: If the file fails preflight checks (carries an error code)
     """
     import concurrent.futures
     import threading
     
     try:
-        print("🚀 Starting parallel resume and job analysis...")
+        logger.info("🚀 Starting parallel resume and job analysis...")
         
         # Use ThreadPoolExecutor for parallel processing
         with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
             # Start both operations simultaneously
-            resume_future = executor.submit(processResume, resume_file_path, anonymize_pii)
+            resume_future = metrics.track_submit(
+                "analysis", executor.submit(propagate(processResume), resume_file_path, anonymize_pii)
+            )
             
             # Start job analysis (scraping + AI processing)
-            job_future = executor.submit(extractJobDescription, job_posting_url)
+            job_future = metrics.track_submit(
+                "analysis", executor.submit(propagate(extractJobDescription), job_posting_url)
+            )
             
             # Wait for both operations to complete
-            print("⏱️  Waiting for resume and job analysis to complete...")
+            logger.info("⏱️  Waiting for resume and job analysis to complete...")
             try:
                 resume_data = resume_future.result(timeout=25)  # 25 second timeout
                 job_data = job_future.result(timeout=25)
             except concurrent.futures.TimeoutError:
-                print("⏰ Parallel processing timed out")
+                logger.error("⏰ Parallel processing timed out")
                 raise ValueError("Analysis timed out - operations took longer than 25 seconds")
+            except ResumeRejected:
+                raise
             except Exception as e:
-                print(f"❌ Error in parallel processing: {str(e)}")
+                logger.error("❌ Error in parallel processing: %s", e)
                 raise ValueError(f"Parallel processing failed: {str(e)}")
         
-        print("✅ Parallel processing completed")
+        logger.info("✅ Parallel processing completed")
         
         # Validate results
         if not resume_data:
@@ -222,38 +245,32 @@ def resumeJobDescAnalysis(resume_file_path: str, job_posting_url: str, anonymize
             raise ValueError(f"Job analysis failed: {job_data.get('description', 'Unknown error')}")
         
         # For successful analysis, job_data contains the parsed job information
-        print(f"✅ Resume processed successfully")
-        print(f"✅ Job analysis completed successfully")
+        logger.info("✅ Resume processed successfully")
+        logger.info("✅ Job analysis completed successfully")
 
-        # Prepare data for analysis
-        resume_data_str = str(resume_data)
-        job_data_str = str(job_data)
+        # Prepare data for analysis: only analysis-relevant fields, as compact JSON
+        resume_data_str, job_data_str = build_analysis_inputs(resume_data, job_data)
         
         # If we anonymized the resume, we need to anonymize the combined analysis data too
         pii_mapping = {}
         if anonymize_pii:
-            print("🔒 Anonymizing combined analysis data...")
+            logger.info("🔒 Anonymizing combined analysis data...")
             anonymizer = PIIAnonymizer()
             
             # Anonymize the resume data string for analysis
-            anonymized_resume_str, resume_mapping = anonymizer.anonymize_text(resume_data_str)
+            with span("analysis.anonymize"):
+                anonymized_resume_str, resume_mapping = anonymizer.anonymize_text(resume_data_str)
             pii_mapping.update(resume_mapping)
             
             resume_data_str = anonymized_resume_str
 
         # Implement job description and resume comparison here
-        url = "https://api.deepseek.com/chat/completions"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {API_KEY}",
-        }
-
         analysis_prompt = analysisPrompt(resume_data_str, job_data_str)
         
         if anonymize_pii:
-            print("🚀 Sending anonymized analysis data to DeepSeek API...")
+            logger.info("🚀 Sending anonymized analysis data to DeepSeek API...")
         else:
-            print("⚠️  Sending original analysis data to DeepSeek API...")
+            logger.warning("⚠️  Sending original analysis data to DeepSeek API...")
 
         data = {
             "model": "deepseek-chat",
@@ -263,10 +280,9 @@ def resumeJobDescAnalysis(resume_file_path: str, job_posting_url: str, anonymize
             "max_tokens": 1000,  # Limit response size for faster processing
             "temperature": 0.1,  # Lower temperature for more focused responses
         }
-        response = requests.post(url, headers=headers, json=data)
+        response, result = post_chat_completion(data, "analysis", API_KEY)
         if response.status_code == 200:
-            result = response.json()
-            print("Raw API response:", json.dumps(result, indent=2))
+            logger.debug("Raw API response: %s", LazyPayload(result), extra=event("llm.response", purpose="analysis"))
             try:
                 if (
                     "choices" in result
@@ -278,7 +294,7 @@ def resumeJobDescAnalysis(resume_file_path: str, job_posting_url: str, anonymize
                     
                     # If we anonymized, deanonymize the response
                     if anonymize_pii and pii_mapping:
-                        print("🔓 Deanonymizing analysis response...")
+                        logger.info("🔓 Deanonymizing analysis response...")
                         anonymizer = PIIAnonymizer()
                         
                         # Deanonymize all string fields in the response
@@ -298,12 +314,12 @@ def resumeJobDescAnalysis(resume_file_path: str, job_posting_url: str, anonymize
                         content["_pii_anonymized"] = False
                         content["_analysis_with_privacy_protection"] = False
                     
-                    print("Parsed content:", json.dumps(content, indent=2))
+                    logger.debug("Parsed content: %s", LazyPayload(content), extra=event("llm.content", purpose="analysis"))
                     return content
                 else:
                     raise KeyError("Missing expected keys in API response")
             except KeyError as e:
-                print(f"Error processing API response: {str(e)}")
+                logger.error("Error processing API response: %s", e)
                 choices = result.get("choices", [])
                 if (
                     choices
@@ -311,25 +327,30 @@ def resumeJobDescAnalysis(resume_file_path: str, job_posting_url: str, anonymize
                     and "content" in choices[0]["message"]
                 ):
                     content = json.loads(choices[0]["message"]["content"])
-                    print(
-                        "Parsed content (from error handler):",
-                        json.dumps(content, indent=2),
+                    logger.debug(
+                        "Parsed content (from error handler): %s", LazyPayload(content),
+                        extra=event("llm.content", purpose="analysis"),
                     )
                     return content
                 else:
-                    print(
-                        "Unexpected response format: Missing 'choices' or nested keys."
-                    )
+                    logger.error("Unexpected response format: Missing 'choices' or nested keys.")
             except Exception as e:
-                print(f"Error processing API response: {str(e)}")
-                print("Response content:", result["choices"][0]["message"]["content"])
+                logger.error("Error processing API response: %s", e)
+                logger.debug(
+                    "Response content: %s",
+                    LazyPayload(result["choices"][0]["message"]["content"]),
+                    extra=event("llm.content", purpose="analysis"),
+                )
             return json.loads(result["choices"][0]["message"]["content"])
         else:
-            print("Request failed, error code:", response.status_code)
-            print("Response content:", response.text)
+            logger.error("Request failed, error code: %s", response.status_code)
+            logger.debug("Response content: %s", LazyPayload(response.text), extra=event("llm.error_body", purpose="analysis"))
 
+    except ResumeRejected:
+        # The views answer these with the rejection's own status and code
+        raise
     except Exception as e:
-        print(f"Error in resumeJobDescAnalysis: {str(e)}")
+        logger.error("Error in resumeJobDescAnalysis: %s", e)
         return {
             "error": str(e),
             "status": "failed",
@@ -338,74 +359,61 @@ def resumeJobDescAnalysis(resume_file_path: str, job_posting_url: str, anonymize
         }
 
 
-def processResumeFromContent(file_content: bytes, filename: str, anonymize_pii: bool = True) -> dict:
+def processResumeFromContent(file_content: ResumeSource, filename: str, anonymize_pii: bool = True) -> dict:
     """
-    Extracts and processes text from resume file content (in-memory processing).
+    Extracts and processes text from resume file content without storing the file.
     
     Args:
-        file_content: Raw file content as bytes
+        file_content: Resume content as raw bytes, a path, or a file-like object
+            such as a Django UploadedFile (files spilled to disk are memory-mapped)
         filename: Original filename to determine file type
         anonymize_pii: Whether to anonymize PII before sending to external AI
     
     Returns:
         dict: Structured resume data with anonymization metadata if applicable
     Raises:
+        ResumeRejected: If the file fails preflight checks (carries an error code)
         ValueError: If file format is not supported
     """
-    import io
-    import tempfile
-    
-    resume_text = ""
-    
-    # Determine file type from filename
-    if filename.lower().endswith(".pdf"):
-        # Process PDF from memory
-        pdf_file = io.BytesIO(file_content)
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    resume_text += page_text
-                    
-    elif filename.lower().endswith(".docx"):
-        # Process DOCX from memory  
-        docx_file = io.BytesIO(file_content)
-        doc = Document(docx_file)
-        resume_text = "\n".join([p.text for p in doc.paragraphs])
-        
-    else:
-        raise ValueError("Unsupported file format. Only PDF and DOCX files are supported.")
+    with open_resume_stream(file_content) as stream:
+        # Reject mislabeled, oversized or too-long files before parsing them
+        with span("resume.preflight"):
+            report = preflight_resume(stream, filename)
+        with span("resume.hash"):
+            content_sha256 = hash_stream(stream)
+        with span("resume.extract"):
+            resume_text = extract_resume_text(
+                stream, filename, kind=report.kind, max_pages=MAX_PAGES, page_count=report.page_count
+            )
     
     if not resume_text.strip():
         raise ValueError("No text could be extracted from the resume file.")
     
     # Clean up text
-    resume_text = re.sub(r"\s+", " ", resume_text).strip()
+    resume_text = limit_text(re.sub(r"\s+", " ", resume_text).strip())
     
     # Anonymize PII if requested
     pii_mapping = {}
     processed_text = resume_text
     
     if anonymize_pii:
-        print("🔒 Anonymizing PII before sending to external AI service...")
+        logger.info("🔒 Anonymizing PII before sending to external AI service...")
         anonymizer = PIIAnonymizer()
-        processed_text, pii_mapping = anonymizer.anonymize_text(resume_text)
+        with span("resume.anonymize"):
+            processed_text, pii_mapping = anonymizer.anonymize_text(resume_text)
         
         # Create anonymization report
         anonymization_report = anonymizer.create_anonymization_report(pii_mapping)
-        print(f"📊 Anonymization Report: {anonymization_report['total_items']} PII items anonymized")
-        print(f"   Types: {anonymization_report['types']}")
+        logger.info("📊 Anonymization Report: %s PII items anonymized", anonymization_report['total_items'])
+        logger.info("   Types: %s", anonymization_report['types'])
 
     # Process with DeepSeek API
-    url = "https://api.deepseek.com/chat/completions"
-    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {API_KEY}"}
-
     prompt = resumeProcessorPrompt(processed_text)
     
     if anonymize_pii:
-        print("🚀 Sending anonymized resume to DeepSeek API...")
+        logger.info("🚀 Sending anonymized resume to DeepSeek API...")
     else:
-        print("⚠️  Sending original resume text to DeepSeek API...")
+        logger.warning("⚠️  Sending original resume text to DeepSeek API...")
     
     data = {
         "model": "deepseek-chat",
@@ -417,10 +425,9 @@ def processResumeFromContent(file_content: bytes, filename: str, anonymize_pii:
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
+        response, result = post_chat_completion(data, "resume", API_KEY)
         if response.status_code == 200:
-            result = response.json()
-            print("Raw API response:", json.dumps(result, indent=2))
+            logger.debug("Raw API response: %s", LazyPayload(result), extra=event("llm.response", purpose="resume"))
             
             if (
                 "choices" in result
@@ -432,12 +439,13 @@ def processResumeFromContent(file_content: bytes, filename: str, anonymize_pii:
                 
                 # If we anonymized, we need to deanonymize the response
                 if anonymize_pii and pii_mapping:
-                    print("🔓 Deanonymizing AI response...")
+                    logger.info("🔓 Deanonymizing AI response...")
                     anonymizer = PIIAnonymizer()
                     content = anonymizer.deanonymize_data(content, pii_mapping)
                 
                 # Add processing metadata
                 content['pii_anonymized'] = anonymize_pii
+                content['content_sha256'] = content_sha256
                 content['original_text_length'] = len(resume_text)
                 if anonymize_pii:
                     content['anonymized_text_length'] = len(processed_text)
@@ -449,7 +457,7 @@ def processResumeFromContent(file_content: bytes, filename: str, anonymize_pii:
         else:
             raise ValueError(f"DeepSeek API error: {response.status_code} - {response.text}")
     except Exception as e:
-        print(f"Error processing resume: {str(e)}")
+        logger.error("Error processing resume: %s", e)
         # Return basic structure on error
         return {
             "error": str(e),
@@ -469,44 +477,42 @@ def processResume(resume_file_path: str, anonymize_pii: bool = True) -> dict:
     Returns:
         dict: Structured resume data with anonymization metadata if applicable
     Raises:
+        ResumeRejected: If the file fails preflight checks (carries an error code)
         ValueError: If file format is not supported
     """
-    resume_text = ""
-    if resume_file_path.endswith(".pdf"):
-        with pdfplumber.open(f"{resume_file_path}") as pdf:
-            for page in pdf.pages:
-                resume_text += page.extract_text()
-    elif resume_file_path.endswith(".docx"):
-        doc = Document(resume_file_path)
-        resume_text = "\n".join([p.text for p in doc.paragraphs])
-    else:
+    if not resume_file_path.endswith((".pdf", ".docx")):
         raise ValueError("Unsupported file format. Use PDF or DOCX.")
+    with open_resume_stream(resume_file_path) as stream:
+        with span("resume.preflight"):
+            report = preflight_resume(stream, resume_file_path)
+        with span("resume.extract"):
+            resume_text = extract_resume_text(
+                stream, resume_file_path, kind=report.kind, max_pages=MAX_PAGES, page_count=report.page_count
+            )
 
-    resume_text = re.sub(r"\s+", " ", resume_text).strip()
+    resume_text = limit_text(re.sub(r"\s+", " ", resume_text).strip())
     
     # Anonymize PII if requested
     pii_mapping = {}
     processed_text = resume_text
     
     if anonymize_pii:
-        print("🔒 Anonymizing PII before sending to external AI service...")
+        logger.info("🔒 Anonymizing PII before sending to external AI service...")
         anonymizer = PIIAnonymizer()
-        processed_text, pii_mapping = anonymizer.anonymize_text(resume_text)
+        with span("resume.anonymize"):
+            processed_text, pii_mapping = anonymizer.anonymize_text(resume_text)
         
         # Create anonymization report
         anonymization_report = anonymizer.create_anonymization_report(pii_mapping)
-        print(f"📊 Anonymization Report: {anonymization_report['total_items']} PII items anonymized")
-        print(f"   Types: {anonymization_report['types']}")
-
-    url = "https://api.deepseek.com/chat/completions"
-    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {API_KEY}"}
+        logger.info("📊 Anonymization Report: %s PII items anonymized", anonymization_report['total_items'])
+        logger.info("   Types: %s", anonymization_report['types'])
 
     prompt = resumeProcessorPrompt(processed_text)
     
     if anonymize_pii:
-        print("🚀 Sending anonymized resume to DeepSeek API...")
+        logger.info("🚀 Sending anonymized resume to DeepSeek API...")
     else:
-        print("⚠️  Sending original resume text to DeepSeek API...")
+        logger.warning("⚠️  Sending original resume text to DeepSeek API...")
     
     data = {
         "model": "deepseek-chat",
@@ -516,10 +522,9 @@ def processResume(resume_file_path: str, anonymize_pii: bool = True) -> dict:
         "max_tokens": 800,  # Optimized for resume data
         "temperature": 0.1,  # Focused responses
     }
-    response = requests.post(url, headers=headers, json=data)
+    response, result = post_chat_completion(data, "resume", API_KEY)
     if response.status_code == 200:
-        result = response.json()
-        print("Raw API response:", json.dumps(result, indent=2))
+        logger.debug("Raw API response: %s", LazyPayload(result), extra=event("llm.response", purpose="resume"))
         try:
             if (
                 "choices" in result
@@ -531,7 +536,7 @@ def processResume(resume_file_path: str, anonymize_pii: bool = True) -> dict:
                 
                 # If we anonymized, we need to deanonymize the response
                 if anonymize_pii and pii_mapping:
-                    print("🔓 Deanonymizing AI response...")
+                    logger.info("🔓 Deanonymizing AI response...")
                     anonymizer = PIIAnonymizer()
                     
                     # Convert content back to string, deanonymize, then parse back
@@ -541,7 +546,7 @@ def processResume(resume_file_path: str, anonymize_pii: bool = True) -> dict:
                     try:
                         content = json.loads(deanonymized_str)
                     except json.JSONDecodeError:
-                        print("Warning: Could not parse deanonymized content as JSON, using original")
+                        logger.warning("Could not parse deanonymized content as JSON, using original")
                     
                     # Add metadata about anonymization
                     content["_pii_anonymized"] = True
@@ -549,12 +554,12 @@ def processResume(resume_file_path: str, anonymize_pii: bool = True) -> dict:
                 else:
                     content["_pii_anonymized"] = False
                 
-                print("Parsed content:", json.dumps(content, indent=2))
+                logger.debug("Parsed content: %s", LazyPayload(content), extra=event("llm.content", purpose="resume"))
                 return content
             else:
                 raise KeyError("Missing expected keys in API response")
         except KeyError as e:
-            print(f"Error processing API response: {str(e)}")
+            logger.error("Error processing API response: %s", e)
             choices = result.get("choices", [])
             if (
                 choices
@@ -562,20 +567,24 @@ def processResume(resume_file_path: str, anonymize_pii: bool = True) -> dict:
                 and "content" in choices[0]["message"]
             ):
                 content = json.loads(choices[0]["message"]["content"])
-                print(
-                    "Parsed content (from error handler):",
-                    json.dumps(content, indent=2),
+                logger.debug(
+                    "Parsed content (from error handler): %s", LazyPayload(content),
+                    extra=event("llm.content", purpose="resume"),
                 )
                 return content
             else:
-                print("Unexpected response format: Missing 'choices' or nested keys.")
+                logger.error("Unexpected response format: Missing 'choices' or nested keys.")
         except Exception as e:
-            print(f"Error processing API response: {str(e)}")
-            print("Response content:", result["choices"][0]["message"]["content"])
+            logger.error("Error processing API response: %s", e)
+            logger.debug(
+                "Response content: %s",
+                LazyPayload(result["choices"][0]["message"]["content"]),
+                extra=event("llm.content", purpose="resume"),
+            )
         return json.loads(result["choices"][0]["message"]["content"])
     else:
-        print("Request failed, error code:", response.status_code)
-        print("Response content:", response.text)
+        logger.error("Request failed, error code: %s", response.status_code)
+        logger.debug("Response content: %s", LazyPayload(response.text), extra=event("llm.error_body", purpose="resume"))
 
 
 
@@ -589,11 +598,8 @@ def analyzeJobPosting(job_posting: str) -> dict:
     Returns:
         dict: Structured job posting data
     """
-    url = "https://api.deepseek.com/chat/completions"
-    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {API_KEY}"}
-
     prompt = jobProcessorPrompt(job_posting)
-    print("Sending prompt to API:", json.dumps(prompt, indent=2))
+    logger.debug("Sending prompt to API: %s", LazyPayload(prompt), extra=event("llm.prompt", purpose="job"))
 
     data = {
         "model": "deepseek-chat",  # Use 'deepseek-reasoner' for R1 model or 'deepseek-chat' for V3 model
@@ -604,11 +610,10 @@ def analyzeJobPosting(job_posting: str) -> dict:
         "temperature": 0.1,  # Lower temperature for more focused responses
     }
 
-    response = requests.post(url, headers=headers, json=data)
+    response, result = post_chat_completion(data, "job", API_KEY)
 
     if response.status_code == 200:
-        result = response.json()
-        print("Raw API response:", json.dumps(result, indent=2))
+        logger.debug("Raw API response: %s", LazyPayload(result), extra=event("llm.response", purpose="job"))
         try:
             if (
                 "choices" in result
@@ -617,12 +622,12 @@ def analyzeJobPosting(job_posting: str) -> dict:
                 and "content" in result["choices"][0]["message"]
             ):
                 content = json.loads(result["choices"][0]["message"]["content"])
-                print("Parsed content:", json.dumps(content, indent=2))
+                logger.debug("Parsed content: %s", LazyPayload(content), extra=event("llm.content", purpose="job"))
                 return content
             else:
                 raise KeyError("Missing expected keys in API response")
         except KeyError as e:
-            print(f"Error processing API response: {str(e)}")
+            logger.error("Error processing API response: %s", e)
             choices = result.get("choices", [])
             if (
                 choices
@@ -630,24 +635,26 @@ def analyzeJobPosting(job_posting: str) -> dict:
                 and "content" in choices[0]["message"]
             ):
                 content = json.loads(choices[0]["message"]["content"])
-                print(
-                    "Parsed content (from error handler):",
-                    json.dumps(content, indent=2),
+                logger.debug(
+                    "Parsed content (from error handler): %s", LazyPayload(content),
+                    extra=event("llm.content", purpose="job"),
                 )
                 return content
             else:
-                print("Unexpected response format: Missing 'choices' or nested keys.")
+                logger.error("Unexpected response format: Missing 'choices' or nested keys.")
         except Exception as e:
-            print(f"Error processing API response: {str(e)}")
-            print("Response content:", result["choices"][0]["message"]["content"])
+            logger.error("Error processing API response: %s", e)
+            logger.debug(
+                "Response content: %s",
+                LazyPayload(result["choices"][0]["message"]["content"]),
+                extra=event("llm.content", purpose="job"),
+            )
         return json.loads(result["choices"][0]["message"]["content"])
     else:
-        print(
-            f"Error: analyzeJobPosting\nRequest failed, error code:{response.status_code}\n"
-        )
+        logger.error("analyzeJobPosting request failed, error code: %s", response.status_code)
 
 
-def getRawText(tree: html.HtmlElement) -> str:
+def getRawText(tree: etree._Element) -> str:
     """
     Extracts and cleans text from HTML.
     
@@ -675,16 +682,7 @@ def ner(text: str) -> dict:
     Returns:
         dict: NER results
     """
-    from transformers import (
-        AutoTokenizer,
-        AutoModelForTokenClassification,
-        pipeline,
-    )
-    tokenizer = AutoTokenizer.from_pretrained("dslim/bert-base-NER")
-    model = AutoModelForTokenClassification.from_pretrained("dslim/bert-base-NER")
-    ner_pipeline = pipeline("ner", model=model, tokenizer=tokenizer)
-
-    return ner_pipeline(text)
+    return lazy_imports.pipeline(*lazy_imports.MODELS["ner"])(text)
 
 
 # Ask a question and get an answer
@@ -699,14 +697,7 @@ def askQuestion(text: str, question: str) -> str:
     Returns:
         str: Extracted answer from text
     """
-    from transformers import (
-        AutoTokenizer,
-        AutoModelForTokenClassification,
-        pipeline,
-    )
-    qa_pipeline = pipeline(
-        "question-answering", model="distilbert-base-cased-distilled-squad"
-    )
+    qa_pipeline = lazy_imports.pipeline(*lazy_imports.MODELS["qa"])
     answer = qa_pipeline(question=question, context=text)
     return answer["answer"]
 
@@ -737,140 +728,112 @@ def extractQAFields(text: str) -> dict:
     return {k: askQuestion(text, q) for k, q in questions.items()}
 
 # Extract job description from a URL using HTTP requests + lxml
-def extractJobDescription(url: str) -> dict:
+def extractJobDescription(
+    url: str,
+    include_html: bool = False,
+    session=None,
+    use_cache: bool = True,
+    fetch_guard=None,
+    owner: Optional[str] = None,
+    refresh: bool = False,
+) -> dict:
     """
-    Scrapes job posting content using HTTP requests and lxml parsing.
-    Fast, lightweight alternative to WebDriver.
+    Scrapes job posting content by streaming the page through an incremental
+    lxml parser with a hard size cap (see job_fetcher).
     
     Args:
         url: Job posting URL
+        include_html: Whether to include the raw (size-capped) HTML in error payloads
+        session: Optional requests session, reused across fetches to the same host
+        use_cache: Whether to read and populate the job posting cache
+        fetch_guard: Optional callable returning a context manager held around the
+            HTTP fetch only (used by job_scraper for per-host politeness)
+        owner: User the posting is analyzed for; recorded against it in the
+            similarity index (see embeddings.match_jobs)
+        refresh: Skip the cache read and always re-scrape; the fresh result
+            still replaces the cached entry when use_cache is set
     
     Returns:
         dict: Processed job posting data or error details
     """
-    # Validate API key early
-    if not API_KEY:
-        print("❌ DEEPSEEK_API_KEY environment variable not set")
-        return {
+    def errorResult(status_code: int, description: str, full_text: str = "", raw_html: str = None) -> dict:
+        result = {
             "url": url,
-            "status_code": 500,
-            "description": "DeepSeek API key not configured",
-            "full_text": "",
-            "html": "",
+            "status_code": status_code,
+            "description": description,
+            "full_text": full_text,
         }
+        if include_html:
+            result["html"] = raw_html or ""
+        return result
+
+    if use_cache and not refresh:
+        with span("job.cache"):
+            cached = get_cached_job(url)
+        if cached is not None:
+            logger.info("⚡ Job posting cache hit: %s", url)
+            embeddings.schedule_job(url, cached, owner, refresh=False)
+            return cached
+
+    # Validate API key early
+    if not API_KEY:
+        logger.error("❌ DEEPSEEK_API_KEY environment variable not set")
+        return errorResult(500, "DeepSeek API key not configured")
     
     try:
-        print(f"🚀 Fetching job posting: {url}")
-        
-        # Set up headers to mimic a real browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
-        # Make HTTP request with timeout
-        response = requests.get(
-            url, 
-            headers=headers, 
-            timeout=10,  # 10 second timeout - much faster than WebDriver
-            allow_redirects=True,
-            verify=True  # Verify SSL certificates
-        )
+        logger.info("🚀 Fetching job posting: %s", url)
+        with (fetch_guard() if fetch_guard else contextlib.nullcontext()):
+            page = fetch_job_page(url, session=session, keep_html=include_html)
         
         # Check if request was successful
-        if response.status_code != 200:
-            print(f"⚠️  HTTP {response.status_code} for {url}")
-            return {
-                "url": url,
-                "status_code": response.status_code,
-                "description": f"HTTP error: {response.status_code} - {response.reason}",
-                "full_text": "",
-                "html": "",
-            }
+        if page.status_code != 200:
+            logger.warning("⚠️  HTTP %s for %s", page.status_code, url)
+            return errorResult(page.status_code, f"HTTP error: {page.status_code} - {page.reason}")
         
-        print(f"✅ Successfully fetched {url} ({len(response.content)} bytes)")
+        logger.info("✅ Successfully fetched %s (%s bytes%s)", url, page.bytes_read, ', truncated' if page.truncated else '')
         
-        # Parse HTML using lxml (same as before)
-        try:
-            tree = html.fromstring(response.content)
-            job_posting = getRawText(tree)  # Reuse existing function
-            
-            if not job_posting.strip():
-                return {
-                    "url": url,
-                    "status_code": 200,
-                    "description": "No text content found in job posting",
-                    "full_text": "",
-                    "html": response.text,
-                }
-            
-            print(f"✅ Extracted {len(job_posting)} characters of text")
-            
-        except Exception as parse_error:
-            print(f"⚠️  HTML parsing error: {str(parse_error)}")
-            return {
-                "url": url,
-                "status_code": 200,
-                "description": f"HTML parsing error: {str(parse_error)}",
-                "full_text": "",
-                "html": response.text,
-            }
+        job_posting = page.text
+        if not job_posting.strip():
+            return errorResult(200, "No text content found in job posting", raw_html=page.html)
+        
+        logger.info("✅ Extracted %s characters of text", len(job_posting))
 
         # Process with DeepSeek API (same as before)
         job_details_deepseek = analyzeJobPosting(job_posting)
         if job_details_deepseek:
-            print(f"✅ Job analysis completed successfully")
+            logger.info("✅ Job analysis completed successfully")
+            if use_cache:
+                set_cached_job(url, job_details_deepseek)
+            embeddings.schedule_job(url, job_details_deepseek, owner)
             return job_details_deepseek
         else:
-            return {
-                "url": url,
-                "status_code": 200,
-                "description": "Job posting fetched but DeepSeek analysis failed",
-                "full_text": job_posting,
-                "html": response.text,
-            }
+            return errorResult(
+                200,
+                "Job posting fetched but DeepSeek analysis failed",
+                full_text=job_posting,
+                raw_html=page.html,
+            )
+
+    except UnsupportedContentType as e:
+        logger.warning("⚠️  %s for %s", e, url)
+        return errorResult(415, f"Job posting URL did not return an HTML page ({e.content_type})")
+
+    except etree.LxmlError as parse_error:
+        logger.warning("⚠️  HTML parsing error: %s", parse_error)
+        return errorResult(200, f"HTML parsing error: {str(parse_error)}")
 
     except requests.exceptions.Timeout:
-        print(f"⏰ Timeout fetching {url}")
-        return {
-            "url": url,
-            "status_code": 408,
-            "description": "Request timeout - job posting took too long to load",
-            "full_text": "",
-            "html": "",
-        }
+        logger.error("⏰ Timeout fetching %s", url)
+        return errorResult(408, "Request timeout - job posting took too long to load")
     
     except requests.exceptions.ConnectionError:
-        print(f"🔌 Connection error for {url}")
-        return {
-            "url": url,
-            "status_code": 503,
-            "description": "Connection error - could not reach job posting URL",
-            "full_text": "",
-            "html": "",
-        }
+        logger.error("🔌 Connection error for %s", url)
+        return errorResult(503, "Connection error - could not reach job posting URL")
     
     except requests.exceptions.RequestException as e:
-        print(f"🌐 Request error for {url}: {str(e)}")
-        return {
-            "url": url,
-            "status_code": 500,
-            "description": f"Request error: {str(e)}",
-            "full_text": "",
-            "html": "",
-        }
+        logger.error("🌐 Request error for %s: %s", url, e)
+        return errorResult(500, f"Request error: {str(e)}")
     
     except Exception as e:
-        print(f"❌ Unexpected error for {url}: {str(e)}")
-        return {
-            "url": url,
-            "status_code": 500,
-            "description": f"Unexpected error: {str(e)}",
-            "full_text": "",
-            "html": "",
-        }
+        logger.error("❌ Unexpected error for %s: %s", url, e)
+        return errorResult(500, f"Unexpected error: {str(e)}")
@@ -0,0 +1,304 @@
+"""
+Vector Index Module
+A compact on-disk index of L2-normalized float32 vectors with string ids,
+searched by cosine similarity.
+
+Each index is two files in one directory: <name>.f32, the vectors as raw
+row-major float32, and <name>.json, the ids (one per row), a label dict per
+id and the model that produced the vectors. Rows are only ever appended;
+re-adding an id appends a new row and blanks the id of the old one, and
+remove() blanks ids without touching the vectors. compact() rewrites both
+files without the dead rows.
+
+Readers memory-map the vector file, so every worker process shares one copy
+in the page cache, and only map as many rows as the metadata lists: a
+writer appends vectors first and replaces the metadata last (atomically),
+so a search never sees a half-written row. Writers serialize on an flock.
+Searches multiply a batch of queries against the matrix in row chunks and
+keep a running top-k with argpartition, so memory stays bounded however
+large the index grows.
+"""
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Rows scored per matrix product; bounds the score buffer to queries x SEARCH_CHUNK_ROWS
+SEARCH_CHUNK_ROWS = int(os.getenv("VECTOR_SEARCH_CHUNK_ROWS", "65536"))
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Rows scaled to unit length (zero rows stay zero), as float32"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorIndex:
+    """Append-only, memory-mapped float32 vectors with cosine top-k search"""
+
+    def __init__(self, directory: str, name: str):
+        self.directory = directory
+        self.name = name
+        self.vectors_path = os.path.join(directory, f"{name}.f32")
+        self.meta_path = os.path.join(directory, f"{name}.json")
+        self.lock_path = os.path.join(directory, f"{name}.lock")
+        self._lock = threading.Lock()
+        self._stamp = None
+        # (metadata, memory-mapped matrix, row by live id, live-row mask), swapped as one
+        self._state = ({"dim": None, "model": None, "ids": [], "labels": {}},
+                       np.zeros((0, 0), dtype=np.float32), {}, np.zeros(0, dtype=bool))
+
+    # --- Reading ---------------------------------------------------------
+
+    def _snapshot(self) -> Tuple[Dict, np.ndarray, Dict[str, int], np.ndarray]:
+        """Current state, re-read first if another process changed the index"""
+        try:
+            st = os.stat(self.meta_path)
+            stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            stamp = None
+        with self._lock:
+            if stamp == self._stamp:
+                return self._state
+            meta = self._read_meta()
+            ids, dim = meta["ids"], meta["dim"]
+            if ids:
+                try:
+                    matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(ids), dim))
+                except (FileNotFoundError, ValueError):
+                    # Caught between compact()'s two replaces; the next call retries
+                    return self._state
+            else:
+                matrix = np.zeros((0, dim or 0), dtype=np.float32)
+            rows = {id_: row for row, id_ in enumerate(ids) if id_ is not None}
+            live = np.array([id_ is not None for id_ in ids], dtype=bool)
+            self._state, self._stamp = (meta, matrix, rows, live), stamp
+            return self._state
+
+    def _read_meta(self) -> Dict:
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"dim": None, "model": None, "ids": [], "labels": {}}
+
+    def __len__(self) -> int:
+        return len(self._snapshot()[2])
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self._snapshot()[2]
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._snapshot()[0]["dim"]
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._snapshot()[0]["model"]
+
+    def label(self, id_: str) -> Dict:
+        return self._snapshot()[0]["labels"].get(id_, {})
+
+    def find(self, predicate: Callable[[Dict], bool]) -> List[str]:
+        """Live ids whose label satisfies predicate (a scan over the labels)"""
+        meta, _, rows, _ = self._snapshot()
+        return [id_ for id_ in rows if predicate(meta["labels"].get(id_, {}))]
+
+    def vector(self, id_: str) -> Optional[np.ndarray]:
+        """The stored vector for an id (a copy), or None"""
+        _, matrix, rows, _ = self._snapshot()
+        row = rows.get(id_)
+        return None if row is None else np.array(matrix[row])
+
+    def stats(self) -> Dict:
+        meta, _, rows, _ = self._snapshot()
+        return {
+            "name": self.name,
+            "model": meta["model"],
+            "dim": meta["dim"],
+            "live": len(rows),
+            "dead": len(meta["ids"]) - len(rows),
+            "bytes": len(meta["ids"]) * (meta["dim"] or 0) * 4,
+        }
+
+    # --- Search ----------------------------------------------------------
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        ids: Optional[Iterable[str]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Cosine top-k for a batch of queries.
+
+        Args:
+            queries: (q, dim) or (dim,) array; normalized here
+            k: Results per query
+            ids: Restrict the search to these ids (unknown ids are ignored)
+
+        Returns:
+            list: Per query, up to k (id, score) pairs, best first
+        """
+        meta, matrix, rows_by_id, live = self._snapshot()
+        queries = normalize(np.atleast_2d(queries))
+        row_ids = meta["ids"]
+        if len(row_ids) and queries.shape[1] != matrix.shape[1]:
+            raise ValueError(f"Query dimension {queries.shape[1]} does not match index dimension {matrix.shape[1]}")
+        if ids is not None:
+            candidates = np.fromiter(
+                sorted({rows_by_id[i] for i in ids if i in rows_by_id}), dtype=np.int64
+            )
+            return self._top_k(queries @ matrix[candidates].T, candidates, k, row_ids) \
+                if len(candidates) else [[] for _ in queries]
+        if not rows_by_id:
+            return [[] for _ in queries]
+
+        k = min(k, len(rows_by_id))
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(matrix), SEARCH_CHUNK_ROWS):
+            scores = queries @ matrix[start:start + SEARCH_CHUNK_ROWS].T
+            scores[:, ~live[start:start + SEARCH_CHUNK_ROWS]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+            # Merge this chunk with the running best, then keep the k largest
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                rows = np.take_along_axis(rows, keep, axis=1)
+            best_scores, best_rows = scores, rows
+        return self._sorted(best_scores, best_rows, row_ids)
+
+    def _top_k(self, scores: np.ndarray, candidates: np.ndarray, k: int, row_ids: List) -> List:
+        k = min(k, scores.shape[1])
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        return self._sorted(np.take_along_axis(scores, keep, axis=1), candidates[keep], row_ids)
+
+    @staticmethod
+    def _sorted(scores: np.ndarray, rows: np.ndarray, row_ids: List) -> List[List[Tuple[str, float]]]:
+        results = []
+        for query_scores, query_rows in zip(scores, rows):
+            order = np.argsort(-query_scores, kind="stable")
+            results.append([
+                (row_ids[query_rows[i]], float(query_scores[i]))
+                for i in order if np.isfinite(query_scores[i])
+            ])
+        return results
+
+    # --- Writing ---------------------------------------------------------
+
+    @contextmanager
+    def _write_lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_meta(self, meta: Dict):
+        tmp_path = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(tmp_path, self.meta_path)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        labels: Optional[Sequence[Dict]] = None,
+        model: Optional[str] = None,
+    ):
+        """
+        Add or replace vectors. Labels are merged into a replaced id's
+        existing label, so fields set with update_labels() survive.
+
+        Raises:
+            ValueError: On a dimension or model different from the index's
+        """
+        vectors = normalize(np.atleast_2d(vectors))
+        if len(ids) != len(vectors):
+            raise ValueError(f"{len(ids)} ids for {len(vectors)} vectors")
+        with self._write_lock():
+            meta = self._read_meta()
+            if meta["dim"] not in (None, vectors.shape[1]):
+                raise ValueError(f"Vectors have dimension {vectors.shape[1]}, index '{self.name}' has {meta['dim']}")
+            if meta["ids"] and model and meta["model"] not in (None, model):
+                raise ValueError(f"Index '{self.name}' was built with {meta['model']}; rebuild it for {model}")
+            meta["dim"] = vectors.shape[1]
+            meta["model"] = meta["model"] or model
+
+            replaced = set(ids)
+            meta["ids"] = [None if id_ in replaced else id_ for id_ in meta["ids"]]
+            # Drop anything a failed writer left past the last committed row
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(len(meta["ids"]) * meta["dim"] * 4)
+                f.write(np.ascontiguousarray(vectors).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            meta["ids"].extend(ids)
+            for id_, label in zip(ids, labels or [{}] * len(ids)):
+                meta["labels"][id_] = dict(meta["labels"].get(id_, {}), **label)
+            self._write_meta(meta)
+
+    def update_labels(self, ids: Iterable[str], update: Callable[[Dict], Dict]) -> int:
+        """Replace each indexed id's label with update(label). Returns how many were updated."""
+        with self._write_lock():
+            meta = self._read_meta()
+            present = set(ids).intersection(meta["ids"])
+            if not present:
+                return 0
+            for id_ in present:
+                meta["labels"][id_] = update(meta["labels"].get(id_, {}))
+            self._write_meta(meta)
+        return len(present)
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Forget ids; their rows stay on disk until compact(). Returns how many were present."""
+        ids = set(ids)
+        with self._write_lock():
+            meta = self._read_meta()
+            present = ids.intersection(meta["ids"])
+            if not present:
+                return 0
+            meta["ids"] = [None if id_ in present else id_ for id_ in meta["ids"]]
+            for id_ in present:
+                meta["labels"].pop(id_, None)
+            self._write_meta(meta)
+        return len(present)
+
+    def compact(self) -> int:
+        """Rewrite the index without dead rows. Returns the number of rows dropped."""
+        with self._write_lock():
+            meta = self._read_meta()
+            live = [row for row, id_ in enumerate(meta["ids"]) if id_ is not None]
+            dropped = len(meta["ids"]) - len(live)
+            if not dropped:
+                return 0
+            if live:
+                matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                   shape=(len(meta["ids"]), meta["dim"]))
+                kept = np.ascontiguousarray(matrix[live])
+                del matrix
+            else:
+                kept = np.zeros((0, meta["dim"] or 0), dtype=np.float32)
+            tmp_path = f"{self.vectors_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(kept.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            # Readers holding the old mapping keep the old inode until they refresh
+            os.replace(tmp_path, self.vectors_path)
+            meta["ids"] = [meta["ids"][row] for row in live]
+            self._write_meta(meta)
+        return dropped
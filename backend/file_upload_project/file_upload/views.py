@@ -1,6 +1,5 @@
 from django.shortcuts import render, redirect
 from django.http import HttpResponse
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.contrib import messages
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -13,10 +12,15 @@ import logging
 import os
 import json
 from .serializers import AnalysisSerializer, FileUploadSerializer, JobPostingSerializer
-from .models import UploadedFile
+from . import embeddings
+from .models import UploadedFile, Profile
+from .profile_cache import get_profile_data, get_profile_data_for_user
+from .file_listing import InvalidCursor, list_files_page, owner_id, serialize_file
 from .forms import fileUploadForm, jobPostingForm
 from .utils import processResume, extractJobDescription, resumeJobDescAnalysis
-from rest_framework.throttling import UserRateThrottle
+from .resume_preflight import ResumeRejected
+from .timing import timings_field
+from .structured_logging import LazyPayload, event
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -50,7 +54,7 @@ class AnalysisAPIView(APIView):
         try:
             instance = UploadedFile.objects.create(
                 file=request.FILES["file"],
-                processed_content=""
+                processed_content=None
             )
             job_url = request.data["job_posting_url"]
             
@@ -70,8 +74,12 @@ class AnalysisAPIView(APIView):
                 "url": job_url,
                 "analysis": analysis,
                 "job_details": job_details,
-                "privacy_protected": anonymize_pii
+                "privacy_protected": anonymize_pii,
+                **timings_field(),
             }, status=status.HTTP_201_CREATED)
+        except ResumeRejected as e:
+            logger.warning(f"Resume rejected: {e.code}")
+            return Response({"error": str(e), "code": e.code}, status=e.http_status)
         except Exception as e:
             logger.error(f"Error in analysis: {str(e)}")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -105,7 +113,7 @@ class FileUploadAPIView(APIView):
             # Upload and process the file
             instance = UploadedFile.objects.create(
                 file=request.FILES["file"],
-                processed_content=""
+                processed_content=None
             )
             
             # Check for user consent (optional parameter, defaults to True for privacy protection)
@@ -113,17 +121,20 @@ class FileUploadAPIView(APIView):
             logger.info(f"🔒 Resume Processing - PII Anonymization: {'ENABLED' if anonymize_pii else 'DISABLED'}")
             
             processed_content = processResume(instance.file_path(), anonymize_pii=anonymize_pii)
-            # Convert the dictionary to JSON string for storage
-            instance.processed_content = json.dumps(processed_content)
+            instance.set_processed_content(processed_content)
             instance.save()
 
             return Response({
                 "success": True,
                 "file": instance.file.url,
                 "processed_content": processed_content,  # Return the dict directly, not the JSON string
-                "privacy_protected": anonymize_pii
+                "privacy_protected": anonymize_pii,
+                **timings_field(),
             }, status=status.HTTP_201_CREATED)
 
+        except ResumeRejected as e:
+            logger.warning(f"Resume rejected: {e.code}")
+            return Response({"error": str(e), "code": e.code}, status=e.http_status)
         except Exception as e:
             logger.error(f"Error in file upload: {str(e)}")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -155,12 +166,15 @@ class JobPostingAPIView(APIView):
 
         try:
             job_url = request.data["job_posting_url"]
-            job_details = extractJobDescription(job_url)
+            job_details = extractJobDescription(
+                job_url, include_html=serializer.validated_data["include_html"]
+            )
             logger.info(f"Job details extracted for URL: {job_url}")
 
             return Response({
                 "url": job_url,
-                "job_details": job_details
+                "job_details": job_details,
+                **timings_field(),
             }, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error(f"Error in job posting analysis: {str(e)}")
@@ -180,46 +194,14 @@ class ProfileAPIView(APIView):
 
     def get(self, request):
         try:
-            # Import here to avoid circular imports
-            from .models import Profile, Experience, Education, Skills
-            
-            # Get the most recent profile
-            profile = Profile.objects.latest('id')
-            
-            # Get related data
-            experiences = Experience.objects.filter(profile=profile)
-            education = Education.objects.filter(profile=profile)
-            skills = Skills.objects.filter(profile=profile)
+            # Most recent profile; related rows are prefetched and the result cached
+            response_data = get_profile_data_for_user(None)
+            response_data = {k: v for k, v in response_data.items() if k != 'owner_id'}
 
-            # Format the response
-            response_data = {
-                'firstName': profile.firstName,
-                'lastName': profile.lastName,
-                'email': profile.email,
-                'phone': profile.phone,
-                'zipCode': profile.zipCode,
-                'experience': [{
-                    'jobTitle': exp.jobTitle,
-                    'company': exp.company,
-                    'startDate': exp.startDate,
-                    'endDate': exp.endDate,
-                    'location': exp.location,
-                    'jobDescription': exp.jobDescription
-                } for exp in experiences],
-                'education': [{
-                    'highestDegree': edu.highestDegree,
-                    'fieldOfStudy': edu.fieldOfStudy,
-                    'institution': edu.institution,
-                    'graduationYear': edu.graduationYear
-                } for edu in education],
-                'skills': [skill.skills for skill in skills]
-            }
-            
             return Response(response_data)
         except Exception as e:  # Changed from Profile.DoesNotExist to catch all exceptions
             return Response({'error': str(e)}, status=500)
 
-
 class ProfileDetailAPIView(APIView):
     """
     Handles profile data retrieval by ID - DEVELOPMENT VERSION (NO AUTH)
@@ -231,41 +213,9 @@ class ProfileDetailAPIView(APIView):
     
     def get(self, request, profile_id):
         try:
-            # Import here to avoid circular imports
-            from .models import Profile, Experience, Education, Skills
-            
             # Get profile by ID (no user restriction in development)
-            profile = Profile.objects.get(id=profile_id)
-            
-            # Get related data
-            experiences = Experience.objects.filter(profile=profile)
-            education = Education.objects.filter(profile=profile)
-            skills = Skills.objects.filter(profile=profile)
-
-            # Format the response
-            response_data = {
-                'id': profile.id,
-                'firstName': profile.firstName,
-                'lastName': profile.lastName,
-                'email': profile.email,
-                'phone': profile.phone,
-                'zipCode': profile.zipCode,
-                'experience': [{
-                    'jobTitle': exp.jobTitle,
-                    'company': exp.company,
-                    'startDate': exp.startDate,
-                    'endDate': exp.endDate,
-                    'location': exp.location,
-                    'jobDescription': exp.jobDescription
-                } for exp in experiences],
-                'education': [{
-                    'highestDegree': edu.highestDegree,
-                    'fieldOfStudy': edu.fieldOfStudy,
-                    'institution': edu.institution,
-                    'graduationYear': edu.graduationYear
-                } for edu in education],
-                'skills': [skill.skills for skill in skills],
-            }
+            response_data = get_profile_data(profile_id)
+            response_data = {k: v for k, v in response_data.items() if k != 'owner_id'}
             
             logger.info(f"Profile {profile_id} data retrieved (development mode)")
             return Response(response_data)
@@ -276,6 +226,35 @@ class ProfileDetailAPIView(APIView):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class FileListAPIView(APIView):
+    """
+    Lists uploaded resumes newest first - DEVELOPMENT VERSION (NO AUTH)
+
+    Query params:
+        cursor: next_cursor from the previous page
+        page_size: Results per page (max 100)
+
+    Returns:
+        200: {"results": [...], "next_cursor": str or null}
+        400: Invalid cursor or page_size
+    """
+
+    def get(self, request):
+        try:
+            page = list_files_page(
+                owner_id(request.user),
+                cursor=request.query_params.get("cursor"),
+                page_size=int(request.query_params.get("page_size", 20)),
+            )
+        except (InvalidCursor, ValueError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'results': [serialize_file(f) for f in page.files],
+            'next_cursor': page.next_cursor,
+        })
+
+
 class ResumeDetailAPIView(APIView):
     """
     Handles resume data retrieval by ID - DEVELOPMENT VERSION (NO AUTH)
@@ -291,12 +270,7 @@ class ResumeDetailAPIView(APIView):
             resume = UploadedFile.objects.get(id=resume_id)
             
             # Parse the processed content if it exists
-            processed_content = {}
-            if resume.processed_content:
-                try:
-                    processed_content = json.loads(resume.processed_content)
-                except json.JSONDecodeError:
-                    processed_content = {"raw_content": resume.processed_content}
+            processed_content = resume.get_processed_content()
 
             # Format the response
             response_data = {
@@ -316,6 +290,99 @@ class ResumeDetailAPIView(APIView):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class ResumeMatchesAPIView(APIView):
+    """
+    Finds the indexed job postings closest to a resume - DEVELOPMENT VERSION (NO AUTH)
+    Searches every indexed posting; there are no users to scope by.
+
+    Endpoints:
+        GET /api/resume/<resume_id>/matches/?k=10
+
+    Returns:
+        200: {"resume_id", "matches": [{"url", "score", "title", "company_name", ...}]}
+        400: Invalid k
+        404: Resume not found
+        503: Similarity search disabled or the embedding model unavailable
+    """
+
+    def get(self, request, resume_id):
+        try:
+            k = embeddings.parse_k(request.query_params.get("k"))
+        except ValueError:
+            return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            embeddings.require_enabled()
+            # No user restriction in development
+            resume = UploadedFile.objects.get(id=resume_id)
+            matches = embeddings.match_jobs(resume.id, resume.get_processed_content(), k)
+            return Response({
+                'resume_id': resume.id,
+                'matches': matches,
+                **timings_field(),
+            })
+        except UploadedFile.DoesNotExist:
+            return Response({'error': 'Resume not found'}, status=status.HTTP_404_NOT_FOUND)
+        except embeddings.EmbeddingUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except Exception as e:
+            logger.error(f"Error matching resume {resume_id}: {str(e)}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class RankResumesAPIView(APIView):
+    """
+    Ranks resumes against a job posting - DEVELOPMENT VERSION (NO AUTH)
+
+    Endpoints:
+        POST /api/rank-resumes/ (job_posting_url, optional resume_ids "1,2,3" and k)
+
+    Returns:
+        200: {"url", "rankings": [{"resume_id", "score"}]}
+        400: Invalid parameters or job extraction error
+        503: Similarity search disabled or the embedding model unavailable
+    """
+    parser_classes = (MultiPartParser, FormParser)
+    serializer_class = JobPostingSerializer
+
+    def post(self, request, format=None):
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            k = embeddings.parse_k(request.data.get("k"), default=embeddings.MAX_RESULTS)
+            requested_ids = embeddings.parse_resume_ids(request.data.get("resume_ids"))
+        except ValueError:
+            return Response({'error': 'k and resume_ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            embeddings.require_enabled()
+            job_url = request.data["job_posting_url"]
+            job_details = None
+            if not embeddings.has_job(job_url):
+                job_details = extractJobDescription(job_url)
+                if not job_details or 'status_code' in job_details:
+                    return Response({
+                        "error": "Failed to extract job details from URL. Please check the URL is accessible.",
+                        "job_url": job_url,
+                        "details": str(job_details)
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+            # All indexed resumes unless resume_ids narrows them
+            rankings = embeddings.rank_resumes(job_url, job_details, resume_ids=requested_ids, k=k)
+            logger.info(f"Ranked {len(rankings)} resumes (development mode)")
+            return Response({
+                "url": job_url,
+                "rankings": rankings,
+                **timings_field(),
+            }, status=status.HTTP_200_OK)
+        except embeddings.EmbeddingUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except Exception as e:
+            logger.error(f"Error ranking resumes: {str(e)}")
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 # FIXED: Regular Django view function (NOT DRF APIView)
 def uploadFile(request):
     """
@@ -327,20 +394,20 @@ def uploadFile(request):
         if form.is_valid():
             try:
                 uploaded_file = form.save()
-                print(f"File uploaded: {uploaded_file.file.path}")
+                logger.info("File uploaded: %s", uploaded_file.file.path)
                 
                 # Process the resume
                 processed_data = processResume(uploaded_file.file.path)
-                uploaded_file.processed_content = json.dumps(processed_data)
+                uploaded_file.set_processed_content(processed_data)
                 uploaded_file.save()
                 
-                print(f"Processed resume data: {json.dumps(processed_data, indent=2)}")
+                logger.debug("Processed resume data: %s", LazyPayload(processed_data), extra=event("resume.processed"))
                 
                 messages.success(request, "File uploaded and processed successfully!")
                 return redirect('displayFile', file_id=uploaded_file.id)
                 
             except Exception as e:
-                print(f"Error in uploadFile view: {str(e)}")
+                logger.error("Error in uploadFile view: %s", e)
                 messages.error(request, f"Error processing file: {str(e)}")
                 return render(request, "file_upload/upload.html", {"form": form})
     else:
@@ -357,7 +424,7 @@ def displayFile(request, file_id):
         return render(request, "file_upload/display.html", {
             "filename": os.path.basename(file_obj.file.path),
             "content": "The resume was processed successfully.",
-            "processed_content": file_obj.processed_content
+            "processed_content": json.dumps(file_obj.get_processed_content(), indent=2)
         })
     except Exception as e:
         logger.error(f"Error displaying file with ID {file_id}: {str(e)}")
@@ -365,19 +432,17 @@ def displayFile(request, file_id):
 
 
 def fileList(request):
-    """View to display list of uploaded files"""
-    files = UploadedFile.objects.all().order_by("-uploaded_at")
-    paginator = Paginator(files, 10)
-    page = request.GET.get('page')
-
+    """View to display list of uploaded files, newest first with cursor pagination"""
     try:
-        files = paginator.page(page)
-    except PageNotAnInteger:
-        files = paginator.page(1)
-    except EmptyPage:
-        files = paginator.page(paginator.num_pages)
-
-    return render(request, "file_upload/list.html", {"files": files})
+        page = list_files_page(owner_id(request.user), cursor=request.GET.get("cursor"))
+    except InvalidCursor:
+        return redirect("fileList")
+
+    return render(request, "file_upload/list.html", {
+        "files": page.files,
+        "cursor": request.GET.get("cursor"),
+        "next_cursor": page.next_cursor,
+    })
 
 
 def job_description_parse(request):
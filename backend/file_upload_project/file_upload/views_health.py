@@ -2,111 +2,82 @@
 Health check views for production deployment monitoring
 """
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from django.db import connections
+import datetime
+import hmac
 import logging
+import time
+
+from . import metrics
+from .db_pool import pool_stats
+from .health import HEALTH_CHECK_TIMEOUT, get_monitor
 
 logger = logging.getLogger(__name__)
 
+def _timestamp():
+    return datetime.datetime.utcnow().isoformat() + 'Z'
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def health_check(request):
     """
     Health check endpoint for load balancers and monitoring
-    Returns 200 OK if service is healthy, 503 if unhealthy
+    Always 200 while Django is serving requests (Railway needs this); the
+    database field comes from the health monitor's cached snapshot.
     """
-    import datetime
-    
-    # DEBUG: Log every health check request
-    logger.info(f"🔍 Health check request received from {request.META.get('REMOTE_ADDR', 'unknown')}")
-    logger.info(f"🔍 Request headers: {dict(request.headers)}")
-    
-    try:
-        # Basic service health (always passes if Django is running)
-        health_data = {
-            'status': 'healthy',
-            'service': 'PrepPad Backend API',
-            'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
-            'django': 'running',
-            'database': 'unknown'
-        }
-        
-        logger.info("🔍 Health check data initialized successfully")
-    
-        # Try to check database connection (non-critical)
-        try:
-            from django.db import connection
-            logger.info("🔍 Attempting database connection...")
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
-            health_data['database'] = 'connected'
-            logger.info("🔍 Health check passed - database connected")
-        except Exception as e:
-            # Log the error but don't fail the health check
-            logger.warning(f"🔍 Database health check failed (non-critical): {str(e)}")
-            health_data['database'] = 'disconnected'
-            health_data['database_error'] = str(e)[:100]  # Truncate error message
-        
-        # Always return 200 if Django is responding (Railway needs this)
-        logger.info(f"🔍 Health check returning 200 with data: {health_data}")
-        return JsonResponse(health_data, status=200)
-        
-    except Exception as e:
-        # Catch any unexpected errors in health check
-        logger.error(f"🚨 CRITICAL: Health check completely failed: {str(e)}")
-        logger.error(f"🚨 Exception type: {type(e).__name__}")
-        import traceback
-        logger.error(f"🚨 Full traceback: {traceback.format_exc()}")
-        
-        # Return 503 for complete failures
-        error_data = {
-            'status': 'error',
-            'service': 'PrepPad Backend API',
-            'error': str(e),
-            'timestamp': datetime.datetime.utcnow().isoformat() + 'Z'
-        }
-        return JsonResponse(error_data, status=503)
+    monitor = get_monitor()
+    database = monitor.snapshot()['database']
+    health_data = {
+        'status': 'healthy',
+        'service': 'PrepPad Backend API',
+        'timestamp': _timestamp(),
+        'django': 'running',
+        'database': {'ok': 'connected', 'unknown': 'unknown'}.get(database['status'], 'disconnected'),
+    }
+    if database['error']:
+        health_data['database_error'] = database['error'][:100]
+    return JsonResponse(health_data, status=200)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def live_check(request):
+    """
+    Liveness endpoint - the process is up and its health monitor is running.
+    Never touches the database or other dependencies.
+    """
+    monitor = get_monitor()
+    return JsonResponse({
+        'status': 'alive',
+        'service': 'PrepPad Backend API',
+        'pid': monitor.pid,
+        'uptime_s': round(time.time() - monitor.started_at, 1),
+        'monitor': 'running' if monitor.running else 'stopped',
+    }, status=200)
 
-@csrf_exempt  
+@csrf_exempt
 @require_http_methods(["GET"])
 def ready_check(request):
     """
     Readiness check endpoint - indicates if service is ready to handle traffic
+    Ready when every critical component's last check passed and is not stale.
     """
-    try:
-        # More comprehensive checks for readiness
-        db_conn = connections['default']
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT 1")
-        cursor.fetchone()
-        
-        ready_data = {
-            'status': 'ready',
-            'service': 'PrepPad Backend API',
-            'checks': {
-                'database': 'ready',
-                'migrations': 'applied'
-            }
-        }
-        
-        return JsonResponse(ready_data, status=200)
-        
-    except Exception as e:
-        logger.error(f"Ready check failed: {str(e)}")
-        
-        not_ready_data = {
-            'status': 'not_ready',
-            'service': 'PrepPad Backend API',
-            'checks': {
-                'database': 'failed',
-                'error': str(e)
-            }
-        }
-        
-        return JsonResponse(not_ready_data, status=503)
+    monitor = get_monitor()
+    # Only a worker's first probe can wait, and only until its first check lands
+    monitor.wait_for_critical(HEALTH_CHECK_TIMEOUT)
+    components = monitor.snapshot()
+    ready = monitor.is_ready(components)
+    ready_data = {
+        'status': 'ready' if ready else 'not_ready',
+        'service': 'PrepPad Backend API',
+        'timestamp': _timestamp(),
+        'checks': {name: entry['status'] for name, entry in components.items()},
+        'components': components,
+        'database_pool': pool_stats(),
+    }
+    return JsonResponse(ready_data, status=200 if ready else 503)
 
 @csrf_exempt
 @require_http_methods(["GET"])  
@@ -128,4 +99,30 @@ def version_info(request):
         }
     }
     
-    return JsonResponse(version_data, status=200)
\ No newline at end of file
+    return JsonResponse(version_data, status=200)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def metrics_export(request):
+    """
+    Metrics endpoint for Prometheus, aggregated across all worker processes.
+    Add ?format=json for the raw merged counters and histograms.
+    Requires METRICS_TOKEN; only development (DEBUG) serves it without one.
+    """
+    if not metrics.METRICS_TOKEN:
+        if not settings.DEBUG:
+            return JsonResponse({'error': 'Metrics are disabled until METRICS_TOKEN is set'}, status=403)
+    elif not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {metrics.METRICS_TOKEN}".encode()
+    ):
+        return JsonResponse({'error': 'Invalid metrics token'}, status=403)
+
+    aggregate = metrics.collect()
+    if request.GET.get('format') == 'json':
+        data = aggregate.to_json()
+        data['cache_hit_ratio'] = aggregate.cache_hit_ratios()
+        return JsonResponse(data, status=200)
+    return HttpResponse(
+        metrics.render_prometheus(aggregate),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
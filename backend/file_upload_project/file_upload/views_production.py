@@ -3,7 +3,6 @@ Production Views with Authentication Enabled
 """
 from django.shortcuts import render, redirect
 from django.http import HttpResponse
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.contrib import messages
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -15,15 +14,22 @@ from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.db import connection
 import jwt as pyjwt
 import os
-from rest_framework.throttling import UserRateThrottle
 from django.contrib.auth.decorators import login_required
 import logging
 import os
 import json
 from .serializers import AnalysisSerializer, FileUploadSerializer, JobPostingSerializer
-from .models import UploadedFile
+from . import embeddings
+from .models import UploadedFile, Profile
+from .profile_cache import get_profile_data, get_profile_data_for_user
+from .content_storage import pack_processed_content
+from .file_listing import InvalidCursor, list_files_page, owner_id, serialize_file
 from .forms import fileUploadForm, jobPostingForm
 from .utils import processResume, processResumeFromContent, extractJobDescription, resumeJobDescAnalysis
+from .resume_preflight import ResumeRejected
+from .timing import timings_field
+from .structured_logging import LazyPayload
+from .throttling import AnalysisThrottle, JobPostingThrottle, ProfileThrottle, UploadThrottle
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -42,7 +48,8 @@ def performResumeJobAnalysis(processed_resume: dict, job_details: dict, anonymiz
         dict: Analysis results with match score, strengths, weaknesses, etc.
     """
     from .utils import analysisPrompt
-    import requests
+    from .prompt_builder import build_analysis_inputs
+    from .llm_client import post_chat_completion
     
     try:
         # Get API key from environment
@@ -59,20 +66,13 @@ def performResumeJobAnalysis(processed_resume: dict, job_details: dict, anonymiz
                 "keywords_found": []
             }
         
-        # Convert structured data to strings for analysis
-        resume_data_str = str(processed_resume)
-        job_data_str = str(job_details)
+        # Project analysis-relevant fields and serialize them as compact JSON
+        resume_data_str, job_data_str = build_analysis_inputs(processed_resume, job_details)
         
         # Create analysis prompt
         prompt = analysisPrompt(resume_data_str, job_data_str)
         
         # Call DeepSeek API for analysis
-        url = "https://api.deepseek.com/chat/completions"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        }
-        
         data = {
             "model": "deepseek-chat",
             "messages": prompt,
@@ -83,10 +83,9 @@ def performResumeJobAnalysis(processed_resume: dict, job_details: dict, anonymiz
         }
         
         logger.info("🚀 Sending analysis request to DeepSeek API...")
-        response = requests.post(url, headers=headers, json=data)
+        response, result = post_chat_completion(data, "analysis", api_key)
         
         if response.status_code == 200:
-            result = response.json()
             logger.info(f"✅ DeepSeek API response received: {response.status_code}")
             
             if (
@@ -102,7 +101,7 @@ def performResumeJobAnalysis(processed_resume: dict, job_details: dict, anonymiz
                 logger.error("Invalid response format from DeepSeek API")
                 raise ValueError("Invalid API response format")
         else:
-            logger.error(f"DeepSeek API error: {response.status_code} - {response.text}")
+            logger.error("DeepSeek API error: %s - %s", response.status_code, LazyPayload(response.text))
             raise ValueError(f"API request failed: {response.status_code}")
     
     except Exception as e:
@@ -215,7 +214,7 @@ class AnalysisAPIView(APIView):
     serializer_class = AnalysisSerializer
     authentication_classes = [SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [AnalysisThrottle]
 
     def post(self, request, format=None):
         # Log the authenticated user
@@ -235,12 +234,12 @@ class AnalysisAPIView(APIView):
             logger.info(f"🔒 PII Anonymization: {'ENABLED' if anonymize_pii else 'DISABLED'} for user {request.user.id}")
             
             # Get job details first
-            job_details = extractJobDescription(job_url)
+            job_details = extractJobDescription(job_url, owner=owner_id(request.user))
             logger.info(f"Job details extracted for user {request.user.id}")
             
             # Validate job details
             if not job_details or (isinstance(job_details, dict) and job_details.get('status_code') != 200 and 'error' in job_details):
-                logger.error(f"Job extraction failed for user {request.user.id}: {job_details}")
+                logger.error("Job extraction failed for user %s: %s", request.user.id, LazyPayload(job_details))
                 return Response({
                     "error": "Failed to extract job details from URL. Please check the URL is accessible.",
                     "job_url": job_url,
@@ -248,9 +247,9 @@ class AnalysisAPIView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             # Process file in memory and perform analysis
-            file_content = uploaded_file.read()
+            # Pass the upload itself; spilled-to-disk uploads are memory-mapped, not re-read
             processed_resume = processResumeFromContent(
-                file_content=file_content,
+                file_content=uploaded_file,
                 filename=uploaded_file.name,
                 anonymize_pii=anonymize_pii
             )
@@ -258,7 +257,7 @@ class AnalysisAPIView(APIView):
             
             # Validate resume processing
             if not processed_resume or (isinstance(processed_resume, dict) and processed_resume.get('processing_failed')):
-                logger.error(f"Resume processing failed for user {request.user.id}: {processed_resume}")
+                logger.error("Resume processing failed for user %s: %s", request.user.id, LazyPayload(processed_resume))
                 return Response({
                     "error": "Failed to process resume file. Please check the file format and content.",
                     "filename": uploaded_file.name,
@@ -277,8 +276,12 @@ class AnalysisAPIView(APIView):
                 "job_details": job_details,
                 "privacy_protected": anonymize_pii,
                 "user_id": request.user.id,
-                "processing_method": "in_memory"
+                "processing_method": "in_memory",
+                **timings_field(),
             }, status=status.HTTP_201_CREATED)
+        except ResumeRejected as e:
+            logger.warning(f"Resume rejected for user {request.user.id}: {e.code}")
+            return Response({"error": str(e), "code": e.code}, status=e.http_status)
         except Exception as e:
             logger.error(f"Error in analysis for user {request.user.id}: {str(e)}")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -303,7 +306,7 @@ class FileUploadAPIView(APIView):
     serializer_class = FileUploadSerializer
     authentication_classes = [SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UploadThrottle]
 
     def post(self, request, format=None):
         # Log the authenticated user
@@ -321,17 +324,17 @@ class FileUploadAPIView(APIView):
             anonymize_pii = request.data.get("anonymize_pii", "true").lower() == "true"
             logger.info(f"🔒 Resume Processing - PII Anonymization: {'ENABLED' if anonymize_pii else 'DISABLED'} for user {request.user.id}")
             
-            # Process file directly from memory (no file storage)
-            file_content = uploaded_file.read()
+            # Process file directly from the upload stream (no file storage)
             processed_content = processResumeFromContent(
-                file_content=file_content,
+                file_content=uploaded_file,
                 filename=uploaded_file.name,
                 anonymize_pii=anonymize_pii
             )
             
             # Store only the processed results (no file storage)
             instance = UploadedFile.objects.create(
-                processed_content=json.dumps(processed_content)
+                processed_content=pack_processed_content(processed_content),
+                user_id=owner_id(request.user),
                 # Note: No file field - processing done in-memory only
             )
 
@@ -341,9 +344,13 @@ class FileUploadAPIView(APIView):
                 "processed_content": processed_content,
                 "privacy_protected": anonymize_pii,
                 "user_id": request.user.id,
-                "processing_method": "in_memory"
+                "processing_method": "in_memory",
+                **timings_field(),
             }, status=status.HTTP_201_CREATED)
 
+        except ResumeRejected as e:
+            logger.warning(f"Resume rejected for user {request.user.id}: {e.code}")
+            return Response({"error": str(e), "code": e.code}, status=e.http_status)
         except Exception as e:
             logger.error(f"Error in file upload for user {request.user.id}: {str(e)}")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -368,7 +375,7 @@ class JobPostingAPIView(APIView):
     serializer_class = JobPostingSerializer
     authentication_classes = [SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [JobPostingThrottle]
 
     def post(self, request, format=None):
         # Log the authenticated user
@@ -380,13 +387,16 @@ class JobPostingAPIView(APIView):
 
         try:
             job_url = request.data["job_posting_url"]
-            job_details = extractJobDescription(job_url)
+            job_details = extractJobDescription(
+                job_url, include_html=serializer.validated_data["include_html"], owner=owner_id(request.user)
+            )
             logger.info(f"Job details extracted for user {request.user.id}, URL: {job_url}")
 
             return Response({
                 "url": job_url,
                 "job_details": job_details,
-                "user_id": request.user.id
+                "user_id": request.user.id,
+                **timings_field(),
             }, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error(f"Error in job posting analysis for user {request.user.id}: {str(e)}")
@@ -407,44 +417,14 @@ class ProfileAPIView(APIView):
     """
     authentication_classes = [SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [ProfileThrottle]
 
     def get(self, request):
         try:
-            # Import here to avoid circular imports
-            from .models import Profile
-            
-            # Get the authenticated user's profile only
-            profile = Profile.objects.get(user=request.user)
-            
-            # Get related data for this user only
-            experiences = Experience.objects.filter(profile=profile)
-            education = Education.objects.filter(profile=profile)
-            skills = Skills.objects.filter(profile=profile)
-
-            # Format the response
-            response_data = {
-                'firstName': profile.firstName,
-                'lastName': profile.lastName,
-                'email': profile.email,
-                'phone': profile.phone,
-                'zipCode': profile.zipCode,
-                'experience': [{
-                    'jobTitle': exp.jobTitle,
-                    'company': exp.company,
-                    'startDate': exp.startDate,
-                    'endDate': exp.endDate,
-                    'location': exp.location,
-                    'jobDescription': exp.jobDescription
-                } for exp in experiences],
-                'education': [{
-                    'highestDegree': edu.highestDegree,
-                    'fieldOfStudy': edu.fieldOfStudy,
-                    'institution': edu.institution,
-                    'graduationYear': edu.graduationYear
-                } for edu in education],
-                'skills': [skill.skills for skill in skills],
-                'user_id': request.user.id
-            }
+            # Get the authenticated user's profile only (prefetched and cached)
+            response_data = get_profile_data_for_user(owner_id(request.user))
+            response_data = {k: v for k, v in response_data.items() if k != 'owner_id'}
+            response_data['user_id'] = request.user.id
             
             logger.info(f"Profile data retrieved for user: {request.user.id}")
             return Response(response_data)
@@ -470,45 +450,16 @@ class ProfileDetailAPIView(APIView):
     """
     authentication_classes = [SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [ProfileThrottle]
 
     def get(self, request, profile_id):
         try:
-            # Import here to avoid circular imports
-            from .models import Profile
-            
             # Get the profile by ID, but ensure user can only access their own profile
-            profile = Profile.objects.get(id=profile_id, user=request.user)
-            
-            # Get related data for this user only
-            experiences = Experience.objects.filter(profile=profile)
-            education = Education.objects.filter(profile=profile)
-            skills = Skills.objects.filter(profile=profile)
-
-            # Format the response
-            response_data = {
-                'id': profile.id,
-                'firstName': profile.firstName,
-                'lastName': profile.lastName,
-                'email': profile.email,
-                'phone': profile.phone,
-                'zipCode': profile.zipCode,
-                'experience': [{
-                    'jobTitle': exp.jobTitle,
-                    'company': exp.company,
-                    'startDate': exp.startDate,
-                    'endDate': exp.endDate,
-                    'location': exp.location,
-                    'jobDescription': exp.jobDescription
-                } for exp in experiences],
-                'education': [{
-                    'highestDegree': edu.highestDegree,
-                    'fieldOfStudy': edu.fieldOfStudy,
-                    'institution': edu.institution,
-                    'graduationYear': edu.graduationYear
-                } for edu in education],
-                'skills': [skill.skills for skill in skills],
-                'user_id': request.user.id
-            }
+            response_data = get_profile_data(profile_id)
+            if response_data['owner_id'] != owner_id(request.user):
+                raise Profile.DoesNotExist
+            response_data = {k: v for k, v in response_data.items() if k != 'owner_id'}
+            response_data['user_id'] = request.user.id
             
             logger.info(f"Profile {profile_id} data retrieved for user: {request.user.id}")
             return Response(response_data)
@@ -519,6 +470,40 @@ class ProfileDetailAPIView(APIView):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class FileListAPIView(APIView):
+    """
+    Lists the authenticated user's uploaded resumes newest first
+
+    Query params:
+        cursor: next_cursor from the previous page
+        page_size: Results per page (max 100)
+
+    Returns:
+        200: {"results": [...], "next_cursor": str or null}
+        400: Invalid cursor or page_size
+        401: Unauthorized
+    """
+    authentication_classes = [SupabaseJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [ProfileThrottle]
+
+    def get(self, request):
+        try:
+            page = list_files_page(
+                owner_id(request.user),
+                cursor=request.query_params.get("cursor"),
+                page_size=int(request.query_params.get("page_size", 20)),
+            )
+        except (InvalidCursor, ValueError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'results': [serialize_file(f) for f in page.files],
+            'next_cursor': page.next_cursor,
+            'user_id': request.user.id
+        })
+
+
 class ResumeDetailAPIView(APIView):
     """
     Handles resume data retrieval by ID - PRODUCTION VERSION
@@ -534,19 +519,15 @@ class ResumeDetailAPIView(APIView):
     """
     authentication_classes = [SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [ProfileThrottle]
 
     def get(self, request, resume_id):
         try:
             # Get the resume by ID, but ensure user can only access their own resume
-            resume = UploadedFile.objects.get(id=resume_id, user=request.user)
+            resume = UploadedFile.objects.get(id=resume_id, user_id=owner_id(request.user))
             
             # Parse the processed content if it exists
-            processed_content = {}
-            if resume.processed_content:
-                try:
-                    processed_content = json.loads(resume.processed_content)
-                except json.JSONDecodeError:
-                    processed_content = {"raw_content": resume.processed_content}
+            processed_content = resume.get_processed_content()
 
             # Format the response
             response_data = {
@@ -567,6 +548,121 @@ class ResumeDetailAPIView(APIView):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class ResumeMatchesAPIView(APIView):
+    """
+    Finds the job postings the user has analyzed that are closest to a resume - PRODUCTION VERSION
+
+    Endpoints:
+        GET /api/resume/<resume_id>/matches/?k=10
+
+    Authentication:
+        Required - JWT Bearer token
+
+    Returns:
+        200: {"resume_id", "matches": [{"url", "score", "title", "company_name", ...}]}
+        400: Invalid k
+        404: Resume not found
+        503: Similarity search disabled or the embedding model unavailable
+        401: Unauthorized
+    """
+    authentication_classes = [SupabaseJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [ProfileThrottle]
+
+    def get(self, request, resume_id):
+        try:
+            k = embeddings.parse_k(request.query_params.get("k"))
+        except ValueError:
+            return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            embeddings.require_enabled()
+            resume = UploadedFile.objects.get(id=resume_id, user_id=owner_id(request.user))
+            matches = embeddings.match_jobs(resume.id, resume.get_processed_content(), k, owner=owner_id(request.user))
+            return Response({
+                'resume_id': resume.id,
+                'matches': matches,
+                'user_id': request.user.id,
+                **timings_field(),
+            })
+        except UploadedFile.DoesNotExist:
+            return Response({'error': 'Resume not found or access denied'}, status=status.HTTP_404_NOT_FOUND)
+        except embeddings.EmbeddingUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except Exception as e:
+            logger.error(f"Error matching resume {resume_id} for user {request.user.id}: {str(e)}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class RankResumesAPIView(APIView):
+    """
+    Ranks the user's resumes against a job posting - PRODUCTION VERSION
+
+    Endpoints:
+        POST /api/rank-resumes/ (job_posting_url, optional resume_ids "1,2,3" and k)
+
+    Authentication:
+        Required - JWT Bearer token
+
+    Returns:
+        200: {"url", "rankings": [{"resume_id", "score"}]}
+        400: Invalid parameters or job extraction error
+        503: Similarity search disabled or the embedding model unavailable
+        401: Unauthorized
+    """
+    parser_classes = (MultiPartParser, FormParser)
+    serializer_class = JobPostingSerializer
+    authentication_classes = [SupabaseJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [JobPostingThrottle]
+
+    def post(self, request, format=None):
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            k = embeddings.parse_k(request.data.get("k"), default=embeddings.MAX_RESULTS)
+            requested_ids = embeddings.parse_resume_ids(request.data.get("resume_ids"))
+        except ValueError:
+            return Response({'error': 'k and resume_ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            embeddings.require_enabled()
+            job_url = request.data["job_posting_url"]
+            job_details = None
+            if embeddings.has_job(job_url):
+                # Ranking against a posting counts as analyzing it, for the user's matches
+                embeddings.schedule_job(job_url, None, owner_id(request.user), refresh=False)
+            else:
+                job_details = extractJobDescription(job_url, owner=owner_id(request.user))
+                if not job_details or 'status_code' in job_details:
+                    return Response({
+                        "error": "Failed to extract job details from URL. Please check the URL is accessible.",
+                        "job_url": job_url,
+                        "details": str(job_details)
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+            # Only ever rank the user's own resumes
+            owned = UploadedFile.objects.filter(user_id=owner_id(request.user))
+            if requested_ids is not None:
+                owned = owned.filter(id__in=requested_ids)
+            rankings = embeddings.rank_resumes(
+                job_url, job_details, resume_ids=list(owned.values_list('id', flat=True)), k=k
+            )
+            logger.info(f"Ranked {len(rankings)} resumes for user {request.user.id}")
+            return Response({
+                "url": job_url,
+                "rankings": rankings,
+                "user_id": request.user.id,
+                **timings_field(),
+            }, status=status.HTTP_200_OK)
+        except embeddings.EmbeddingUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except Exception as e:
+            logger.error(f"Error ranking resumes for user {request.user.id}: {str(e)}")
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 # Web views with authentication
 @login_required
 def uploadFile(request):
@@ -578,14 +674,15 @@ def uploadFile(request):
         form = fileUploadForm(request.POST, request.FILES)
         if form.is_valid():
             try:
-                uploaded_file = form.save()
-                # Note: File-user association handled through separate logic if needed
+                uploaded_file = form.save(commit=False)
+                uploaded_file.user_id = owner_id(request.user)
+                uploaded_file.save()
                 
                 logger.info(f"File uploaded by user {request.user.id}: {uploaded_file.file.path}")
                 
                 # Process the resume
                 processed_data = processResume(uploaded_file.file.path)
-                uploaded_file.processed_content = json.dumps(processed_data)
+                uploaded_file.set_processed_content(processed_data)
                 uploaded_file.save()
                 
                 logger.info(f"Processed resume data for user {request.user.id}")
@@ -608,12 +705,11 @@ def uploadFile(request):
 def displayFile(request, file_id):
     """View to display processed file contents - only user's own files"""
     try:
-        # Get file (user access control handled at application level)
-        file_obj = UploadedFile.objects.get(pk=file_id)
+        file_obj = UploadedFile.objects.get(pk=file_id, user_id=owner_id(request.user))
         return render(request, "file_upload/display.html", {
             "filename": os.path.basename(file_obj.file.path),
             "content": "The resume was processed successfully.",
-            "processed_content": file_obj.processed_content
+            "processed_content": json.dumps(file_obj.get_processed_content(), indent=2)
         })
     except UploadedFile.DoesNotExist:
         logger.warning(f"User {request.user.id} attempted to access file {file_id} - not found or not authorized")
@@ -625,19 +721,17 @@ def displayFile(request, file_id):
 
 @login_required
 def fileList(request):
-    """View to display list of uploaded files"""
-    files = UploadedFile.objects.all().order_by("-uploaded_at")
-    paginator = Paginator(files, 10)
-    page = request.GET.get('page')
-
+    """View to display list of uploaded files, newest first with cursor pagination"""
     try:
-        files = paginator.page(page)
-    except PageNotAnInteger:
-        files = paginator.page(1)
-    except EmptyPage:
-        files = paginator.page(paginator.num_pages)
+        page = list_files_page(owner_id(request.user), cursor=request.GET.get("cursor"))
+    except InvalidCursor:
+        return redirect("fileList")
 
-    return render(request, "file_upload/list.html", {"files": files})
+    return render(request, "file_upload/list.html", {
+        "files": page.files,
+        "cursor": request.GET.get("cursor"),
+        "next_cursor": page.next_cursor,
+    })
 
 
 @login_required
@@ -648,7 +742,7 @@ def job_description_parse(request):
         if form.is_valid():
             try:
                 job_url = form.cleaned_data["job_posting_url"]
-                job_details = extractJobDescription(job_url)
+                job_details = extractJobDescription(job_url, owner=owner_id(request.user))
                 logger.info(f"Job description parsed by user {request.user.id} for URL: {job_url}")
                 return render(request, "file_upload/job_description_results.html", {
                     "job_details": job_details,
@@ -76,12 +76,13 @@ REST_FRAMEWORK = {
         # 'rest_framework.permissions.IsAuthenticated',  # Disabled for development
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'file_upload.throttling.AnonFixedWindowThrottle',
+        'file_upload.throttling.UserFixedWindowThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/day',  # Increased for development
         'user': '200/day',  # Increased for development
+        'user_weighted': '2000/day',  # Cost units; see file_upload/throttling.py
    },
 }
 
@@ -95,6 +96,8 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    'file_upload.timing.ServerTimingMiddleware',  # Per-stage latency spans
+    'file_upload.request_middleware.RequestMetricsMiddleware',  # Request metrics + sampled access log
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -105,6 +108,49 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Report pipeline spans in a Server-Timing header and a `_timings` response field
+SERVER_TIMING = True
+
+# Access log sampling for RequestMetricsMiddleware (every request is still counted in /api/metrics/)
+REQUEST_LOG_SAMPLE_RATE = 1.0
+REQUEST_LOG_SLOW_MS = 2000
+
+# Development logging: readable lines on the console, with full LLM payloads at DEBUG
+# (PII is still masked). Production uses the JSON formatter and sampling.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '{levelname} {name} {message}',
+            'style': '{',
+        },
+    },
+    'filters': {
+        'redact_pii': {
+            '()': 'file_upload.structured_logging.RedactionFilter',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+            'filters': ['redact_pii'],
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': 'INFO',
+    },
+    'loggers': {
+        'file_upload': {
+            'handlers': ['console'],
+            'level': os.getenv('LOG_LEVEL', 'DEBUG'),
+            'propagate': False,
+        },
+    },
+}
+
 ROOT_URLCONF = 'file_upload_project.urls'
 
 TEMPLATES = [
@@ -0,0 +1,31 @@
+"""
+Load-test settings for file_upload_project.
+
+Production settings (views_production, JWT authentication, throttles,
+middleware) pointed at disposable local services: SQLite by default or a
+local PostgreSQL via DATABASE_URL, no Cloudinary, and the LLM stub. Used by
+`python manage.py load_test`; never deploy with this module.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault('SECRET_KEY', 'load-test-only-signing-key-not-a-secret')
+os.environ.setdefault(
+    'DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'preppad_loadtest.sqlite3')
+)
+os.environ.setdefault('DEEPSEEK_API_KEY', 'load-test')
+os.environ.setdefault('USE_CLOUDINARY', 'False')
+os.environ.setdefault('ALLOWED_HOSTS', '127.0.0.1,localhost')
+os.environ.setdefault('METRICS_TOKEN', 'load-test-metrics-token')
+
+from .settings_production import *  # noqa: E402,F401,F403
+from .settings_production import DATABASES  # noqa: E402
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # The production OPTIONS (sslmode, pool, ...) are PostgreSQL-only. Concurrent
+    # workers write to one file: wait for the lock and take it up front.
+    DATABASES['default']['OPTIONS'] = {'timeout': 30, 'transaction_mode': 'IMMEDIATE'}
+else:
+    # A local PostgreSQL normally has no TLS
+    DATABASES['default']['OPTIONS']['sslmode'] = os.getenv('LOADTEST_DB_SSLMODE', 'prefer')
@@ -81,6 +81,7 @@ DATABASES = {
 # Database connection pooling and security
 DATABASES['default'].update({
     'CONN_MAX_AGE': 600,
+    'CONN_HEALTH_CHECKS': True,
     'OPTIONS': {
         'sslmode': 'require',
         'connect_timeout': 10,
@@ -88,6 +89,33 @@ DATABASES['default'].update({
     }
 })
 
+# Connection pool (psycopg 3 + psycopg_pool on Django 5.1+). Each worker keeps
+# DB_POOL_MIN_SIZE TLS connections open and shares them across threads, so
+# recycled workers and new threads don't pay a handshake per request.
+# With psycopg2-binary installed this falls back to persistent,
+# health-checked connections (CONN_MAX_AGE + CONN_HEALTH_CHECKS).
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'True').lower() == 'true'
+try:
+    import django
+    import psycopg  # noqa: F401
+    import psycopg_pool  # noqa: F401
+    HAS_PSYCOPG_POOL = django.VERSION >= (5, 1)
+except ImportError:
+    HAS_PSYCOPG_POOL = False
+
+if DB_POOL_ENABLED and HAS_PSYCOPG_POOL:
+    # Django rejects persistent connections when a pool is configured;
+    # CONN_HEALTH_CHECKS makes it pass ConnectionPool.check_connection
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+        'name': 'preppad_backend',
+    }
+
 # PRODUCTION: Static and media files
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
@@ -154,12 +182,13 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'file_upload.throttling.AnonFixedWindowThrottle',
+        'file_upload.throttling.UserFixedWindowThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '10/day',    # Strict for production
         'user': '100/day',   # Reasonable for authenticated users
+        'user_weighted': '500/day',  # Cost units: analysis 10, upload 5, job 3, reads 1 (e.g. 50 analyses/day)
     },
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
@@ -187,7 +216,8 @@ SIMPLE_JWT = {
 
 # PRODUCTION: Enhanced middleware stack
 MIDDLEWARE = [
-    'file_upload_project.debug_middleware.DebugMiddleware',  # DEBUG: Catch all errors
+    'file_upload.timing.ServerTimingMiddleware',  # Per-stage latency spans
+    'file_upload.request_middleware.RequestMetricsMiddleware',  # Request metrics + sampled access log
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -199,6 +229,17 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Spans are always recorded; exposing them to clients is opt-in
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'False').lower() == 'true'
+
+# Access log sampling for RequestMetricsMiddleware (every request is still counted in /api/metrics/)
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv('REQUEST_LOG_SAMPLE_RATE', '0.01'))
+REQUEST_LOG_SLOW_MS = float(os.getenv('REQUEST_LOG_SLOW_MS', '2000'))
+
+# Verbose per-request logging for debugging a deployment; off by default
+if os.getenv('DEBUG_REQUEST_LOGGING', 'False').lower() == 'true':
+    MIDDLEWARE.insert(0, 'file_upload_project.debug_middleware.DebugMiddleware')
+
 ROOT_URLCONF = 'file_upload_project.urls'
 
 TEMPLATES = [
@@ -239,10 +280,18 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 # PRODUCTION: Railway-compatible logging configuration
+# One JSON object per line; LOG_FORMAT=verbose switches back to plain text.
+# LOG_SAMPLE_RATES (e.g. "llm=0.01") samples DEBUG/INFO events by name.
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
+        'json': {
+            '()': 'file_upload.structured_logging.JSONFormatter',
+        },
         'verbose': {
             'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
             'style': '{',
@@ -252,16 +301,26 @@ LOGGING = {
             'style': '{',
         },
     },
+    'filters': {
+        'sampling': {
+            '()': 'file_upload.structured_logging.SamplingFilter',
+        },
+        'redact_pii': {
+            '()': 'file_upload.structured_logging.RedactionFilter',
+        },
+    },
     'handlers': {
         'console': {
-            'level': 'INFO',
+            'level': 'DEBUG',
             'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
+            'filters': ['sampling', 'redact_pii'],
         },
         'error_console': {
             'level': 'ERROR',
             'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
+            'filters': ['redact_pii'],
         },
     },
     'root': {
@@ -276,7 +335,7 @@ LOGGING = {
         },
         'file_upload': {
             'handlers': ['console'],
-            'level': 'INFO',
+            'level': LOG_LEVEL,
             'propagate': False,
         },
         'gunicorn': {
@@ -296,9 +355,6 @@ if REDIS_URL:
         'default': {
             'BACKEND': 'django.core.cache.backends.redis.RedisCache',
             'LOCATION': REDIS_URL,
-            'OPTIONS': {
-                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-            },
             'KEY_PREFIX': 'preppad',
             'TIMEOUT': 300,
         }
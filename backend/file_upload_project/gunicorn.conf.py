@@ -0,0 +1,184 @@
+"""
+Gunicorn Configuration
+Shared by startup.sh and railway_startup.sh (`gunicorn -c gunicorn.conf.py`).
+Workers and threads are sized from the CPUs and memory available to the
+container; GUNICORN_PROFILE picks the worker model:
+
+    gthread  (default) threaded workers for the I/O-bound LLM path; a thread
+             waiting on DeepSeek doesn't hold up the rest of its worker
+    sync     one request per worker, the previous behaviour
+    uvicorn  ASGI workers (file_upload_project.asgi); needs uvicorn. Django
+             runs the current sync views one at a time per worker here, so
+             this only pays off for async views
+
+Every value can be pinned with its GUNICORN_* variable (WEB_CONCURRENCY is
+honoured for the worker count). The app is preloaded in the master, which
+then warms the parsing imports and the URL resolver (and, if
+GUNICORN_WARM_MODELS is set, the transformers pipelines) before forking, so
+workers share those pages instead of each paying for them on first request.
+"""
+
+import multiprocessing
+import os
+
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "file_upload_project.settings_production")
+
+PROFILES = {
+    "gthread": {
+        "worker_class": "gthread",
+        "wsgi_app": "file_upload_project.wsgi:application",
+        "workers_per_cpu": 1,
+        "threads": 8,
+        # gthread heartbeats from its main loop, so this only catches a hung worker
+        "timeout": 120,
+    },
+    "sync": {
+        "worker_class": "sync",
+        "wsgi_app": "file_upload_project.wsgi:application",
+        "workers_per_cpu": 2,
+        "threads": 1,
+        # A sync worker is killed mid-request at the timeout; analyses can take minutes
+        "timeout": 300,
+    },
+    "uvicorn": {
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "wsgi_app": "file_upload_project.asgi:application",
+        "workers_per_cpu": 1,
+        "threads": 1,
+        "timeout": 120,
+    },
+}
+
+
+def _env_int(name, default=0):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring affinity and a cgroup v2 CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = multiprocessing.cpu_count()
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def available_memory_mb() -> int:
+    """Container memory limit (cgroup v2, then v1), else total system memory; 0 if unknown"""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        # cgroup v1 reports "no limit" as a huge number rather than "max"
+        if value.isdigit() and int(value) < 1 << 50:
+            return int(value) // (1024 * 1024)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return 0
+
+
+def size_workers(profile, cpus, memory_mb):
+    """Worker count: CPU-bound by the profile, capped by what fits in memory"""
+    workers = profile["workers_per_cpu"] * cpus + (1 if profile["worker_class"] == "sync" else 0)
+    per_worker_mb = _env_int("GUNICORN_WORKER_MEMORY_MB", 250)
+    reserve_mb = _env_int("GUNICORN_MEMORY_RESERVE_MB", 150)
+    if memory_mb:
+        workers = min(workers, (memory_mb - reserve_mb) // per_worker_mb)
+    return max(1, workers)
+
+
+def size_threads(profile):
+    """Threads per worker, kept within the DB pool so threads don't queue for a connection"""
+    threads = _env_int("GUNICORN_THREADS", profile["threads"])
+    if profile["worker_class"] == "gthread":
+        threads = min(threads, _env_int("DB_POOL_MAX_SIZE", 10))
+    return max(1, threads)
+
+
+profile_name = os.getenv("GUNICORN_PROFILE", "gthread").lower()
+if profile_name not in PROFILES:
+    raise RuntimeError(f"Unknown GUNICORN_PROFILE '{profile_name}' (expected one of {', '.join(PROFILES)})")
+profile = PROFILES[profile_name]
+
+cpus = available_cpus()
+memory_mb = available_memory_mb()
+
+# Server socket and worker model
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+wsgi_app = profile["wsgi_app"]
+worker_class = profile["worker_class"]
+workers = _env_int("GUNICORN_WORKERS") or _env_int("WEB_CONCURRENCY") or size_workers(profile, cpus, memory_mb)
+threads = size_threads(profile)
+preload_app = True
+
+# Timeouts: in-flight requests get graceful_timeout to finish on reload/shutdown
+timeout = _env_int("GUNICORN_TIMEOUT", profile["timeout"])
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# Recycle workers to bound slow leaks (parsed documents, model caches)
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# Heartbeat files on tmpfs; an overlay filesystem can stall the heartbeat
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def _csv_env(name, default=""):
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+def on_starting(server):
+    server.log.info(
+        "🚀 Gunicorn profile '%s': %s workers x %s threads (%s CPUs, %s MB memory), timeout %ss",
+        profile_name, workers, threads, cpus, memory_mb or "unknown", timeout,
+    )
+
+
+def when_ready(server):
+    """Runs once in the master after the app is preloaded, before the first fork"""
+    from django.db import connections
+    from django.urls import get_resolver
+
+    from file_upload import lazy_imports
+    from file_upload.resume_extraction import _plain_text_device_class
+
+    get_resolver().url_patterns
+    timings = lazy_imports.warm_imports(_csv_env("GUNICORN_WARM_GROUPS", "parsing"))
+    try:
+        _plain_text_device_class()
+    except ImportError:
+        pass
+    timings.update(lazy_imports.warm_models(_csv_env("GUNICORN_WARM_MODELS")))
+    server.log.info("🔥 Warmed before fork: %s", ", ".join(f"{k} {v}ms" for k, v in timings.items()) or "nothing")
+
+    # Workers must not inherit a database socket opened while warming
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    """Write the worker's final metrics so the next scrape still counts them"""
+    from file_upload import metrics
+
+    metrics.flush(force=True)
@@ -64,17 +64,5 @@ echo "🔗 [RAILWAY] Binding to 0.0.0.0:${PORT:-8000}"
 echo "✅ [RAILWAY] All checks passed, starting application..."
 
 # Final gunicorn startup
-exec gunicorn \
-    --workers 1 \
-    --bind 0.0.0.0:${PORT:-8000} \
-    --timeout 120 \
-    --keep-alive 5 \
-    --worker-class sync \
-    --worker-connections 1000 \
-    --max-requests 1000 \
-    --max-requests-jitter 100 \
-    --access-logfile - \
-    --error-logfile - \
-    --log-level info \
-    --preload \
-    file_upload_project.wsgi:application
\ No newline at end of file
+# Workers, threads and timeouts come from gunicorn.conf.py (GUNICORN_PROFILE, GUNICORN_*)
+exec gunicorn -c gunicorn.conf.py
\ No newline at end of file
@@ -70,17 +70,5 @@ if netstat -tlnp 2>/dev/null | grep ":$PORT_TO_USE " > /dev/null; then
 fi
 
 echo "🚀 Starting Gunicorn server on 0.0.0.0:$PORT_TO_USE..."
-exec gunicorn \
-    --workers 1 \
-    --bind 0.0.0.0:$PORT_TO_USE \
-    --timeout 300 \
-    --keep-alive 5 \
-    --max-requests 1000 \
-    --max-requests-jitter 50 \
-    --access-logfile - \
-    --error-logfile - \
-    --log-level info \
-    --worker-class sync \
-    --worker-connections 1000 \
-    --preload \
-    file_upload_project.wsgi:application
\ No newline at end of file
+# Workers, threads and timeouts come from gunicorn.conf.py (GUNICORN_PROFILE, GUNICORN_*)
+exec gunicorn -c gunicorn.conf.py
\ No newline at end of file